@@ -0,0 +1,401 @@
+# Import necessary libraries
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, AsyncIterator
+from urllib.parse import quote
+
+# Import necessary modules only for type hints, they are loaded when a client is opened
+if TYPE_CHECKING:
+    import aiohttp
+
+# Import internal utilities
+from client_pool import get_authentication
+from credentials import site_url
+from request_metrics import metrics_state, record_request, record_retry
+from sharepoint_tools import describe_item, file_properties, folder_properties, upload_chunk_size, upload_session_size
+from throttling import get_policy, get_retry_delay, pause_requests, reserve_token, retry_status_codes
+
+# Define retry and rate limit policy of the requests
+throttling_policy = "async_client"
+
+# Define number of connections kept open and number of folders listed at the same time by the crawler
+async_connections = 200
+async_listings = 200
+
+# Define seconds after which authentication headers are taken again from the authentication context
+authentication_refresh = 600
+
+# Define headers of REST requests
+json_headers = {"Accept": "application/json;odata=verbose", "Content-Type": "application/json;odata=verbose"}
+
+
+# Define function that return the authentication headers
+def get_authentication_headers(client_url: str) -> dict:
+    """
+    Return the headers that authenticate a request, taken from the authentication shared with the synchronous tools
+    :param client_url: URL of the SharePoint site in string format
+    :return: headers: dictionary with authentication headers
+    """
+    # Import request options of the SharePoint client
+    from office365.runtime.http.request_options import RequestOptions
+
+    # Let the authentication context fill an empty request
+    request = RequestOptions(client_url)
+    get_authentication().authenticate_request(request)
+
+    # Return filled headers
+    return request.headers
+
+
+# Define function that open an asynchronous client
+async def open_client(client_url: str = None, max_connections: int = async_connections) -> dict:
+    """
+    Open an HTTP session that keep up to max_connections requests in flight to the SharePoint site
+    :param client_url: URL of the SharePoint site in string format, the configured site if not provided
+    :param max_connections: maximum number of open connections in integer format
+    :return: client: dictionary with site URL, HTTP session, authentication headers and form digest
+    """
+    # Import HTTP library only when a client is opened
+    import aiohttp
+
+    # Return client with empty authentication, it is taken on first request
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_connections)
+    return {"url": (client_url or site_url).rstrip("/"), "session": aiohttp.ClientSession(connector=connector),
+            "headers": None, "headers_expire": 0.0, "digest": None, "digest_expire": 0.0, "lock": asyncio.Lock()}
+
+
+# Define function that close an asynchronous client
+async def close_client(client: dict) -> None:
+    """
+    Close the HTTP session and all its connections
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :return: None
+    """
+    # Close session
+    await client["session"].close()
+
+
+# Define function that return headers of a request
+async def get_request_headers(client: dict, needs_digest: bool) -> dict:
+    """
+    Return authentication headers and, for requests that change content, the form digest, refreshing them when expired
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param needs_digest: True if the request changes content
+    :return: headers: dictionary with request headers
+    """
+    # Refresh headers once for all waiting requests, the authentication context may block so it runs in a thread
+    async with client["lock"]:
+        if time.monotonic() >= client["headers_expire"]:
+            client["headers"] = await asyncio.to_thread(get_authentication_headers, client["url"])
+            client["headers_expire"] = time.monotonic() + authentication_refresh
+        if needs_digest and time.monotonic() >= client["digest_expire"]:
+            async with client["session"].post(f"{client['url']}/_api/contextinfo", headers=dict(json_headers, **client["headers"])) as response:
+                response.raise_for_status()
+                context_information = (await response.json(content_type=None))["d"]["GetContextWebInformation"]
+            client["digest"] = context_information["FormDigestValue"]
+            client["digest_expire"] = time.monotonic() + int(context_information["FormDigestTimeoutSeconds"]) - 60
+
+    # Return headers of the request
+    headers = dict(json_headers, **client["headers"])
+    if needs_digest:
+        headers["X-RequestDigest"] = client["digest"]
+    return headers
+
+
+# Define function that send a request
+async def send_request(client: dict, method: str, api_path: str, data: bytes = None, headers: dict = None) -> "aiohttp.ClientResponse":
+    """
+    Send a REST request to the site, waiting for the rate limit and retrying it while it is throttled
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param method: HTTP method in string format
+    :param api_path: path of the REST endpoint after _api/, already encoded, in string format
+    :param data: body of the request in bytes format
+    :param headers: dictionary with additional headers
+    :return: response: HTTP response with unread body, the caller must release it
+    """
+    # Import URL class to send the encoded path as it is
+    from yarl import URL
+
+    # Try the request until it succeeds, fails with another error or retries are exhausted
+    url = f"{client['url']}/_api/{api_path}"
+    policy = get_policy(throttling_policy)
+    attempt = 0
+    while True:
+        await asyncio.sleep(reserve_token(throttling_policy))
+        request_headers = dict(await get_request_headers(client, method != "GET"), **(headers or {}))
+        start_time = time.perf_counter()
+        try:
+            response = await client["session"].request(method, URL(url, encoded=True), data=data, headers=request_headers)
+        except Exception:
+            if metrics_state["enabled"]:
+                record_request(method, url, "error", len(data or b""), 0, time.perf_counter() - start_time, attempt)
+            raise
+
+        # Pass the attempt, coroutines of the same thread don't share their retries
+        if metrics_state["enabled"]:
+            record_request(method, url, response.status, len(data or b""), int(response.headers.get("Content-Length") or 0),
+                           time.perf_counter() - start_time, attempt)
+
+        # Pause all requests of the policy and try again while the request is throttled
+        if response.status in retry_status_codes and attempt < policy["max_retries"]:
+            delay = get_retry_delay(response, attempt, policy)
+            record_retry(throttling_policy, response.status)
+            response.release()
+            pause_requests(throttling_policy, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        # Raise other errors and return successful response
+        if response.status >= 400:
+            response.release()
+            response.raise_for_status()
+        return response
+
+
+# Define function that send a request and read its JSON result
+async def read_json(client: dict, method: str, api_path: str, data: bytes = None, headers: dict = None) -> dict:
+    """
+    Send a REST request and return the result of its JSON response
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param method: HTTP method in string format
+    :param api_path: path of the REST endpoint after _api/, already encoded, in string format
+    :param data: body of the request in bytes format
+    :param headers: dictionary with additional headers
+    :return: result: dictionary with the result of the request
+    """
+    # Read whole response, empty responses have no result
+    async with await send_request(client, method, api_path, data, headers) as response:
+        body = await response.read()
+    if not body:
+        return {}
+    return json.loads(body).get("d", {})
+
+
+# Define function that encode a parameter of a REST path
+def quote_parameter(value: str) -> str:
+    """
+    Escape quotes and encode a value written between quotes in a REST path
+    :param value: value of the parameter in string format
+    :return: quoted_value: encoded value in string format
+    """
+    # Double quotes as OData expects and encode every reserved character
+    return quote(value.replace("'", "''"), safe="")
+
+
+# Define function that address a folder or a file by its path
+def get_item_call(item_type: str, item_path: str) -> str:
+    """
+    Return the REST path that address a folder or a file by its server relative path
+    :param item_type: type of the item, "folder" or "file", in string format
+    :param item_path: server relative path of the item in string format
+    :return: item_call: encoded REST path in string format
+    """
+    # Encode path as parameter of the call
+    return f"web/get{item_type.capitalize()}ByServerRelativePath(DecodedUrl='{quote_parameter(item_path)}')"
+
+
+# Define function that retrieve all subfolders
+async def get_folder_data(client: dict, folder_path: str) -> list:
+    """
+    Return a list with the names of subdirectories from provided URL
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param folder_path: path of the directory in string format
+    :return: folders_name: list with subdirectories name
+    """
+    # Retrieve all subfolders with only their names
+    result = await read_json(client, "GET", f"{get_item_call('folder', folder_path)}/Folders?$select=Name")
+
+    # Return a list of subfolders name
+    return [folder["Name"] for folder in result.get("results", [])]
+
+
+# Define function that retrieve all files
+async def get_folder_files(client: dict, folder_path: str) -> list:
+    """
+    Return a list with the names of files from folder
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param folder_path: path of the directory in string format
+    :return: files_name: list with files name
+    """
+    # Retrieve all files with only their names
+    result = await read_json(client, "GET", f"{get_item_call('folder', folder_path)}/Files?$select=Name")
+
+    # Return a list of files name
+    return [file["Name"] for file in result.get("results", [])]
+
+
+# Define function that retrieve all subfolders and files with their details
+async def get_folder_content(client: dict, folder_path: str) -> tuple:
+    """
+    Return the details of subdirectories and files from provided URL using a single request
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param folder_path: path of the directory in string format
+    :return: folders_details, files_details: lists with details of subdirectories and files
+    """
+    # Expand subfolders and files and select only needed properties
+    selected_properties = ",".join(["Folders/" + name for name in folder_properties] + ["Files/" + name for name in file_properties])
+    result = await read_json(client, "GET", f"{get_item_call('folder', folder_path)}?$expand=Folders,Files&$select={selected_properties}")
+
+    # Describe every subfolder and file the same way as the synchronous listing
+    folders_details = [describe_item(SimpleNamespace(properties=folder), "folder") for folder in result["Folders"]["results"]]
+    files_details = [describe_item(SimpleNamespace(properties=file), "file") for file in result["Files"]["results"]]
+
+    # Return details of subfolders and files
+    return folders_details, files_details
+
+
+# Define function that walk the whole directory tree
+async def crawl_tree(client: dict, root_path: str, max_listings: int = async_listings) -> AsyncIterator[dict]:
+    """
+    Walk through all subdirectories of provided URL keeping up to max_listings listings in flight, and yield every
+    folder and file found
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param root_path: path of the root directory in string format
+    :param max_listings: maximum number of folders listed at the same time in integer format
+    :return: item_details: dictionary with name, path, type, size, modified time and ETag of each item
+    """
+    # Keep only the paths of folders waiting to be listed and the listings in progress
+    pending_folders = [root_path]
+    running_listings = set()
+    try:
+        while pending_folders or running_listings:
+            # Start listings until the limit is reached
+            while pending_folders and len(running_listings) < max_listings:
+                running_listings.add(asyncio.create_task(get_folder_content(client, pending_folders.pop())))
+
+            # Emit the content of finished folders and queue their subfolders
+            finished_listings, running_listings = await asyncio.wait(running_listings, return_when=asyncio.FIRST_COMPLETED)
+            for listing in finished_listings:
+                folders_details, files_details = listing.result()
+                for folder in folders_details:
+                    pending_folders.append(folder["path"])
+                    yield folder
+                for file in files_details:
+                    yield file
+
+    # Cancel listings in progress if the walk is stopped or fails
+    finally:
+        for listing in running_listings:
+            listing.cancel()
+
+
+# Define function that download file from SharePoint
+async def download_file(client: dict, file_url: str, local_folder: str = None) -> int:
+    """
+    Download a file to local disk from SharePoint, streaming it into a temporary file renamed when complete
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param file_url: path of the SharePoint file in string format
+    :param local_folder: path of the local directory in string format, the current working directory if not provided
+    :return: bytes_read: number of downloaded bytes in integer format
+    """
+    # Write content into a temporary file in the destination directory
+    local_path = os.path.join(local_folder or os.getcwd(), file_url.split("/")[-1])
+    temp_descriptor, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(local_path)}.", suffix=".part", dir=os.path.dirname(local_path))
+    bytes_read = 0
+    try:
+        # Write chunks from a thread so the disk doesn't block other requests
+        with os.fdopen(temp_descriptor, "wb") as temp_file:
+            async with await send_request(client, "GET", f"{get_item_call('file', file_url)}/$value") as response:
+                async for chunk in response.content.iter_chunked(upload_chunk_size):
+                    await asyncio.to_thread(temp_file.write, chunk)
+                    bytes_read += len(chunk)
+        os.replace(temp_path, local_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    # Return number of downloaded bytes
+    return bytes_read
+
+
+# Define function that upload file to SharePoint
+async def upload_file(client: dict, file_name: str, folder_url: str, local_folder: str = None) -> None:
+    """
+    Upload a file to SharePoint from local disk, in a single request or in an upload session for large files
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param file_name: name of the file in string format
+    :param folder_url: path of the SharePoint folder in string format
+    :param local_folder: path of the local directory in string format, the current working directory if not provided
+    :return: None
+    """
+    # Read local file from a thread so the disk doesn't block other requests
+    local_path = os.path.join(local_folder or os.getcwd(), file_name)
+    file_size = os.path.getsize(local_path)
+    add_call = f"{get_item_call('folder', folder_url)}/Files/add(url='{quote_parameter(file_name)}',overwrite=true)"
+    with open(local_path, "rb") as file_object:
+        # Send small file in a single request
+        if file_size <= upload_session_size:
+            await read_json(client, "POST", add_call, await asyncio.to_thread(file_object.read))
+            return
+
+        # Create an empty file and send content chunk by chunk in an upload session
+        await read_json(client, "POST", add_call, b"")
+        file_call = get_item_call("file", folder_url + "/" + file_name)
+        upload_id = str(uuid.uuid4())
+        file_offset = 0
+        while file_offset < file_size:
+            chunk = await asyncio.to_thread(file_object.read, upload_chunk_size)
+            if not chunk:
+                raise EOFError(f"Content of '{file_name}' ended after {file_offset} of {file_size} bytes")
+            if file_offset + len(chunk) >= file_size:
+                session_call = f"finishUpload(uploadID=guid'{upload_id}',fileOffset={file_offset})"
+            elif file_offset == 0:
+                session_call = f"startUpload(uploadID=guid'{upload_id}')"
+            else:
+                session_call = f"continueUpload(uploadID=guid'{upload_id}',fileOffset={file_offset})"
+            await read_json(client, "POST", f"{file_call}/{session_call}", chunk)
+            file_offset += len(chunk)
+
+
+# Define function that delete a folder or a file
+async def delete_item(client: dict, item_path: str, item_type: str) -> None:
+    """
+    Delete a folder with its content or a file
+    :param client: dictionary with site URL, HTTP session, authentication headers and form digest
+    :param item_path: server relative path of the item in string format
+    :param item_type: type of the item, "folder" or "file", in string format
+    :return: None
+    """
+    # Send delete through POST like the SharePoint client does
+    await read_json(client, "POST", get_item_call(item_type, item_path), headers={"X-HTTP-Method": "DELETE", "IF-MATCH": "*"})
+
+
+# Define function that count a tree with the asynchronous client
+async def count_tree(root_path: str, max_listings: int = async_listings) -> dict:
+    """
+    Crawl the whole tree with one client and count its folders, files and bytes
+    :param root_path: path of the root directory in string format
+    :param max_listings: maximum number of folders listed at the same time in integer format
+    :return: statistics: dictionary with number of folders, files and bytes
+    """
+    # Crawl tree and count items
+    client = await open_client()
+    statistics = {"folder": 0, "file": 0, "size": 0}
+    try:
+        async for item in crawl_tree(client, root_path, max_listings):
+            statistics[item["type"]] += 1
+            statistics["size"] += item["size"]
+    finally:
+        await close_client(client)
+
+    # Return statistics
+    return statistics
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define path of directory to be crawled
+    root_path = "/sites/<enterprise_site>/<parent_directory>/<...>"
+
+    # Crawl tree and display statistics
+    start_time = time.perf_counter()
+    statistics = asyncio.run(count_tree(root_path))
+    print(f"Found {statistics['folder']} folders and {statistics['file']} files ({statistics['size'] / 1024 / 1024:.1f} MB), "
+          f"time: {time.perf_counter() - start_time:.1f} s.")
@@ -0,0 +1,311 @@
+# Import necessary libraries
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+# Import internal utilities
+import client_pool
+import fake_sharepoint
+import throttling
+from cleaning_tool import delete_directory
+from client_pool import get_request_count
+from copy_scheduler import run_copy_jobs
+from migration_journal import append_record, close_journal, open_journal
+from rename_folders import restructure_stores
+from sharepoint_tools import copy_folder, upload_session_size
+from tree_crawler import crawl_tree
+
+# Define root of the document library of the fake site
+library_path = fake_sharepoint.site_path + "/Shared Documents"
+
+# Define size of the data used by the scenarios
+benchmark_sizes = {"tree_depth": 3, "folders_per_folder": 4, "files_per_folder": 20, "file_size": 16 * 1024,
+                   "copied_files": 200, "large_file_size": 3 * upload_session_size, "stores": 200, "journal_records": 50000}
+
+# Define relative increase of time or requests, compared with the baseline, reported as a regression
+regression_tolerance = 0.25
+
+
+# Define function that connect the tools to the fake server
+def connect_to_fake(site_url: str, rate_limited: bool = False) -> None:
+    """
+    Send the requests of all tools to the fake site through the connection pool, with a dummy access token
+    :param site_url: URL of the fake site in string format
+    :param rate_limited: keep the requests per second of the throttling policies, disabled to measure the tools only
+    :return: None
+    """
+    # Import SharePoint client only when the benchmark runs
+    from office365.runtime.auth.token_response import TokenResponse
+    from office365.sharepoint.client_context import ClientContext
+
+    # Replace site and authentication shared by all connections
+    with client_pool.authentication_lock:
+        client_pool.site_url = site_url
+        client_pool.enable_pooling()
+        client_pool.authentication = ClientContext(site_url).with_access_token(
+            lambda: TokenResponse("fake-token", "Bearer")).authentication_context
+
+    # Remove rate limits so the time depends only on the tools and the server latency
+    if not rate_limited:
+        for policy in throttling.retry_policies.values():
+            policy["requests_per_second"] = 0
+
+
+# Define function that run and measure a scenario
+def measure_scenario(scenario_name: str, action, items_name: str) -> dict:
+    """
+    Run the scenario action and measure its wall time, requests sent by the tools and received by the server, and throughput
+    :param scenario_name: name of the scenario in string format
+    :param action: function that run the scenario and return the number of handled items and bytes
+    :param items_name: name of the handled items in string format
+    :return: result: dictionary with scenario name, time, requests, operations, items, bytes and throughput
+    """
+    # Start from empty server counters, messages of the tools are hidden
+    fake_sharepoint.request_counts.clear()
+    fake_sharepoint.operation_counts.clear()
+    requests_before = get_request_count()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items_number, bytes_number = action()
+    elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+
+    # Return measures of the scenario
+    return {"scenario": scenario_name, "time": elapsed_time, "requests": get_request_count() - requests_before,
+            "server_requests": sum(fake_sharepoint.request_counts.values()), "throttled": fake_sharepoint.request_counts["throttled"],
+            "operations": dict(fake_sharepoint.operation_counts), "items": items_number, "items_name": items_name,
+            "bytes": bytes_number, "items_per_second": items_number / elapsed_time, "mb_per_second": bytes_number / 1024 / 1024 / elapsed_time}
+
+
+# Define function that seed the tree used by listing, copy and delete scenarios
+def seed_source_tree(root_path: str) -> dict:
+    """
+    Fill the fake site with a tree of the benchmark size
+    :param root_path: server relative path of the tree in string format
+    :return: statistics: dictionary with number of created folders, files and bytes
+    """
+    # Create tree with configured size
+    return fake_sharepoint.seed_tree(root_path, benchmark_sizes["tree_depth"], benchmark_sizes["folders_per_folder"],
+                                     benchmark_sizes["files_per_folder"], benchmark_sizes["file_size"])
+
+
+# Define function that measure the listing of a tree
+def benchmark_listing() -> dict:
+    """
+    Measure the crawl of a whole tree
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Crawl seeded tree and count its items
+    seed_source_tree(library_path + "/Listing")
+
+    def crawl() -> tuple:
+        items = list(crawl_tree(library_path + "/Listing"))
+        return len(items), 0
+
+    return measure_scenario("listing", crawl, "items")
+
+
+# Define function that measure the copy of files
+def benchmark_copy_files() -> dict:
+    """
+    Measure the copy of small files and of a file large enough to be copied in chunks
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Create source files and an empty destination
+    source_path = library_path + "/CopySource"
+    destination_path = library_path + "/CopyDestination"
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(destination_path)
+        for file_index in range(benchmark_sizes["copied_files"]):
+            fake_sharepoint.add_file(f"{source_path}/File_{file_index}.bin", size=benchmark_sizes["file_size"])
+        fake_sharepoint.add_file(f"{source_path}/Large.bin", size=benchmark_sizes["large_file_size"])
+
+    # Copy every file with the copy scheduler
+    def copy() -> tuple:
+        file_names = [f"File_{file_index}.bin" for file_index in range(benchmark_sizes["copied_files"])] + ["Large.bin"]
+        jobs = [{"type": "file", "name": file_name, "source": f"{source_path}/{file_name}", "destination": destination_path}
+                for file_name in file_names]
+        results = run_copy_jobs(jobs)
+        failed_results = [result for result in results if result["status"] != "copied"]
+        if failed_results:
+            raise RuntimeError(f"{len(failed_results)} copies failed: {failed_results[0]['error']}")
+        return len(results), benchmark_sizes["copied_files"] * benchmark_sizes["file_size"] + benchmark_sizes["large_file_size"]
+
+    return measure_scenario("copy_files", copy, "files")
+
+
+# Define function that measure the copy of a folder
+def benchmark_copy_folder() -> dict:
+    """
+    Measure the server side copy of a whole folder
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Copy seeded tree into a new folder
+    tree_size = seed_source_tree(library_path + "/FolderSource/Tree")
+
+    def copy() -> tuple:
+        copy_folder(library_path + "/FolderSource/Tree", library_path + "/FolderDestination/Tree")
+        return tree_size["files"], tree_size["bytes"]
+
+    return measure_scenario("copy_folder", copy, "files")
+
+
+# Define function that measure the restructure of stores
+def benchmark_restructure() -> dict:
+    """
+    Measure the rename and the creation of subfolders in many stores
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Create stores with a folder to be renamed
+    stores_path = [f"{library_path}/Stores/Store_{store_index}" for store_index in range(benchmark_sizes["stores"])]
+    with fake_sharepoint.state_lock:
+        for store_path in stores_path:
+            fake_sharepoint.add_folder(store_path + "/Folder_01")
+
+    # Rename a folder and create two folders in every store
+    def restructure() -> tuple:
+        restructure_stores(stores_path, {"rename": {"Folder_01": "Folder_1"}, "create": ["Folder_2", "Folder_3"]})
+        return len(stores_path), 0
+
+    return measure_scenario("restructure", restructure, "stores")
+
+
+# Define function that measure the delete of a tree
+def benchmark_delete() -> dict:
+    """
+    Measure the delete of a whole tree
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Delete seeded tree
+    seed_source_tree(library_path + "/Delete")
+
+    def delete() -> tuple:
+        deleted_items = delete_directory(library_path + "/Delete")
+        return deleted_items["folders"] + deleted_items["files"], 0
+
+    return measure_scenario("delete", delete, "items")
+
+
+# Define function that measure the migration log
+def benchmark_logging() -> dict:
+    """
+    Measure the journal of migration records and its Excel report, without any request
+    :param None
+    :return: result: dictionary with measures of the scenario
+    """
+    # Write records and report into a temporary folder
+    with tempfile.TemporaryDirectory() as temporary_folder:
+        def log() -> tuple:
+            journal = open_journal(os.path.join(temporary_folder, "journal.jsonl"))
+            for record_index in range(benchmark_sizes["journal_records"]):
+                append_record(journal, {"source": f"{library_path}/Source/File_{record_index}.bin", "destination": f"{library_path}/Destination",
+                                        "type": "file", "status": "copied", "error": ""})
+            close_journal(journal, os.path.join(temporary_folder, "report.xlsx"))
+            return benchmark_sizes["journal_records"], os.path.getsize(journal["path"])
+
+        return measure_scenario("logging", log, "records")
+
+
+# Define scenarios run by the suite
+benchmark_scenarios = {"listing": benchmark_listing, "copy_files": benchmark_copy_files, "copy_folder": benchmark_copy_folder,
+                       "restructure": benchmark_restructure, "delete": benchmark_delete, "logging": benchmark_logging}
+
+
+# Define function that run the benchmark suite
+def run_benchmarks(scenarios: list = None, latency: float = 0.0, throttle_rate: float = 0.0, retry_after: int = 0) -> list:
+    """
+    Start the fake server with provided behaviour and run every scenario against it
+    :param scenarios: list with names of scenarios to run, all scenarios if not provided
+    :param latency: delay of every request in seconds in float format
+    :param throttle_rate: part of the requests answered with status 429 in float format
+    :param retry_after: delay asked by the server to throttled requests in seconds in integer format
+    :return: results: list of dictionaries with measures of every scenario
+    """
+    # Start server and connect the tools to it
+    fake_server = fake_sharepoint.start_server()
+    fake_sharepoint.server_settings.update({"latency": latency, "throttle_rate": throttle_rate, "retry_after": retry_after})
+    connect_to_fake(fake_sharepoint.get_site_url(fake_server))
+
+    # Run scenarios from an empty site
+    results = []
+    try:
+        for scenario_name in scenarios or list(benchmark_scenarios):
+            fake_sharepoint.reset_site()
+            results.append(benchmark_scenarios[scenario_name]())
+    finally:
+        fake_server.shutdown()
+
+    # Return measures of all scenarios
+    return results
+
+
+# Define function that compare results with a baseline
+def find_regressions(results: list, baseline: list, tolerance: float = regression_tolerance) -> list:
+    """
+    Compare time and requests of every scenario with the baseline and describe the ones that increased above the tolerance
+    :param results: list of dictionaries with measures of every scenario
+    :param baseline: list of dictionaries with measures of a previous run
+    :param tolerance: allowed relative increase in float format
+    :return: regressions: list with description of every regression
+    """
+    # Compare scenarios present in both runs, requests must not grow at all beyond the tolerance
+    baseline_results = {result["scenario"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous_result = baseline_results.get(result["scenario"])
+        if previous_result is None:
+            continue
+        for measure in ["time", "requests"]:
+            if result[measure] > previous_result[measure] * (1 + tolerance) and result[measure] - previous_result[measure] > 0.05:
+                regressions.append(f"{result['scenario']}: {measure} increased from {previous_result[measure]:.2f} to {result[measure]:.2f}")
+
+    # Return regressions
+    return regressions
+
+
+# Define function that display the results of the suite
+def display_benchmark_report(results: list) -> None:
+    """
+    Display time, requests and throughput of every scenario
+    :param results: list of dictionaries with measures of every scenario
+    :return: None
+    """
+    # Display one line per scenario
+    for result in results:
+        throughput = f"{result['items_per_second']:.0f} {result['items_name']}/s"
+        if result["bytes"]:
+            throughput += f", {result['mb_per_second']:.1f} MB/s"
+        print(f"{result['scenario']:<12} {result['time']:7.2f} s  {result['requests']:6} requests  "
+              f"{result['server_requests']:6} received  {result['throttled']:4} throttled  {result['items']:7} {result['items_name']}  {throughput}")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define server behaviour and baseline file, the first run saves the baseline
+    latency = 0.0
+    throttle_rate = 0.0
+    baseline_path = os.getcwd() + "/benchmark_baseline.json"
+
+    # Run suite and display results
+    results = run_benchmarks(latency=latency, throttle_rate=throttle_rate)
+    display_benchmark_report(results)
+
+    # Compare with the baseline or save it
+    if os.path.isfile(baseline_path):
+        with open(baseline_path, encoding="utf-8") as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file))
+        for regression in regressions:
+            print(f"Regression in {regression}")
+        print(f"Found {len(regressions)} regressions compared with {os.path.basename(baseline_path)}.")
+    else:
+        with open(baseline_path, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Baseline saved into {os.path.basename(baseline_path)}.")
@@ -0,0 +1,204 @@
+# Import necessary libraries
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Import internal utilities, the local scanner is shared with the local tool
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "sharepoint-local-tool"))
+from local_scanner import scan_tree
+from rename_folders import apply_changes_batch, split_batches
+from sharepoint_tools import get_context, run_resumable, throttling_policy, upload_session_size, upload_stream
+from throttling import execute_query
+
+# Define number of parallel uploads, number of uploads waiting for a free worker and number of parallel folder batches
+upload_workers = 8
+upload_queue_size = 64
+folder_workers = 4
+
+
+# Define function that walk a local directory tree
+def scan_local_tree(local_root: str) -> tuple:
+    """
+    Walk through the local tree with the local scanner and return its directories and files with paths relative to the root
+    :param local_root: path of the local root directory in string format
+    :return: directories, files: list with relative paths of directories and list with details of files
+    """
+    # Add the path relative to the root, with the separator used by SharePoint
+    directories, files = [], []
+    for entry in scan_tree(local_root):
+        relative_path = os.path.relpath(entry["path"], local_root).replace(os.sep, "/")
+        if entry["type"] == "folder":
+            directories.append(relative_path)
+        else:
+            files.append(dict(entry, relative_path=relative_path))
+
+    # Return directories and files
+    return directories, files
+
+
+# Define function that create the destination folder hierarchy
+def create_folders(destination_root: str, directories: list, max_workers: int = folder_workers) -> tuple:
+    """
+    Create every local directory in the destination, level by level so parents exist before their subfolders,
+    with batch requests sent in parallel, folders that already exist are kept and a failed batch is created folder by folder
+    :param destination_root: path of the SharePoint destination directory in string format
+    :param directories: list with paths of local directories relative to the root
+    :param max_workers: maximum number of batches sent at the same time in integer format
+    :return: folders_number, failures: number of created folders in integer format and list with failed creations
+    """
+    # Group folders by depth
+    levels = defaultdict(list)
+    for relative_path in directories:
+        parent_path, _, folder_name = relative_path.rpartition("/")
+        levels[relative_path.count("/")].append({"type": "create", "path": (destination_root + "/" + parent_path).rstrip("/"),
+                                                 "name": folder_name})
+
+    # Create every level with parallel batches before the next one
+    folders_number = 0
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for depth in sorted(levels):
+            for applied_number, batch_failures in executor.map(apply_changes_batch, split_batches(levels[depth])):
+                folders_number += applied_number
+                failures += batch_failures
+
+    # Return number of created folders and failed creations
+    return folders_number, failures
+
+
+# Define function that upload a local file from memory-mapped content
+def upload_mapped_file(local_file: dict, folder_url: str) -> None:
+    """
+    Upload a local file to SharePoint sending memory maps of its content as request bodies, so the content is
+    streamed from the page cache instead of being read into Python bytes
+    :param local_file: dictionary with name, path, size and modified time of the local file
+    :param folder_url: path of the SharePoint destination folder in string format
+    :return: None
+    """
+    # Empty files can't be mapped
+    context = get_context()
+    folder = context.web.get_folder_by_server_relative_url(folder_url)
+    if local_file["size"] == 0:
+        folder.files.add(local_file["name"], b"", True)
+        execute_query(context, throttling_policy)
+        return
+
+    with open(local_file["path"], "rb") as file_object:
+        # Send small file in a single request
+        if local_file["size"] <= upload_session_size:
+            with mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                folder.files.add(local_file["name"], content, True)
+                execute_query(context, throttling_policy)
+            return
+
+        # Send large file in chunks, continuing a previous interrupted upload of the same file
+        checkpoint_key = f"{folder_url}/{local_file['name']}|{local_file['path']}|{local_file['size']}|{local_file['modified']}"
+
+        # Define function that upload the content from given upload session and offset
+        def upload_from(upload_id: str, file_offset: int) -> None:
+            position = [file_offset]
+            mapped_chunks = []
+
+            # Define function that map the next chunk, committed offsets are multiples of the chunk size
+            def read_chunk(chunk_size: int):
+                # The previous chunk was sent before the next one is asked, so its map can be closed
+                while mapped_chunks:
+                    mapped_chunks.pop().close()
+                chunk_length = min(chunk_size, local_file["size"] - position[0])
+                if chunk_length <= 0:
+                    return b""
+                if position[0] % mmap.ALLOCATIONGRANULARITY:
+                    file_object.seek(position[0])
+                    chunk = file_object.read(chunk_length)
+                else:
+                    chunk = mmap.mmap(file_object.fileno(), chunk_length, access=mmap.ACCESS_READ, offset=position[0])
+                    mapped_chunks.append(chunk)
+                position[0] += chunk_length
+                return chunk
+
+            # Close the map of the last chunk once it was sent or the upload failed
+            try:
+                upload_stream(SimpleNamespace(read=read_chunk), local_file["name"], local_file["size"], folder_url,
+                              checkpoint_key, upload_id, file_offset)
+            finally:
+                while mapped_chunks:
+                    mapped_chunks.pop().close()
+
+        run_resumable(checkpoint_key, upload_from)
+
+
+# Define function that upload a local directory tree
+def upload_tree(local_root: str, destination_root: str, max_workers: int = upload_workers) -> dict:
+    """
+    Upload the whole content of a local directory into a SharePoint directory, creating the folder hierarchy once
+    and then uploading files with a pool of workers
+    :param local_root: path of the local root directory in string format
+    :param destination_root: path of the SharePoint destination directory in string format
+    :param max_workers: number of files uploaded at the same time in integer format
+    :return: statistics: dictionary with created folders, uploaded files and bytes, errors and elapsed time
+    """
+    # Read local tree and create all destination folders before the uploads start
+    start_time = time.perf_counter()
+    destination_root = destination_root.rstrip("/")
+    directories, files = scan_local_tree(local_root)
+    folders_number, failures = create_folders(destination_root, directories)
+    statistics = {"folders": folders_number, "uploaded": 0, "bytes": 0, "time": 0.0,
+                  "errors": [f"create folder {failure['path']}/{failure['name']}: {failure['error']}" for failure in failures]}
+    statistics_lock = threading.Lock()
+    free_slots = threading.BoundedSemaphore(max_workers + upload_queue_size)
+
+    # Define function that upload a file and count its result
+    def upload_and_count(local_file: dict) -> None:
+        try:
+            parent_path = local_file["relative_path"].rpartition("/")[0]
+            upload_mapped_file(local_file, (destination_root + "/" + parent_path).rstrip("/"))
+            with statistics_lock:
+                statistics["uploaded"] += 1
+                statistics["bytes"] += local_file["size"]
+        except Exception as error:
+            with statistics_lock:
+                statistics["errors"].append(f"upload {local_file['path']}: {error}")
+        finally:
+            free_slots.release()
+
+    # Upload files in parallel, waiting when too many uploads are queued
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for local_file in files:
+            free_slots.acquire()
+            executor.submit(upload_and_count, local_file)
+
+    # Return statistics with elapsed time
+    statistics["time"] = time.perf_counter() - start_time
+    return statistics
+
+
+# Define function that display the summary of an upload
+def display_upload_summary(statistics: dict) -> None:
+    """
+    Display created folders, uploaded files, errors and throughput of the upload
+    :param statistics: dictionary with created folders, uploaded files and bytes, errors and elapsed time
+    :return: None
+    """
+    # Display errors and throughput
+    for error in statistics["errors"]:
+        print(f"Failed to {error}")
+    elapsed_time = max(statistics["time"], 1e-9)
+    print(f"Created {statistics['folders']} folders, uploaded {statistics['uploaded']} files "
+          f"({statistics['bytes'] / 1024 / 1024:.1f} MB), {len(statistics['errors'])} failed in {statistics['time']:.1f} s: "
+          f"{statistics['bytes'] / 1024 / 1024 / elapsed_time:.1f} MB/s, {statistics['uploaded'] / elapsed_time:.0f} files/s.")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define local directory and SharePoint destination
+    local_path = "C:/<file_share>/<directory>"
+    destination_path = "/sites/<enterprise_site>/<destination_directory>"
+
+    # Upload tree and display summary
+    display_upload_summary(upload_tree(local_path, destination_path))
@@ -1,126 +1,193 @@
-# Import necessary modules
-from office365.sharepoint.client_context import ClientContext
-
-# Import internal utilities
-from credentials import username, password, site_url
-from sharepoint_tools import get_folder_data, get_folder_files
-
-# Create connection to the SharePoint
-context = ClientContext(site_url).with_user_credentials(username, password)
-
-
-# Define function for deleting folder
-def delete_folder(folder_path: str) -> None:
-    """
-    Delete folder
-    :param folder_path: folder path in string format
-    :return: None
-    """
-    # Define folder to be deleted and delete it
-    folder_to_delete = context.web.get_folder_by_server_relative_url(folder_path)
-    folder_to_delete.delete_object().execute_query()
-
-
-# Define function for deleting file
-def delete_file(file_path: str) -> None:
-    """
-    Delete file
-    :param file_path: file path in string format
-    :return: None
-    """
-    # Define file to be deleted and delete it
-    file_to_delete = context.web.get_file_by_server_relative_url(file_path)
-    file_to_delete.delete_object().execute_query()
-
-
-# Define function that compose path
-def compose_path(root_path: str, name: str) -> str:
-    """
-    Generate path
-    :param root_path: path of the current directory in string format
-    :param name: name in string format
-    :return: paths_list: new path in string format
-    """
-    # Compose new path by concatenating root path and folder / file name
-    child_path = root_path + "/" + name
-
-    # Return new path
-    return child_path
-
-
-# Define function that decompose path
-def decompose_path(root_path: str) -> str:
-    """
-    Generate path of parent folder
-    :param root_path: path of the current directory in string format
-    :return: parent_path: parent paths in string format
-    """
-    # Compose new path by deleting last part from root path
-    raw_parent_path = root_path.split("/")[:-1]
-    parent_path = "/".join(raw_parent_path)
-
-    # Return new path
-    return parent_path
-
-
-def delete_directory(absolute_path: str):
-    """
-    Delete folder content and the folder itself
-    :param absolute_path: path of the parent directory in string format
-    :return: delete_directory: call itself
-    """
-    # Change global variable
-    global is_content
-
-    # Define folder level to limit delete process
-    check_path = decompose_path(root_path)
-
-    # Generate name of folders and files from current folder
-    folder_names = get_folder_data(absolute_path)
-    file_names = get_folder_files(absolute_path)
-
-    # Delete files and folder if no subfolders
-    if not folder_names:
-        # Delete files
-        if file_names:
-            for file in file_names:
-                file_path = compose_path(absolute_path, file)
-                delete_file(file_path)
-                print(f"Deleted file: {file}.")
-        # Delete folder
-        delete_folder(absolute_path)
-        print(f"Deleted folder: {absolute_path.split('/')[:-1]}.")
-
-        # Go one level up in folder structure
-        relative_path = decompose_path(absolute_path)
-
-        # Stop running if parent folder was deleted
-        if relative_path == check_path:
-            is_content = False
-            print(f"Directory {root_path.split('/')[:-1]} was deleted.")
-
-        # Return function recursively
-        else:
-            return delete_directory(relative_path)
-    
-    # Generate path for first subfolder
-    else:
-        folder = folder_names[0]
-        relative_path = compose_path(absolute_path, folder)
-
-        # Return function recursively
-        return delete_directory(relative_path)
-    
-
-# Run code as a script
-if __name__ == "__main__":
-
-    # Define path of folder to be cleaned
-    root_path = "/sites/<enterprise_site>/<parent_directory>/<...>"
-
-    # Set a flag
-    is_content = True
-
-    # Run deleting process until parent directory is deleted
-    while is_content:
-        delete_directory(root_path)
+# Import necessary libraries
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+# Import necessary modules only for type hints, they are loaded on first connection
+if TYPE_CHECKING:
+    from office365.sharepoint.client_context import ClientContext
+
+# Import internal utilities
+from client_pool import get_client
+from request_metrics import start_configured_metrics
+from sharepoint_tools import batch_size, execute_batch
+from throttling import execute_query
+from trace_profiler import start_profiling_from_arguments, traced
+from tree_crawler import crawl_tree
+
+# Define retry and rate limit policy of the requests
+throttling_policy = "cleaning_tool"
+
+# Define number of parallel batches and listings
+delete_workers = 4
+listing_workers = 8
+
+
+# Define function for deleting folder
+@traced("delete")
+def delete_folder(folder_path: str) -> None:
+    """
+    Delete folder
+    :param folder_path: folder path in string format
+    :return: None
+    """
+    # Define folder to be deleted and delete it
+    context = get_client(throttling_policy)
+    folder_to_delete = context.web.get_folder_by_server_relative_url(folder_path)
+    folder_to_delete.delete_object()
+    execute_query(context, throttling_policy)
+
+
+# Define function for deleting file
+@traced("delete")
+def delete_file(file_path: str) -> None:
+    """
+    Delete file
+    :param file_path: file path in string format
+    :return: None
+    """
+    # Define file to be deleted and delete it
+    context = get_client(throttling_policy)
+    file_to_delete = context.web.get_file_by_server_relative_url(file_path)
+    file_to_delete.delete_object()
+    execute_query(context, throttling_policy)
+
+
+# Define function that delete a single item
+def delete_item(item: dict) -> dict:
+    """
+    Delete provided file or folder with its own request, an item that no longer exists counts as deleted
+    :param item: dictionary with details of the file or folder
+    :return: failure: the item with the error message if it failed, None otherwise
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Delete the item and keep the error if it still exists
+    try:
+        if item["type"] == "file":
+            delete_file(item["path"])
+        else:
+            delete_folder(item["path"])
+    except ClientRequestException as error:
+        if error.response is None or error.response.status_code != 404:
+            return dict(item, error=str(error))
+
+    # Return no failure
+    return None
+
+
+# Define function that delete several items with one request
+@traced("delete")
+def delete_batch(items: list) -> tuple:
+    """
+    Delete provided files and folders with one batch request, deleting them one by one if the batch fails
+    :param items: list with details of files and folders
+    :return: items_number, failures: number of deleted items in integer format and list with items not deleted
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Define function that queue delete of every item
+    def queue_deletes(batch_context: "ClientContext") -> None:
+        for item in items:
+            if item["type"] == "file":
+                batch_context.web.get_file_by_server_relative_url(item["path"]).delete_object()
+            else:
+                batch_context.web.get_folder_by_server_relative_url(item["path"]).delete_object()
+
+    # A single failed item fails the whole batch, so find it by deleting the items one by one
+    try:
+        execute_batch(queue_deletes, throttling_policy)
+    except ClientRequestException:
+        failures = [failure for failure in map(delete_item, items) if failure]
+        return len(items) - len(failures), failures
+
+    # Return number of deleted items and no failure
+    return len(items), []
+
+
+# Define function that group directory content by level
+@traced("listing")
+def collect_tree(root_path: str) -> dict:
+    """
+    List the whole directory once and group its files and folders by depth below the root
+    :param root_path: path of the directory in string format
+    :return: levels: dictionary with depth as key and list with details of files and folders as value
+    """
+    # Compute depth of every item from the number of parts of its path
+    root_depth = root_path.rstrip("/").count("/")
+    levels = defaultdict(list)
+    for item in crawl_tree(root_path, listing_workers):
+        levels[item["path"].count("/") - root_depth].append(item)
+
+    # Return items grouped by level
+    return levels
+
+
+# Define function that delete folder content and the folder itself
+@traced("delete")
+def delete_directory(root_path: str, dry_run: bool = False, max_workers: int = delete_workers) -> dict:
+    """
+    Delete folder content from the deepest level up, each level in parallel batches, then the folder itself
+    :param root_path: path of the directory in string format
+    :param dry_run: only count the items that would be deleted
+    :param max_workers: maximum number of batches sent at the same time in integer format
+    :return: deleted_items: dictionary with number of deleted folders and files and list with failed items
+    """
+    # List directory and count its content
+    levels = collect_tree(root_path)
+    deleted_items = {"folders": 1, "files": 0, "failures": []}
+    for level_items in levels.values():
+        for item in level_items:
+            deleted_items["files" if item["type"] == "file" else "folders"] += 1
+
+    # Stop before deleting anything if it is a dry run
+    if dry_run:
+        return deleted_items
+
+    # Delete levels in post-order, items of the same level are independent so their batches run in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for depth in sorted(levels, reverse=True):
+            level_items = levels.pop(depth)
+            batches = [level_items[index:index + batch_size] for index in range(0, len(level_items), batch_size)]
+            deleted_number = 0
+            for batch_deleted, batch_failures in executor.map(delete_batch, batches):
+                deleted_number += batch_deleted
+                deleted_items["failures"] += batch_failures
+            print(f"Deleted {deleted_number} items from level {depth}.")
+
+    # Delete emptied folder
+    root_failure = delete_item({"type": "folder", "path": root_path})
+    if root_failure:
+        deleted_items["failures"].append(root_failure)
+
+    # Don't count items that were not deleted
+    for failure in deleted_items["failures"]:
+        deleted_items["files" if failure["type"] == "file" else "folders"] -= 1
+
+    # Return number of deleted folders and files with failed items
+    return deleted_items
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define path of folder to be cleaned
+    root_path = "/sites/<enterprise_site>/<parent_directory>/<...>"
+
+    # Set to True to only count the content of the folder
+    dry_run = False
+
+    # Measure requests if an export file is configured, and record a trace if called with --profile
+    start_configured_metrics()
+    start_profiling_from_arguments("cleaning_tool")
+
+    # Delete directory and display statistics
+    deleted_items = delete_directory(root_path, dry_run)
+    if dry_run:
+        print(f"Directory {root_path} contains {deleted_items['folders']} folders and {deleted_items['files']} files.")
+    else:
+        print(f"Directory {root_path} was deleted: {deleted_items['folders']} folders and {deleted_items['files']} files.")
+        for failure in deleted_items["failures"]:
+            print(f"Failed to delete {failure['path']}: {failure['error']}")
@@ -0,0 +1,219 @@
+# Import necessary libraries
+import threading
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+# Import necessary modules only for type hints, they are loaded on first connection
+if TYPE_CHECKING:
+    import requests
+    from office365.sharepoint.client_context import ClientContext
+
+# Import internal utilities
+from credentials import username, password, site_url
+from request_metrics import describe_url, get_body_size, metrics_state, record_request
+from throttling import limit_requests
+from trace_profiler import trace_span, trace_state
+
+# Define number of keep-alive connections kept open to the SharePoint, enough for all parallel workers
+pool_size = 32
+
+# Define adapter that keep connections open and share them between all threads, created on first use
+http_adapter = None
+
+# Define authentication shared by all connections, created on first use
+authentication = None
+authentication_lock = threading.Lock()
+
+# Define storage for the HTTP session and the connections of every thread
+thread_data = threading.local()
+
+# Define counter of the requests sent to the SharePoint
+request_count = 0
+request_lock = threading.Lock()
+
+
+# Define function that count the requests sent to the SharePoint
+def count_request(request) -> None:
+    """
+    Increment the number of requests sent to the SharePoint
+    :param request: request prepared by the SharePoint client
+    :return: None
+    """
+    # Change global variable
+    global request_count
+
+    # Increment the counter, requests can be sent from several threads
+    with request_lock:
+        request_count += 1
+
+
+# Define function that attach the request counter to a connection
+def track_requests(client_context: "ClientContext") -> "ClientContext":
+    """
+    Count every request sent through the provided SharePoint connection
+    :param client_context: connection to the SharePoint
+    :return: client_context: the same connection to the SharePoint
+    """
+    # Call the counter before every request is sent
+    client_context.pending_request().beforeExecute += count_request
+
+    # Return tracked connection
+    return client_context
+
+
+# Define function that return the number of requests
+def get_request_count() -> int:
+    """
+    Return the number of requests sent to the SharePoint since the last reset
+    :param None
+    :return: request_count: number of requests in integer format
+    """
+    # Return current value of the counter
+    with request_lock:
+        return request_count
+
+
+# Define function that reset the number of requests
+def reset_request_count() -> None:
+    """
+    Set the number of requests sent to the SharePoint to zero
+    :param None
+    :return: None
+    """
+    # Change global variable
+    global request_count
+
+    # Reset the counter
+    with request_lock:
+        request_count = 0
+
+
+# Define function that return the HTTP session of the current thread
+def get_session() -> "requests.Session":
+    """
+    Return the HTTP session of the current thread, all sessions share the same pool of open connections
+    :param None
+    :return: session: HTTP session
+    """
+    # Create one session per thread so cookies are not shared, and mount the shared adapter on it
+    if not hasattr(thread_data, "session"):
+        import requests
+        session = requests.Session()
+        session.mount("https://", http_adapter)
+        session.mount("http://", http_adapter)
+        thread_data.session = session
+
+    # Return session of the current thread
+    return thread_data.session
+
+
+# Define function that send a request through the pool
+def send_pooled(method: str):
+    """
+    Return a function with the signature of requests.get / requests.post that send the request through the pool
+    :param method: HTTP method in string format
+    :return: send_request: function that send the request
+    """
+    # Send request with the session of the current thread, measured only when metrics or profiling are enabled
+    def send_request(url: str, **kwargs) -> "requests.Response":
+        if not metrics_state["enabled"] and not trace_state["enabled"]:
+            return get_session().request(method, url, **kwargs)
+
+        # Measure time until the response headers, streamed content is counted from its announced length
+        operation, item_path = describe_url(url)
+        status, received_bytes = "error", 0
+        start_time = time.perf_counter()
+        try:
+            with trace_span(f"{method} {operation}", "network", path=item_path):
+                response = get_session().request(method, url, **kwargs)
+            status, received_bytes = response.status_code, int(response.headers.get("Content-Length") or 0)
+            return response
+        finally:
+            if metrics_state["enabled"]:
+                record_request(method, url, status, get_body_size(kwargs.get("data")), received_bytes, time.perf_counter() - start_time)
+
+    # Return function for the method
+    return send_request
+
+
+# Define function that enable the connection pool
+def enable_pooling() -> None:
+    """
+    Create the shared adapter and send every request of the SharePoint client through the pool instead of opening
+    a new connection each time; caller must hold authentication_lock
+    :param None
+    :return: None
+    """
+    # Change global variable
+    global http_adapter
+
+    # Import HTTP adapter and request module of the SharePoint client
+    from office365.runtime import client_request
+    from requests.adapters import HTTPAdapter
+
+    # Create adapter and replace the functions used by the client to send requests
+    http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    client_request.requests = SimpleNamespace(
+        get=send_pooled("GET"),
+        post=send_pooled("POST"),
+        patch=send_pooled("PATCH"),
+        delete=send_pooled("DELETE"),
+        put=send_pooled("PUT"),
+    )
+
+
+# Define function that return the shared authentication
+def get_authentication():
+    """
+    Return the authentication to the SharePoint, creating it once for all modules and threads
+    :param None
+    :return: authentication: authentication context of the SharePoint client
+    """
+    # Change global variable
+    global authentication
+
+    # Create pool and authentication on first use, several threads can ask for them at the same time
+    with authentication_lock:
+        if authentication is None:
+            from office365.sharepoint.client_context import ClientContext
+            enable_pooling()
+            authentication = ClientContext(site_url).with_user_credentials(username, password).authentication_context
+
+    # Return shared authentication
+    return authentication
+
+
+# Define function that return a connection of the current thread
+def get_client(policy_name: str = "default") -> "ClientContext":
+    """
+    Return the SharePoint connection of the current thread for the policy, counted and rate limited by it
+    :param policy_name: name of the retry and rate limit policy in string format
+    :return: client_context: connection to the SharePoint
+    """
+    # Create one connection per thread and policy, a connection queues queries so it can't be shared between threads
+    clients = thread_data.__dict__.setdefault("clients", {})
+    if policy_name not in clients:
+        from office365.sharepoint.client_context import ClientContext
+        client_context = ClientContext(site_url, get_authentication())
+        clients[policy_name] = limit_requests(track_requests(client_context), policy_name)
+
+    # Return connection of the current thread
+    return clients[policy_name]
+
+
+# Define function that return the batch connection of the current thread
+def get_batch_client() -> "ClientContext":
+    """
+    Return the SharePoint connection used to send batch requests from the current thread
+    :param None
+    :return: batch_context: connection to the SharePoint
+    """
+    # Create connection without hooks, batches are counted and limited by their sender because the hooks
+    # of a connection are called for every query inside the batch
+    if not hasattr(thread_data, "batch_client"):
+        from office365.sharepoint.client_context import ClientContext
+        thread_data.batch_client = ClientContext(site_url, get_authentication())
+
+    # Return connection of the current thread
+    return thread_data.batch_client
@@ -0,0 +1,27 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+import throttling
+from benchmark_suite import connect_to_fake
+from client_pool import reset_request_count
+
+
+# Define fixture that start the fake server once for all tests and connect the tools to it
+@pytest.fixture(scope="session")
+def fake_site():
+    fake_server = fake_sharepoint.start_server()
+    connect_to_fake(fake_sharepoint.get_site_url(fake_server))
+    yield fake_server
+    fake_server.shutdown()
+
+
+# Define fixture that give a test an empty site without throttling, pauses or counted requests from previous tests
+@pytest.fixture
+def empty_site(fake_site):
+    fake_sharepoint.reset_site()
+    fake_sharepoint.server_settings.update(throttle_rate=0.0, throttled_requests=0, throttle_status=429, retry_after=0)
+    throttling.rate_buckets.clear()
+    reset_request_count()
+    return fake_site
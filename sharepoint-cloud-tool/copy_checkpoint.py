@@ -0,0 +1,287 @@
+# Import necessary libraries
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Callable, Iterable, Iterator
+
+# Import internal utilities
+from credentials import site_url
+
+# Define location of the checkpoint database
+checkpoint_path = os.path.join(os.path.expanduser("~"), ".sharepoint_copy_checkpoints.sqlite")
+
+# Define number of changes and number of seconds after which they are committed
+checkpoint_commit_count = 500
+checkpoint_commit_interval = 2.0
+
+
+# Define function that open the checkpoint database
+def open_checkpoints() -> sqlite3.Connection:
+    """
+    Open the checkpoint database in write-ahead mode and create the tables if they don't exist
+    :param None
+    :return: connection: connection to the checkpoint database
+    """
+    # Connect to the database, write-ahead log keeps it consistent if the process dies in the middle of a commit
+    connection = sqlite3.connect(checkpoint_path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("CREATE TABLE IF NOT EXISTS runs (run TEXT PRIMARY KEY, source TEXT, destination TEXT, planned INTEGER, created_at REAL)")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "run TEXT, job_key TEXT, position INTEGER, job TEXT, status TEXT, error TEXT, updated_at REAL, "
+        "PRIMARY KEY (run, job_key))"
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (run, status, position)")
+
+    # Return opened connection
+    return connection
+
+
+# Define function that compute the identity of a run
+def get_run_id(source_path: str, destination_path: str, mapping: dict) -> str:
+    """
+    Return the identity of a copy run, the same source, destination and mapping give the same run
+    :param source_path: path of the source directory in string format
+    :param destination_path: path of the destination directory in string format
+    :param mapping: dictionary with source subdirectory name and destination subdirectory name
+    :return: run_id: identity of the run in string format
+    """
+    # Hash run parameters
+    run_parameters = json.dumps([site_url, source_path, destination_path, mapping], sort_keys=True)
+    return hashlib.sha1(run_parameters.encode("utf-8")).hexdigest()
+
+
+# Define function that compute the identity of a job
+def get_job_key(job: dict) -> str:
+    """
+    Return the identity of a copy job inside its run
+    :param job: dictionary with type, name, source and destination of the copy
+    :return: job_key: identity of the job in string format
+    """
+    # Join the fields that define the copy
+    return "|".join([job["type"], job["source"], job["destination"]])
+
+
+# Define function that return the state of a run
+def get_run_state(run_id: str) -> dict:
+    """
+    Return whether the run was started, fully planned and how many of its jobs are done or not done
+    :param run_id: identity of the run in string format
+    :return: run_state: dictionary with planned flag and number of jobs by status, None if the run doesn't exist
+    """
+    # Read run and count its jobs
+    with closing(open_checkpoints()) as connection:
+        run = connection.execute("SELECT planned FROM runs WHERE run = ?", (run_id,)).fetchone()
+        if run is None:
+            return None
+        counts = dict(connection.execute("SELECT status, COUNT(*) FROM jobs WHERE run = ? GROUP BY status", (run_id,)))
+
+    # Return state of the run
+    return {"planned": bool(run[0]), "counts": counts}
+
+
+# Define function that start a run
+def start_run(run_id: str, source_path: str, destination_path: str, is_resumed: bool) -> None:
+    """
+    Register the run, removing the checkpoints of a previous run with the same identity unless it is resumed
+    :param run_id: identity of the run in string format
+    :param source_path: path of the source directory in string format
+    :param destination_path: path of the destination directory in string format
+    :param is_resumed: keep checkpoints of the previous run
+    :return: None
+    """
+    # Reset previous run and register the new one
+    with closing(open_checkpoints()) as connection, connection:
+        if not is_resumed:
+            connection.execute("DELETE FROM jobs WHERE run = ?", (run_id,))
+            connection.execute("DELETE FROM runs WHERE run = ?", (run_id,))
+        connection.execute("INSERT OR IGNORE INTO runs VALUES (?, ?, ?, 0, ?)", (run_id, source_path, destination_path, time.time()))
+
+
+# Define function that store a group of planned jobs
+def store_planned_jobs(connection: sqlite3.Connection, run_id: str, planned_jobs: list) -> list:
+    """
+    Record a group of planned jobs in one short transaction, keeping the status they got in a previous attempt
+    :param connection: connection to the checkpoint database
+    :param run_id: identity of the run in string format
+    :param planned_jobs: list of tuples with position and job
+    :return: pending_jobs: list of jobs from the group that are not done
+    """
+    # Insert new jobs and read the status of all of them
+    with connection:
+        connection.executemany("INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?, 'planned', NULL, ?)",
+                               [(run_id, get_job_key(job), position, json.dumps(job), time.time()) for position, job in planned_jobs])
+        job_keys = [get_job_key(job) for _, job in planned_jobs]
+        done_keys = {job_key for job_key, status in connection.execute(
+            f"SELECT job_key, status FROM jobs WHERE run = ? AND job_key IN ({', '.join('?' * len(job_keys))})",
+            [run_id] + job_keys) if status == "done"}
+
+    # Return jobs still to be done
+    return [job for _, job in planned_jobs if get_job_key(job) not in done_keys]
+
+
+# Define function that checkpoint jobs while they are planned
+def plan_jobs(run_id: str, jobs: Iterable[dict]) -> Iterator[dict]:
+    """
+    Record every job of the run as planned before it is yielded, and skip jobs completed by a previous attempt
+    :param run_id: identity of the run in string format
+    :param jobs: iterable of dictionaries with type, name, source and destination of each copy
+    :return: job: dictionary with type, name, source and destination of each copy still to be done
+    """
+    # Use own connection, jobs are read by the enumeration thread of the scheduler
+    with closing(open_checkpoints()) as connection:
+        # Store jobs in groups, the database is not locked while the scheduler waits for free workers
+        planned_jobs = []
+        grouped_at = time.monotonic()
+        for position, job in enumerate(jobs):
+            planned_jobs.append((position, job))
+            if len(planned_jobs) >= checkpoint_commit_count or time.monotonic() - grouped_at >= checkpoint_commit_interval:
+                yield from store_planned_jobs(connection, run_id, planned_jobs)
+                planned_jobs = []
+                grouped_at = time.monotonic()
+        if planned_jobs:
+            yield from store_planned_jobs(connection, run_id, planned_jobs)
+
+        # Mark run as fully planned, a resume can then read jobs without listing SharePoint again
+        with connection:
+            connection.execute("UPDATE runs SET planned = 1 WHERE run = ?", (run_id,))
+
+
+# Define function that read the jobs not completed by a previous attempt
+def read_pending_jobs(run_id: str) -> Iterator[dict]:
+    """
+    Read from the checkpoints the jobs of a fully planned run that are not done, in their original order,
+    jobs that were in flight when the previous attempt stopped may be half copied so they are copied again
+    :param run_id: identity of the run in string format
+    :return: job: dictionary with type, name, source and destination of each copy still to be done
+    """
+    # Stream jobs from the database
+    with closing(open_checkpoints()) as connection:
+        for (job,) in connection.execute("SELECT job FROM jobs WHERE run = ? AND status != 'done' ORDER BY position", (run_id,)):
+            yield json.loads(job)
+
+
+# Define function that open the recorder of job results
+def open_results(run_id: str) -> dict:
+    """
+    Prepare the recording of job results of the run
+    :param run_id: identity of the run in string format
+    :return: recorder: dictionary with run identity, database connection, buffered results and last commit time
+    """
+    # Return recorder with its own connection, results are recorded by the thread that runs the copy
+    return {"run": run_id, "connection": open_checkpoints(), "buffer": [], "committed_at": time.monotonic()}
+
+
+# Define function that write buffered results
+def flush_results(recorder: dict) -> None:
+    """
+    Store buffered results in one short transaction
+    :param recorder: dictionary with run identity, database connection, buffered results and last commit time
+    :return: None
+    """
+    # Update status of every buffered job
+    with recorder["connection"]:
+        recorder["connection"].executemany("UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE run = ? AND job_key = ?",
+                                           recorder["buffer"])
+    recorder["buffer"] = []
+    recorder["committed_at"] = time.monotonic()
+
+
+# Define function that record the start of a job
+def record_start(recorder: dict, job: dict) -> None:
+    """
+    Store that a worker started to copy the job, so after a crash it is known to be possibly half copied
+    :param recorder: dictionary with run identity, database connection, buffered results and last commit time
+    :param job: dictionary with type, name, source and destination of the copy
+    :return: None
+    """
+    # Store the status with the buffered results, it must not wait for the next group
+    recorder["buffer"].append(("in_flight", None, time.time(), recorder["run"], get_job_key(job)))
+    flush_results(recorder)
+
+
+# Define function that record the result of a job
+def record_result(recorder: dict, result: dict) -> None:
+    """
+    Buffer the status of a finished job and store the buffer when it is full or old enough
+    :param recorder: dictionary with run identity, database connection, buffered results and last commit time
+    :param result: finished copy job with status and error message
+    :return: None
+    """
+    # Buffer job status
+    status = "done" if result["status"] == "copied" else result["status"]
+    recorder["buffer"].append((status, result.get("error"), time.time(), recorder["run"], get_job_key(result)))
+
+    # Store in groups, at most the last group is copied again after a crash
+    if len(recorder["buffer"]) >= checkpoint_commit_count or time.monotonic() - recorder["committed_at"] >= checkpoint_commit_interval:
+        flush_results(recorder)
+
+
+# Define function that close the recorder of job results
+def close_results(recorder: dict) -> None:
+    """
+    Store remaining results, and remove the checkpoints of the run if all its jobs are done
+    :param recorder: dictionary with run identity, database connection, buffered results and last commit time
+    :return: None
+    """
+    # Store remaining results
+    flush_results(recorder)
+
+    # Forget finished run, there is nothing left to resume
+    connection = recorder["connection"]
+    with closing(connection), connection:
+        is_planned = connection.execute("SELECT planned FROM runs WHERE run = ?", (recorder["run"],)).fetchone()
+        not_done = connection.execute("SELECT COUNT(*) FROM jobs WHERE run = ? AND status != 'done'", (recorder["run"],)).fetchone()[0]
+        if is_planned and is_planned[0] and not not_done:
+            connection.execute("DELETE FROM jobs WHERE run = ?", (recorder["run"],))
+            connection.execute("DELETE FROM runs WHERE run = ?", (recorder["run"],))
+
+
+# Define function that return the jobs of a run
+def checkpoint_run(run_id: str, source_path: str, destination_path: str, generate_jobs: Callable[[], Iterable[dict]],
+                   is_resumed: bool) -> Iterator[dict]:
+    """
+    Return the jobs of the run, read from the checkpoints when a fully planned run is resumed, otherwise
+    generated again and checkpointed while they are planned
+    :param run_id: identity of the run in string format
+    :param source_path: path of the source directory in string format
+    :param destination_path: path of the destination directory in string format
+    :param generate_jobs: function without parameters that generate the jobs of the run
+    :param is_resumed: continue the previous attempt of the run
+    :return: jobs: iterator of dictionaries with type, name, source and destination of each copy still to be done
+    """
+    # Read pending jobs without listing SharePoint if the previous attempt planned all of them
+    run_state = get_run_state(run_id) if is_resumed else None
+    if run_state and run_state["planned"]:
+        return read_pending_jobs(run_id)
+
+    # Plan jobs again, skipping those completed by the previous attempt
+    start_run(run_id, source_path, destination_path, is_resumed)
+    return plan_jobs(run_id, generate_jobs())
+
+
+# Define function that ask to resume an interrupted run
+def confirm_resume(run_id: str) -> bool:
+    """
+    Display the progress of a previous attempt of the run and ask the user to resume it
+    :param run_id: identity of the run in string format
+    :return: is_resumed: True if the previous attempt is continued, False if the run starts from the beginning
+    """
+    # Start from the beginning if there is nothing to resume
+    run_state = get_run_state(run_id)
+    if run_state is None:
+        return False
+
+    # Display progress of the previous attempt and ask user to resume it, items being copied are copied again
+    done_jobs = run_state["counts"].get("done", 0)
+    in_flight_jobs = run_state["counts"].get("in_flight", 0)
+    checkpointed_jobs = sum(run_state["counts"].values())
+    print(f"Previous copy was interrupted after {done_jobs} of {checkpointed_jobs} "
+          f"{'' if run_state['planned'] else 'planned '}items.")
+    if in_flight_jobs:
+        print(f"{in_flight_jobs} items were being copied and will be copied again.")
+    return input("Resume it? (y/n): ").strip().lower() == "y"
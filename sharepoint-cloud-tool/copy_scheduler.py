@@ -0,0 +1,132 @@
+# Import necessary libraries
+import queue
+import threading
+from typing import Callable, Iterable
+
+# Import internal utilities
+from sharepoint_tools import copy_file, copy_folder
+
+# Define number of parallel copies and size of the queues between stages
+copy_workers = 8
+copy_queue_size = 64
+
+
+# Define function that copy a file or a folder described by a job
+def copy_job(job: dict) -> None:
+    """
+    Copy the file or the folder described by the job
+    :param job: dictionary with type, name, source and destination of the copy
+    :return: None
+    """
+    # Copy file into destination folder or folder into destination path
+    if job["type"] == "file":
+        copy_file(job["name"], job["source"], job["destination"])
+    else:
+        copy_folder(job["source"], job["destination"])
+
+
+# Define function that run copy jobs in parallel
+def run_copy_jobs(jobs: Iterable[dict], on_result: Callable[[dict], None] = None, max_workers: int = copy_workers,
+                  queue_size: int = copy_queue_size, keep_results: bool = True, on_start: Callable[[dict], None] = None) -> list:
+    """
+    Copy files and folders with a pool of workers, reading jobs and reporting results through bounded queues
+    :param jobs: iterable of dictionaries with type, name, source and destination of each copy
+    :param on_result: function called from the current thread with the result of every finished job
+    :param max_workers: number of copies running at the same time in integer format
+    :param queue_size: maximum number of jobs waiting in each queue in integer format
+    :param keep_results: keep results to return them, disable it to copy any number of jobs in constant memory
+    :param on_start: function called from the current thread with every job taken by a worker, while it is copied
+    :return: results: list of jobs in their original order with status "copied" or "failed" and error message
+    """
+    # Create queues between enumeration, transfer and logging
+    job_queue = queue.Queue(maxsize=queue_size)
+    result_queue = queue.Queue(maxsize=queue_size)
+    enumeration_errors = []
+    stop_event = threading.Event()
+
+    # Define function that read jobs, waiting while the workers are busy, until the run is stopped
+    def enumerate_jobs() -> None:
+        try:
+            for index, job in enumerate(jobs):
+                if stop_event.is_set():
+                    break
+                job_queue.put((index, job))
+        except Exception as error:
+            enumeration_errors.append(error)
+        finally:
+            for _ in range(max_workers):
+                job_queue.put(None)
+
+    # Define function that copy jobs until there are no more jobs, jobs taken after the run is stopped are skipped
+    def transfer_jobs() -> None:
+        while True:
+            queued_job = job_queue.get()
+            if queued_job is None:
+                result_queue.put(None)
+                return
+            if stop_event.is_set():
+                continue
+            index, job = queued_job
+            if on_start:
+                result_queue.put((index, dict(job, status="in_flight", error="")))
+            try:
+                copy_job(job)
+                result = dict(job, status="copied", error="")
+            except Exception as error:
+                result = dict(job, status="failed", error=str(error))
+            result_queue.put((index, result))
+
+    # Start enumeration and transfer stages
+    threads = [threading.Thread(target=enumerate_jobs, daemon=True)]
+    threads += [threading.Thread(target=transfer_jobs, daemon=True) for _ in range(max_workers)]
+    for thread in threads:
+        thread.start()
+
+    # Handle results in the current thread until every worker stopped
+    results = {}
+    stopped_workers = 0
+    try:
+        while stopped_workers < max_workers:
+            queued_result = result_queue.get()
+            if queued_result is None:
+                stopped_workers += 1
+                continue
+            index, result = queued_result
+            if result["status"] == "in_flight":
+                on_start(result)
+                continue
+            if keep_results:
+                results[index] = result
+            if on_result:
+                on_result(result)
+    finally:
+        # If handling a result failed, stop the run and free the stages blocked on full queues, copies in progress finish first
+        stop_event.set()
+        while any(thread.is_alive() for thread in threads):
+            try:
+                result_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for thread in threads:
+            thread.join()
+
+    # Raise enumeration error
+    if enumeration_errors:
+        raise enumeration_errors[0]
+
+    # Return results in the order of the jobs
+    return [results[index] for index in sorted(results)]
+
+
+# Define function that display the result of the copy jobs
+def display_copy_report(results: list) -> None:
+    """
+    Display the number of copied items and the error of every failed copy
+    :param results: list of finished jobs with status and error message
+    :return: None
+    """
+    # Display failed copies and summary
+    failed_results = [result for result in results if result["status"] == "failed"]
+    for result in failed_results:
+        print(f"Failed to copy '{result['source']}' into '{result['destination']}': {result['error']}")
+    print(f"Copied {len(results) - len(failed_results)} of {len(results)} items, {len(failed_results)} failed.")
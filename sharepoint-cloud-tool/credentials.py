@@ -1,8 +1,8 @@
-# Provide active user name that has access permisions
-username = "user.name@example.com"
-
-# Provide valid password of the account
-password = "Password"
-
-# Provide company / personal SharePoint site URL
+# Provide active user name that has access permisions
+username = "user.name@example.com"
+
+# Provide valid password of the account
+password = "Password"
+
+# Provide company / personal SharePoint site URL
 site_url = "https://<enterprise>.sharepoint.com/sites/<enterprise site>"
\ No newline at end of file
@@ -0,0 +1,273 @@
+# Import necessary libraries
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+# Import internal utilities
+from client_pool import get_request_count
+from cleaning_tool import delete_batch
+from copy_scheduler import run_copy_jobs
+from credentials import site_url
+from sharepoint_tools import batch_size
+from tree_crawler import crawl_tree
+
+# Define location of the database with the source version of every synced file
+sync_state_path = os.path.join(os.path.expanduser("~"), ".sharepoint_sync_state.sqlite")
+
+# Define number of parallel listings of each tree
+sync_listing_workers = 8
+
+# Define number of requests of a full copy of one file: properties, download and upload
+file_copy_requests = 3
+
+
+# Define function that open the sync state database
+def open_sync_state() -> sqlite3.Connection:
+    """
+    Open the sync state database and create the table if it doesn't exist
+    :param None
+    :return: connection: connection to the sync state database
+    """
+    # Connect to the database and prepare the table
+    connection = sqlite3.connect(sync_state_path, timeout=30)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS synced ("
+        "site TEXT, source TEXT, destination TEXT, path TEXT, etag TEXT, size INTEGER, synced_at REAL, "
+        "PRIMARY KEY (site, source, destination, path))"
+    )
+
+    # Return opened connection
+    return connection
+
+
+# Define function that read the source version of synced files
+def read_sync_state(source_root: str, destination_root: str) -> dict:
+    """
+    Return the ETag and size every file had in the source when it was last synced
+    :param source_root: path of the source directory in string format
+    :param destination_root: path of the destination directory in string format
+    :return: synced_files: dictionary with path relative to the root as key and tuple of ETag and size as value
+    """
+    # Read all files synced between both roots
+    with closing(open_sync_state()) as connection:
+        rows = connection.execute("SELECT path, etag, size FROM synced WHERE site = ? AND source = ? AND destination = ?",
+                                  (site_url, source_root, destination_root))
+        return {path: (etag, size) for path, etag, size in rows}
+
+
+# Define function that store the source version of synced files
+def write_sync_state(source_root: str, destination_root: str, synced_files: list, deleted_paths: list) -> None:
+    """
+    Save the ETag and size of synced source files and forget files deleted from the destination
+    :param source_root: path of the source directory in string format
+    :param destination_root: path of the destination directory in string format
+    :param synced_files: list with details of source files the same in the destination, path relative to the root
+    :param deleted_paths: list with paths relative to the root of deleted files and folders
+    :return: None
+    """
+    # Save synced files and drop deleted ones with their content, compared by prefix so % and _ in names are not wildcards
+    now = time.time()
+    with closing(open_sync_state()) as connection, connection:
+        connection.executemany("INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               [(site_url, source_root, destination_root, item["relative_path"], item["etag"], item["size"], now)
+                                for item in synced_files])
+        connection.executemany("DELETE FROM synced WHERE site = ? AND source = ? AND destination = ? "
+                               "AND (path = ? OR substr(path, 1, length(?)) = ?)",
+                               [(site_url, source_root, destination_root, path, path + "/", path + "/") for path in deleted_paths])
+
+
+# Define function that list a directory tree by relative path
+def list_tree(root_path: str, max_workers: int = sync_listing_workers) -> dict:
+    """
+    Return every folder and file under provided URL with its path relative to the root
+    :param root_path: path of the root directory in string format
+    :param max_workers: maximum number of folders listed at the same time in integer format
+    :return: tree: dictionary with case folded path relative to the root as key and details of the item as value
+    """
+    # SharePoint paths ignore case, so a case-only rename keeps the same key, the details keep the original relative path
+    tree = {}
+    for item in crawl_tree(root_path, max_workers):
+        relative_path = item["path"][len(root_path.rstrip("/")) + 1:]
+        tree[relative_path.casefold()] = dict(item, relative_path=relative_path)
+
+    # Return listed tree
+    return tree
+
+
+# Define function that check if an item is inside one of the folders
+def is_inside(relative_path: str, folders_path: set) -> bool:
+    """
+    Check if any parent directory of the item is one of provided folders
+    :param relative_path: path of the item in string format
+    :param folders_path: set with paths of folders, relative to the same root as the item
+    :return: is_inside: True if the item is inside one of the folders
+    """
+    # Check every parent directory of the item
+    path_parts = relative_path.split("/")
+    return any("/".join(path_parts[:index]) in folders_path for index in range(1, len(path_parts)))
+
+
+# Define function that decide if a file must be copied again
+def is_changed(source_file: dict, destination_file: dict, synced_version: tuple) -> bool:
+    """
+    Compare a source file with its copy, ETag of the last sync is trusted first, then size and modified time
+    :param source_file: details of the source file
+    :param destination_file: details of the destination file
+    :param synced_version: tuple with ETag and size the source file had when it was last synced, None if unknown
+    :return: is_changed: True if the file must be copied
+    """
+    # Copy if sizes differ, the destination is not a full copy of the source
+    if source_file["size"] != destination_file["size"]:
+        return True
+
+    # Trust the version of the last sync, the destination ETag is always different from the source one
+    if synced_version is not None:
+        return synced_version[0] != source_file["etag"]
+
+    # Without sync state, copy if the source was modified after its copy was written
+    return str(source_file["modified"] or "") > str(destination_file["modified"] or "")
+
+
+# Define function that plan the delta between two trees
+def plan_delta(source_root: str, destination_root: str, propagate_deletions: bool = False,
+               max_workers: int = sync_listing_workers) -> dict:
+    """
+    List both trees in parallel and find what must be copied and deleted so the destination matches the source
+    :param source_root: path of the source directory in string format
+    :param destination_root: path of the destination directory in string format
+    :param propagate_deletions: delete destination items that are no longer in the source
+    :param max_workers: maximum number of folders listed at the same time in each tree in integer format
+    :return: delta: dictionary with copy jobs, items to delete, all source files and statistics
+    """
+    # List source and destination at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_listing = executor.submit(list_tree, source_root, max_workers)
+        destination_listing = executor.submit(list_tree, destination_root, max_workers)
+        source_tree, destination_tree = source_listing.result(), destination_listing.result()
+    synced_files = {path.casefold(): version for path, version in read_sync_state(source_root, destination_root).items()}
+
+    # Copy whole folders missing in the destination, their content is copied with them
+    jobs, source_files, missing_folders = [], [], set()
+    statistics = {"files": 0, "bytes": 0, "copied_files": 0, "copied_bytes": 0, "deleted": 0}
+    for relative_path, item in sorted(source_tree.items()):
+        parent_path = item["relative_path"].rpartition("/")[0]
+        is_inside_missing = is_inside(relative_path, missing_folders)
+        if item["type"] == "folder":
+            if relative_path not in destination_tree and not is_inside_missing:
+                missing_folders.add(relative_path)
+                jobs.append({"type": "folder", "name": item["name"], "source": item["path"],
+                             "destination": destination_root + "/" + item["relative_path"]})
+            continue
+
+        # Copy new and changed files into their destination folder
+        source_files.append(item)
+        statistics["files"] += 1
+        statistics["bytes"] += item["size"]
+        destination_file = destination_tree.get(relative_path)
+        if is_inside_missing or destination_file is None or is_changed(item, destination_file, synced_files.get(relative_path)):
+            if not is_inside_missing:
+                jobs.append({"type": "file", "name": item["name"], "source": item["path"],
+                             "destination": (destination_root + "/" + parent_path).rstrip("/")})
+            statistics["copied_files"] += 1
+            statistics["copied_bytes"] += item["size"]
+
+    # Delete destination items without source, a deleted folder takes its content with it
+    deleted_items = []
+    if propagate_deletions:
+        removed_paths = {relative_path for relative_path in destination_tree if relative_path not in source_tree}
+        deleted_items = [destination_tree[relative_path] for relative_path in sorted(removed_paths)
+                         if not is_inside(relative_path, removed_paths)]
+        statistics["deleted"] = len(deleted_items)
+
+    # Return delta
+    return {"jobs": jobs, "source_files": source_files, "deleted_items": deleted_items, "statistics": statistics}
+
+
+# Define function that synchronize destination with source
+def sync_delta(source_root: str, destination_root: str, propagate_deletions: bool = False, dry_run: bool = False,
+               max_workers: int = sync_listing_workers) -> dict:
+    """
+    Copy only new and changed files from source to destination and, if requested, delete items removed from the source
+    :param source_root: path of the source directory in string format
+    :param destination_root: path of the destination directory in string format
+    :param propagate_deletions: delete destination items that are no longer in the source
+    :param dry_run: only plan and report the delta without changing anything
+    :param max_workers: maximum number of folders listed at the same time in each tree in integer format
+    :return: statistics: dictionary with numbers of files, bytes, copies, deletions, failures and requests
+    """
+    # Plan delta
+    requests_before = get_request_count()
+    delta = plan_delta(source_root.rstrip("/"), destination_root.rstrip("/"), propagate_deletions, max_workers)
+    statistics = dict(delta["statistics"], failed=0)
+    if dry_run:
+        statistics["requests"] = get_request_count() - requests_before
+        return statistics
+
+    # Copy new and changed items, remembering which source versions reached the destination
+    failed_paths = set()
+
+    # Define function that handle every finished copy
+    def check_result(result: dict) -> None:
+        if result["status"] == "failed":
+            failed_paths.add(result["source"])
+            print(f"Failed to copy '{result['source']}' into '{result['destination']}': {result['error']}")
+
+    run_copy_jobs(delta["jobs"], check_result, keep_results=False)
+    statistics["failed"] = len(failed_paths)
+
+    # Delete items removed from the source in batches, items not deleted stay in the sync state
+    deleted_items = delta["deleted_items"]
+    failed_deletes = set()
+    for index in range(0, len(deleted_items), batch_size):
+        _, failures = delete_batch(deleted_items[index:index + batch_size])
+        for failure in failures:
+            failed_deletes.add(failure["path"])
+            print(f"Failed to delete '{failure['path']}': {failure['error']}")
+    deleted_items = [item for item in deleted_items if item["path"] not in failed_deletes]
+    statistics["failed"] += len(failed_deletes)
+
+    # Store source version of files that are now the same in the destination, files of a failed copy are not stored
+    synced_files = [item for item in delta["source_files"]
+                    if item["path"] not in failed_paths and not is_inside(item["path"], failed_paths)]
+    write_sync_state(source_root.rstrip("/"), destination_root.rstrip("/"), synced_files,
+                     [item["relative_path"] for item in deleted_items])
+
+    # Return statistics with number of requests used
+    statistics["requests"] = get_request_count() - requests_before
+    return statistics
+
+
+# Define function that display the savings of a delta sync
+def display_delta_report(statistics: dict) -> None:
+    """
+    Display copied and deleted items and how many bytes and requests the delta saved compared with a full copy
+    :param statistics: dictionary with numbers of files, bytes, copies, deletions, failures and requests
+    :return: None
+    """
+    # Compare with a full copy of every source file
+    skipped_files = statistics["files"] - statistics["copied_files"]
+    saved_bytes = statistics["bytes"] - statistics["copied_bytes"]
+    full_copy_requests = statistics["files"] * file_copy_requests
+    print(f"Copied {statistics['copied_files']} of {statistics['files']} files "
+          f"({statistics['copied_bytes'] / 1024 / 1024:.1f} of {statistics['bytes'] / 1024 / 1024:.1f} MB), "
+          f"deleted {statistics['deleted']} items, {statistics['failed']} failed.")
+    print(f"Skipped {skipped_files} unchanged files, saved {saved_bytes / 1024 / 1024:.1f} MB and about "
+          f"{full_copy_requests - statistics['requests']} requests ({statistics['requests']} used, about {full_copy_requests} for a full copy).")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define source and destination to be synchronized
+    source_path = "/sites/<enterprise_site>/<source_directory>"
+    destination_path = "/sites/<enterprise_site>/<destination_directory>"
+    propagate_deletions = False
+    dry_run = True
+
+    # Synchronize and display statistics
+    start_time = time.perf_counter()
+    statistics = sync_delta(source_path, destination_path, propagate_deletions, dry_run)
+    display_delta_report(statistics)
+    print(f"Sync time: {time.perf_counter() - start_time:.1f} s.")
@@ -0,0 +1,552 @@
+# Import necessary libraries
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Define server relative path of the fake site
+site_path = "/sites/fake"
+
+# Define behaviour of the server: delay of every request, part of requests throttled, number of next requests always
+# throttled, status and delay asked when throttled
+server_settings = {"latency": 0.0, "throttle_rate": 0.0, "throttled_requests": 0, "throttle_status": 429, "retry_after": 1}
+
+# Define content of the fake site, folders and files are kept by server relative path
+folders = {}
+files = {}
+uploads = {}
+state_lock = threading.Lock()
+
+# Define number of received requests by route, a batch is one request and its parts are counted as operations
+request_counts = Counter()
+operation_counts = Counter()
+
+
+# Define function that return the current time in SharePoint format
+def get_timestamp() -> str:
+    """
+    Return the current time in the format used by SharePoint for modified times
+    :param None
+    :return: timestamp: UTC time in ISO format in string format
+    """
+    # Format current UTC time
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+# Define function that reset the fake site
+def reset_site() -> None:
+    """
+    Delete all folders, files, upload sessions and request counts, keeping only the root of the site
+    :param None
+    :return: None
+    """
+    # Clear content and counters
+    with state_lock:
+        folders.clear()
+        files.clear()
+        uploads.clear()
+        folders[site_path] = {"modified": get_timestamp(), "id": str(uuid.uuid4())}
+    request_counts.clear()
+    operation_counts.clear()
+
+
+# Define function that create a folder and its missing parents
+def add_folder(folder_path: str) -> None:
+    """
+    Create a folder of the fake site with all its missing parents; caller must hold state_lock
+    :param folder_path: server relative path of the folder in string format
+    :return: None
+    """
+    # Create parents first
+    parent_path = folder_path.rsplit("/", 1)[0]
+    if parent_path and parent_path not in folders and parent_path.startswith(site_path):
+        add_folder(parent_path)
+    if folder_path not in folders:
+        folders[folder_path] = {"modified": get_timestamp(), "id": str(uuid.uuid4())}
+
+
+# Define function that store a file
+def add_file(file_path: str, content: bytes = None, size: int = 0) -> None:
+    """
+    Create or replace a file of the fake site; caller must hold state_lock
+    :param file_path: server relative path of the file in string format
+    :param content: content of the file, None to generate it from the path when it is downloaded
+    :param size: size of the generated content in bytes in integer format
+    :return: None
+    """
+    # Keep version of replaced file, a new version changes the ETag
+    add_folder(file_path.rsplit("/", 1)[0])
+    version = files[file_path]["version"] + 1 if file_path in files else 1
+    files[file_path] = {"content": content, "size": len(content) if content is not None else size,
+                        "modified": get_timestamp(), "id": str(uuid.uuid4()), "version": version}
+
+
+# Define function that return the content of a file
+def read_file(file_path: str) -> bytes:
+    """
+    Return the stored content of a file, or a content generated from its path for seeded files
+    :param file_path: server relative path of the file in string format
+    :return: content: content of the file in bytes format
+    """
+    # Repeat the hash of the path up to the size of the file
+    file = files[file_path]
+    if file["content"] is not None:
+        return file["content"]
+    pattern = hashlib.sha256(file_path.encode("utf-8")).digest()
+    return (pattern * (file["size"] // len(pattern) + 1))[:file["size"]]
+
+
+# Define function that fill the fake site with a directory tree
+def seed_tree(root_path: str, depth: int = 2, folders_per_folder: int = 3, files_per_folder: int = 10, file_size: int = 1024) -> dict:
+    """
+    Create a tree of folders and files with generated content under provided path
+    :param root_path: server relative path of the root directory in string format
+    :param depth: number of folder levels under the root in integer format
+    :param folders_per_folder: number of subfolders of every folder above the last level in integer format
+    :param files_per_folder: number of files of every folder in integer format
+    :param file_size: size of every file in bytes in integer format
+    :return: statistics: dictionary with number of created folders, files and bytes
+    """
+    # Create folders level by level and files in every folder
+    statistics = {"folders": 0, "files": 0, "bytes": 0}
+    level = [root_path]
+    with state_lock:
+        add_folder(root_path)
+        for current_depth in range(depth + 1):
+            next_level = []
+            for folder_path in level:
+                for file_index in range(files_per_folder):
+                    add_file(f"{folder_path}/File_{file_index}.bin", size=file_size)
+                    statistics["files"] += 1
+                    statistics["bytes"] += file_size
+                if current_depth < depth:
+                    for folder_index in range(folders_per_folder):
+                        subfolder_path = f"{folder_path}/Folder_{folder_index}"
+                        add_folder(subfolder_path)
+                        next_level.append(subfolder_path)
+                        statistics["folders"] += 1
+            level = next_level
+
+    # Return size of the tree
+    return statistics
+
+
+# Define function that list direct children of a folder
+def list_children(folder_path: str) -> tuple:
+    """
+    Return paths of subfolders and files directly inside a folder; caller must hold state_lock
+    :param folder_path: server relative path of the folder in string format
+    :return: subfolders_path, files_path: lists with paths of subfolders and files
+    """
+    # Keep paths whose parent is the folder
+    subfolders_path = [path for path in folders if path.rsplit("/", 1)[0] == folder_path]
+    files_path = [path for path in files if path.rsplit("/", 1)[0] == folder_path]
+
+    # Return children
+    return subfolders_path, files_path
+
+
+# Define function that describe a file
+def describe_file(file_path: str) -> dict:
+    """
+    Build the JSON entity of a file; caller must hold state_lock
+    :param file_path: server relative path of the file in string format
+    :return: entity: dictionary with file properties in SharePoint format
+    """
+    # Return properties read by the tools
+    file = files[file_path]
+    return {"Name": file_path.rsplit("/", 1)[1], "ServerRelativeUrl": file_path, "ServerRelativePath": {"DecodedUrl": file_path},
+            "Length": str(file["size"]), "TimeLastModified": file["modified"], "ETag": f"\"{{{file['id']}}},{file['version']}\"",
+            "UniqueId": file["id"], "Exists": True}
+
+
+# Define function that describe a folder
+def describe_folder(folder_path: str, expand: list = ()) -> dict:
+    """
+    Build the JSON entity of a folder with requested expansions; caller must hold state_lock
+    :param folder_path: server relative path of the folder in string format
+    :param expand: list with names of expanded properties
+    :return: entity: dictionary with folder properties in SharePoint format
+    """
+    # Describe folder and count its direct children
+    subfolders_path, files_path = list_children(folder_path)
+    entity = {"Name": folder_path.rsplit("/", 1)[1], "ServerRelativeUrl": folder_path, "ServerRelativePath": {"DecodedUrl": folder_path},
+              "ItemCount": len(subfolders_path) + len(files_path), "TimeLastModified": folders[folder_path]["modified"],
+              "UniqueId": folders[folder_path]["id"], "Exists": True}
+
+    # Add requested expansions
+    if "Folders" in expand:
+        entity["Folders"] = {"results": [describe_folder(path) for path in subfolders_path]}
+    if "Files" in expand:
+        entity["Files"] = {"results": [describe_file(path) for path in files_path]}
+    if "StorageMetrics" in expand:
+        tree_files = [file for path, file in files.items() if path.startswith(folder_path + "/")]
+        entity["StorageMetrics"] = {"TotalFileCount": len(tree_files), "TotalSize": sum(file["size"] for file in tree_files)}
+
+    # Return entity
+    return entity
+
+
+# Define function that build a response
+def make_response(status: int, payload=None, content_type: str = "application/json;odata=verbose", headers: dict = None) -> tuple:
+    """
+    Build the status, headers and body of a response
+    :param status: HTTP status code in integer format
+    :param payload: JSON payload, raw bytes or None for an empty body
+    :param content_type: content type of the body in string format
+    :param headers: dictionary with additional headers
+    :return: response: tuple with status, headers and body
+    """
+    # Encode JSON payloads
+    body = payload if isinstance(payload, bytes) else (json.dumps(payload).encode("utf-8") if payload is not None else b"")
+    return status, dict({"Content-Type": content_type}, **(headers or {})), body
+
+
+# Define function that build an error response
+def make_error(status: int, message: str) -> tuple:
+    """
+    Build an error response in SharePoint format
+    :param status: HTTP status code in integer format
+    :param message: error message in string format
+    :return: response: tuple with status, headers and body
+    """
+    # Return error payload
+    return make_response(status, {"error": {"code": str(status), "message": {"lang": "en-US", "value": message}}})
+
+
+# Define function that read the parameters of a service operation
+def read_parameters(text: str) -> dict:
+    """
+    Read the parameters written in the URL of a service operation, such as uploadID=guid'...',fileOffset=10
+    :param text: parameters between parentheses in string format
+    :return: parameters: dictionary with parameter name and value in string format
+    """
+    # Take values with or without quotes, a quote inside a value is doubled
+    parameters = re.findall(r"(\w+)=(?:guid)?(?:'((?:[^']|'')*)'|([^,]*))", unquote(text))
+    return {name: quoted_value.replace("''", "'") or value for name, quoted_value, value in parameters}
+
+
+# Define function that answer a folder request
+def handle_folder(method: str, folder_path: str, operation: str, query: dict, body: bytes) -> tuple:
+    """
+    Answer a request addressed to a folder: properties, children, folder and file creation, rename and delete
+    :param method: HTTP method, or X-HTTP-Method when provided, in string format
+    :param folder_path: server relative path of the folder in string format
+    :param operation: part of the URL after the folder in string format
+    :param query: dictionary with query string parameters
+    :param body: body of the request in bytes format
+    :return: response: tuple with status, headers and body
+    """
+    with state_lock:
+        # Create subfolder, existing folders are kept like SharePoint does
+        creation = re.match(r"/Folders/add\((?:url=)?'([^']*)'\)", operation, re.I)
+        if creation:
+            operation_counts["create_folder"] += 1
+            add_folder(folder_path + "/" + unquote(creation.group(1)))
+            return make_response(200, {"d": describe_folder(folder_path + "/" + unquote(creation.group(1)))})
+
+        # Add file with the content of the body
+        upload = re.match(r"/Files/add\(([^)]*)\)", operation, re.I)
+        if upload:
+            operation_counts["add_file"] += 1
+            if folder_path not in folders:
+                return make_error(404, "File Not Found.")
+            file_path = folder_path + "/" + read_parameters(upload.group(1))["url"]
+            add_file(file_path, body)
+            return make_response(200, {"d": describe_file(file_path)})
+
+        # Report missing folder
+        if folder_path not in folders:
+            return make_error(404, "File Not Found.")
+
+        # Rename folder through its list item
+        if operation.lower() == "/listitemallfields" and method in ("MERGE", "PATCH", "POST"):
+            operation_counts["rename_folder"] += 1
+            new_name = json.loads(body or b"{}").get("FileLeafRef")
+            new_path = folder_path.rsplit("/", 1)[0] + "/" + new_name
+            for path in [path for path in folders if path == folder_path or path.startswith(folder_path + "/")]:
+                folders[new_path + path[len(folder_path):]] = folders.pop(path)
+            for path in [path for path in files if path.startswith(folder_path + "/")]:
+                files[new_path + path[len(folder_path):]] = files.pop(path)
+            return make_response(204)
+
+        # Delete folder with its content
+        if method == "DELETE" and not operation:
+            operation_counts["delete_folder"] += 1
+            for path in [path for path in folders if path == folder_path or path.startswith(folder_path + "/")]:
+                del folders[path]
+            for path in [path for path in files if path.startswith(folder_path + "/")]:
+                del files[path]
+            return make_response(200)
+
+        # Return children or properties of the folder
+        operation_counts["read_folder"] += 1
+        subfolders_path, files_path = list_children(folder_path)
+        if operation.lower() == "/folders":
+            return make_response(200, {"d": {"results": [describe_folder(path) for path in subfolders_path]}})
+        if operation.lower() == "/files":
+            return make_response(200, {"d": {"results": [describe_file(path) for path in files_path]}})
+        expand = [name.strip() for name in query.get("$expand", [""])[0].split(",") if name.strip()]
+        return make_response(200, {"d": describe_folder(folder_path, expand)})
+
+
+# Define function that answer a file request
+def handle_file(method: str, file_path: str, operation: str, headers: dict, body: bytes) -> tuple:
+    """
+    Answer a request addressed to a file: properties, download, chunked upload and delete
+    :param method: HTTP method, or X-HTTP-Method when provided, in string format
+    :param file_path: server relative path of the file in string format
+    :param operation: part of the URL after the file in string format
+    :param headers: dictionary with request headers
+    :param body: body of the request in bytes format
+    :return: response: tuple with status, headers and body
+    """
+    with state_lock:
+        # Continue chunked upload sessions
+        session = re.match(r"/(startUpload|continueUpload|finishUpload)\(([^)]*)\)", operation, re.I)
+        if session:
+            operation_counts[session.group(1).lower()] += 1
+            parameters = read_parameters(session.group(2))
+            upload_id = parameters["uploadID"]
+            if session.group(1).lower() == "startupload":
+                uploads[upload_id] = bytearray()
+            if upload_id not in uploads or int(parameters.get("fileOffset", 0)) != len(uploads[upload_id]):
+                return make_error(400, "The upload session is not valid.")
+            uploads[upload_id] += body
+            if session.group(1).lower() == "finishupload":
+                add_file(file_path, bytes(uploads.pop(upload_id)))
+                return make_response(200, {"d": describe_file(file_path)})
+            result_name = "StartUpload" if session.group(1).lower() == "startupload" else "ContinueUpload"
+            return make_response(200, {"d": {result_name: str(len(uploads[upload_id]))}})
+
+        # Report missing file
+        if file_path not in files:
+            return make_error(404, "File Not Found.")
+
+        # Delete file
+        if method == "DELETE" and not operation:
+            operation_counts["delete_file"] += 1
+            del files[file_path]
+            return make_response(200)
+
+        # Send content, from the requested position if a range is provided
+        if operation == "/$value":
+            operation_counts["download_file"] += 1
+            content = read_file(file_path)
+            byte_range = re.match(r"bytes=(\d+)-", headers.get("Range", ""))
+            if byte_range:
+                return make_response(206, content[int(byte_range.group(1)):], "application/octet-stream")
+            return make_response(200, content, "application/octet-stream")
+
+        # Return properties of the file
+        operation_counts["read_file"] += 1
+        return make_response(200, {"d": describe_file(file_path)})
+
+
+# Define function that copy a folder with its content
+def handle_copy_folder(body: bytes) -> tuple:
+    """
+    Copy a folder with its content to the destination path, as MoveCopyUtil.CopyFolderByPath does
+    :param body: JSON body with source and destination paths in bytes format
+    :return: response: tuple with status, headers and body
+    """
+    # Convert absolute URLs into server relative paths
+    parameters = json.loads(body)
+    source_path = urlsplit(parameters["srcPath"]["DecodedUrl"]).path or parameters["srcPath"]["DecodedUrl"]
+    destination_path = urlsplit(parameters["destPath"]["DecodedUrl"]).path or parameters["destPath"]["DecodedUrl"]
+
+    # Copy folders and files under the new path
+    operation_counts["copy_folder"] += 1
+    with state_lock:
+        if source_path not in folders:
+            return make_error(404, "File Not Found.")
+        for path in [path for path in folders if path == source_path or path.startswith(source_path + "/")]:
+            add_folder(destination_path + path[len(source_path):])
+        for path in [path for path in files if path.startswith(source_path + "/")]:
+            add_file(destination_path + path[len(source_path):], read_file(path))
+    return make_response(200, {"d": {}})
+
+
+# Define function that answer one request
+def handle_request(method: str, url: str, headers: dict, body: bytes) -> tuple:
+    """
+    Route a request of the REST API to the folder, file, copy or batch handler
+    :param method: HTTP method in string format
+    :param url: absolute or server relative URL of the request in string format
+    :param headers: dictionary with request headers
+    :param body: body of the request in bytes format
+    :return: response: tuple with status, headers and body
+    """
+    # Split URL and read the real method of tunnelled requests
+    split_url = urlsplit(url)
+    path = unquote(split_url.path)
+    query = parse_qs(split_url.query)
+    method = headers.get("X-HTTP-Method", method).upper()
+    api_path = path.split("/_api/", 1)[1] if "/_api/" in path else ""
+
+    # Give a form digest to every client
+    if api_path.lower() == "contextinfo":
+        return make_response(200, {"d": {"GetContextWebInformation": {"FormDigestValue": "fake-digest", "FormDigestTimeoutSeconds": 1800,
+                                                                       "LibraryVersion": "16.0", "SiteFullUrl": "", "WebFullUrl": ""}}})
+
+    # Resolve folders and files addressed by their unique identifier
+    target = re.match(r"web/get(Folder|File)ById\('([^']*)'\)(.*)$", api_path, re.I)
+    if target:
+        with state_lock:
+            items = folders if target.group(1).lower() == "folder" else files
+            target_path = next((path for path, item in items.items() if item["id"] == target.group(2)), "")
+        if target.group(1).lower() == "folder":
+            return handle_folder(method, target_path, target.group(3), query, body)
+        return handle_file(method, target_path, target.group(3), headers, body)
+
+    # Route folder and file requests by their server relative path
+    target = re.match(r"web/get(Folder|File)ByServerRelative(?:Url|Path)\((?:DecodedUrl=)?'((?:[^']|'')*)'\)(.*)$", api_path, re.I)
+    if target:
+        target_path = target.group(2).replace("''", "'").rstrip("/")
+        if target.group(1).lower() == "folder":
+            return handle_folder(method, target_path, target.group(3), query, body)
+        return handle_file(method, target_path, target.group(3), headers, body)
+
+    # Copy folders
+    if api_path.lower().startswith("sp.movecopyutil.copyfolderbypath"):
+        return handle_copy_folder(body)
+
+    # Report unknown endpoint
+    return make_error(404, f"Endpoint {api_path} is not available in the fake server.")
+
+
+# Define function that answer a batch request
+def handle_batch(content_type: str, body: bytes) -> tuple:
+    """
+    Answer every request of a multipart batch and return their responses in the same order
+    :param content_type: content type of the batch with its boundary in string format
+    :param body: multipart body of the batch in bytes format
+    :return: response: tuple with status, headers and body
+    """
+    # Find every request line, its headers and its body, URLs of the parts can contain spaces
+    text = body.decode("utf-8", errors="replace").replace("\r\n", "\n")
+    request_lines = list(re.finditer(r"^(GET|POST|DELETE|MERGE|PATCH|PUT) (.+) HTTP/1\.1$", text, re.M))
+    parts = []
+    for index, request_line in enumerate(request_lines):
+        part_end = request_lines[index + 1].start() if index + 1 < len(request_lines) else len(text)
+        head, _, part_body = text[request_line.end():part_end].partition("\n\n")
+        part_headers = dict((name.strip(), value.strip()) for name, _, value in (line.partition(":") for line in head.split("\n") if ":" in line))
+        part_body = re.split(r"^--", part_body, maxsplit=1, flags=re.M)[0].strip()
+        status, _, response_body = handle_request(request_line.group(1), request_line.group(2), part_headers, part_body.encode("utf-8"))
+        parts.append(f"--batchresponse\r\nContent-Type: application/http\r\nContent-Transfer-Encoding: binary\r\n\r\n"
+                     f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\nCONTENT-TYPE: application/json;odata=verbose\r\n\r\n"
+                     f"{response_body.decode('utf-8') or '{}'}\r\n")
+
+    # Return all responses in one multipart body
+    return make_response(200, ("".join(parts) + "--batchresponse--\r\n").encode("utf-8"), "multipart/mixed; boundary=batchresponse")
+
+
+# Define function that decide if a request is throttled
+def is_throttled() -> bool:
+    """
+    Decide if a request is throttled, the next requests asked by the settings always are, the others by chance
+    :param None
+    :return: is_throttled: True if the request must be answered with the throttle status
+    """
+    # Count down requests that must be throttled
+    with state_lock:
+        if server_settings["throttled_requests"] > 0:
+            server_settings["throttled_requests"] -= 1
+            return True
+    return random.random() < server_settings["throttle_rate"]
+
+
+# Define class that answer HTTP requests of the fake server
+class FakeSharePointHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the fake server, it keeps connections alive like SharePoint so pooled sessions are reused
+    """
+    protocol_version = "HTTP/1.1"
+
+    # Define function that hide request logs
+    def log_message(self, *args) -> None:
+        pass
+
+    # Define function that ignore connections closed by the client, pooled connections are dropped after errors
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except ConnectionError:
+            pass
+
+    # Define function that answer any HTTP method
+    def handle_method(self) -> None:
+        # Read body and wait for the configured latency
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if server_settings["latency"]:
+            time.sleep(server_settings["latency"])
+
+        # Throttle the next requests asked by the settings and part of the others, the form digest is never throttled
+        is_batch = self.path.split("?")[0].endswith("/_api/$batch")
+        request_counts["batch" if is_batch else self.command] += 1
+        if "/contextinfo" not in self.path.lower() and is_throttled():
+            request_counts["throttled"] += 1
+            status, headers, response_body = make_error(server_settings["throttle_status"], "The request has been throttled.")
+            headers["Retry-After"] = str(server_settings["retry_after"])
+        elif is_batch:
+            status, headers, response_body = handle_batch(self.headers.get("Content-Type", ""), body)
+        else:
+            status, headers, response_body = handle_request(self.command, self.path, dict(self.headers), body)
+
+        # Send response
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    do_GET = do_POST = do_DELETE = do_PATCH = do_PUT = do_MERGE = handle_method
+
+
+# Define function that start the fake server
+def start_server(port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the fake server in a background thread with an empty site
+    :param port: port of the server in integer format, 0 to take a free one
+    :return: server: running HTTP server
+    """
+    # Reset site and serve requests until the server is shut down
+    reset_site()
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeSharePointHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Return running server
+    return server
+
+
+# Define function that return the URL of the fake site
+def get_site_url(server: ThreadingHTTPServer) -> str:
+    """
+    Return the URL of the fake site to be used as site URL of the tools
+    :param server: running HTTP server
+    :return: site_url: URL of the fake site in string format
+    """
+    # Join address of the server and path of the site
+    return f"http://127.0.0.1:{server.server_port}{site_path}"
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Start server with a seeded library and serve until interrupted
+    fake_server = start_server(8080)
+    print(seed_tree(site_path + "/Shared Documents/Source", depth=3, folders_per_folder=4, files_per_folder=20))
+    print(f"Fake SharePoint site available at {get_site_url(fake_server)}, press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake_server.shutdown()
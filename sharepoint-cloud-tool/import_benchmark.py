@@ -0,0 +1,99 @@
+# Import necessary libraries
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Define modules measured by the benchmark and modules that must not be loaded on import
+benchmark_modules = ["throttling", "client_pool", "sharepoint_tools", "listing_cache", "copy_scheduler", "tree_crawler",
+                     "preflight", "copy_checkpoint", "delta_sync", "verify_copy", "bulk_upload", "mirror_download", "sharepoint_ui", "rename_folders", "cleaning_tool",
+                     "fake_sharepoint", "benchmark_suite", "request_metrics", "trace_profiler", "async_client"]
+heavy_modules = ["office365", "openpyxl", "requests", "aiohttp"]
+
+# Define maximum time in seconds to import a module and to reach the first prompt of the CLI
+import_time_limit = 0.2
+prompt_time_limit = 1.0
+
+# Define code run in a clean interpreter, network is blocked so an import that connects fails
+import_probe = """
+import json, socket, sys, time
+def block_network(*args, **kwargs):
+    raise OSError("network access during import")
+socket.socket.connect = block_network
+socket.create_connection = block_network
+start_time = time.perf_counter()
+import {module}
+elapsed_time = time.perf_counter() - start_time
+print(json.dumps({{"time": elapsed_time, "loaded": [name for name in {heavy} if name in sys.modules]}}))
+"""
+
+
+# Define function that measure the import of a module
+def measure_import(module_name: str) -> dict:
+    """
+    Import the module in a clean interpreter without network access and measure its import time
+    :param module_name: name of the module in string format
+    :return: result: dictionary with import time, heavy modules loaded and error message
+    """
+    # Run the probe from the folder of the tools
+    probe = import_probe.format(module=module_name, heavy=heavy_modules)
+    process = subprocess.run([sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True)
+
+    # Return measured values or the error raised by the import
+    if process.returncode:
+        return {"time": None, "loaded": [], "error": process.stderr.strip().splitlines()[-1]}
+    return dict(json.loads(process.stdout.strip().splitlines()[-1]), error=None)
+
+
+# Define function that measure the start of the CLI
+def measure_first_prompt() -> float:
+    """
+    Start the CLI and measure the time until it asks for the directory path
+    :param None
+    :return: elapsed_time: number of seconds until the first prompt in float format
+    """
+    # Start the CLI and read its output until the prompt is displayed
+    start_time = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-u", "main.py"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    output = ""
+    while not output.endswith("Provide directory path: "):
+        character = process.stdout.read(1)
+        if not character:
+            break
+        output += character
+    elapsed_time = time.perf_counter() - start_time
+
+    # Stop the CLI without answering
+    process.kill()
+    process.wait()
+
+    # Return time until the first prompt
+    return elapsed_time
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Measure every module and display results
+    is_passed = True
+    for module_name in benchmark_modules:
+        result = measure_import(module_name)
+        if result["error"]:
+            print(f"{module_name:<20} FAILED  {result['error']}")
+            is_passed = False
+            continue
+        status = "ok" if result["time"] < import_time_limit and not result["loaded"] else "SLOW"
+        is_passed = is_passed and status == "ok"
+        print(f"{module_name:<20} {status:<7} {result['time'] * 1000:7.1f} ms  loaded: {', '.join(result['loaded']) or '-'}")
+
+    # Measure start of the CLI
+    prompt_time = measure_first_prompt()
+    status = "ok" if prompt_time < prompt_time_limit else "SLOW"
+    is_passed = is_passed and status == "ok"
+    print(f"{'main (first prompt)':<20} {status:<7} {prompt_time * 1000:7.1f} ms")
+
+    # Exit with error if any limit was exceeded
+    sys.exit(0 if is_passed else 1)
@@ -0,0 +1,135 @@
+# Import necessary libraries
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# Import internal utilities
+from credentials import site_url
+from sharepoint_tools import get_folder_listing, get_folder_stamp
+from trace_profiler import traced
+
+# Define cache location and limits
+cache_path = os.path.join(os.path.expanduser("~"), ".sharepoint_listing_cache.sqlite")
+cache_ttl = 300
+cache_max_entries = 1000
+
+
+# Define function that open the cache database
+def open_cache() -> sqlite3.Connection:
+    """
+    Open the cache database and create the listings table if it doesn't exist
+    :param None
+    :return: connection: connection to the cache database
+    """
+    # Connect to the database and prepare the table
+    connection = sqlite3.connect(cache_path, timeout=30)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS listings ("
+        "site TEXT, path TEXT, folders TEXT, files TEXT, stamp TEXT, stored_at REAL, used_at REAL, "
+        "PRIMARY KEY (site, path))"
+    )
+
+    # Return opened connection
+    return connection
+
+
+# Define function that store a listing in the cache
+def store_listing(folder_path: str, folders_details: list, files_details: list, folder_stamp: str) -> None:
+    """
+    Save content of the directory in the cache and evict least recently used listings above the limit
+    :param folder_path: path of the directory in string format
+    :param folders_details: list with details of subdirectories
+    :param files_details: list with details of files
+    :param folder_stamp: version stamp of the directory in string format
+    :return: None
+    """
+    # Save listing and drop the least recently used ones
+    now = time.time()
+    with closing(open_cache()) as connection, connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (site_url, folder_path, json.dumps(folders_details), json.dumps(files_details), folder_stamp, now, now),
+        )
+        connection.execute(
+            "DELETE FROM listings WHERE rowid NOT IN "
+            "(SELECT rowid FROM listings ORDER BY used_at DESC LIMIT ?)",
+            (cache_max_entries,),
+        )
+
+
+# Define function that invalidate a listing from the cache
+def invalidate_listing(folder_path: str) -> None:
+    """
+    Remove content of the directory from the cache, next visit will read it from SharePoint
+    :param folder_path: path of the directory in string format
+    :return: None
+    """
+    # Delete listing of the folder
+    with closing(open_cache()) as connection, connection:
+        connection.execute("DELETE FROM listings WHERE site = ? AND path = ?", (site_url, folder_path))
+
+
+# Define function that clear the cache
+def clear_cache() -> None:
+    """
+    Remove all listings of the current site from the cache
+    :param None
+    :return: None
+    """
+    # Delete all listings of the site
+    with closing(open_cache()) as connection, connection:
+        connection.execute("DELETE FROM listings WHERE site = ?", (site_url,))
+
+
+# Define function that retrieve subfolders and files using the cache
+@traced("listing")
+def get_cached_content(folder_path: str, refresh: bool = False) -> tuple:
+    """
+    Return the names of subdirectories and files from provided URL, reading SharePoint only when needed
+    :param folder_path: path of the directory in string format
+    :param refresh: read the directory from SharePoint even if it is cached
+    :return: folders_name, files_name: lists with subdirectories and files name
+    """
+    # Look for the listing in the cache
+    with closing(open_cache()) as connection:
+        cached_listing = connection.execute(
+            "SELECT folders, files, stamp, stored_at FROM listings WHERE site = ? AND path = ?",
+            (site_url, folder_path),
+        ).fetchone()
+
+    # Use cached listing while it is fresh or while the folder stamp didn't change
+    folders_details = None
+    now = time.time()
+    if cached_listing and not refresh:
+        cached_folders, cached_files, cached_stamp, stored_at = cached_listing
+        is_fresh = now - stored_at < cache_ttl
+        if is_fresh or get_folder_stamp(folder_path) == cached_stamp:
+            folders_details = json.loads(cached_folders)
+            files_details = json.loads(cached_files)
+
+            # Mark listing as recently used and restart its lifetime if it was validated
+            if not is_fresh:
+                stored_at = now
+            with closing(open_cache()) as connection, connection:
+                connection.execute(
+                    "UPDATE listings SET stored_at = ?, used_at = ? WHERE site = ? AND path = ?",
+                    (stored_at, now, site_url, folder_path),
+                )
+
+    # Read listing from SharePoint and save it in the cache
+    if folders_details is None:
+        folders_details, files_details, folder_stamp = get_folder_listing(folder_path)
+        store_listing(folder_path, folders_details, files_details, folder_stamp)
+
+    # Display the number of subfolders and files
+    print("Number of folders:", len(folders_details))
+    print("Number of files:", len(files_details))
+
+    # Keep only the names
+    folders_name = [folder["name"] for folder in folders_details]
+    files_name = [file["name"] for file in files_details]
+
+    # Return lists of subfolders and files name
+    return folders_name, files_name
@@ -1,106 +1,134 @@
-# Import necessary libraries
-import os
-
-# Import internal utilities
-from sharepoint_tools import get_folder_data, write_to_excel, copy_folder, copy_file, get_folder_files
-from sharepoint_ui import display_greetings, provide_url, generate_options, display_options, generate_path, reset_options
-
-# Define global variables
-content = []
-options = []
-new_path = ""
-
-# Define variables
-excel_name = "SharePoint_Logs"
-mapping_structure = {"Source_Folder_A": "Destination_Folder_A", 
-                     "Source_Folder_B": "Destination_Folder_B",
-                     "Source_Folder_C": "Destination_Folder_C",
-                     "Source_Folder_D": "Destination_Folder_D"
-                     }
-
-# Print initial message
-display_greetings("start")
-
-# Take path from user input and check if it's valid
-user_path = input("Provide directory path: ")
-new_path = provide_url(user_path)
-
-# Generate list of subfolders name
-content = get_folder_data(new_path)
-
-# Generate options for menu with generated content
-generate_options(content)
-
-# Display generated menu
-display_options()
-
-# Loop through user options
-is_continue = True
-while is_continue:
-
-    # Take option from the user
-    user_option = int(input("Choose option: "))
-
-    # Exit from program if user press Exit option or press Back at the root level
-    if user_option == 0 or (user_option == 1 and new_path == user_path):
-        is_continue = False
-        display_greetings("end")
-        SystemExit
-
-    # Display options if user go back
-    elif user_option == 1:
-        # Generate path for new selected directory
-        generate_path(new_path, content, user_option)
-        # Delete all previous options
-        reset_options()
-        # Read and store in a variable all subdirectories from current directory
-        content = get_folder_data(new_path)
-        # Generate options for menu with generated content
-        generate_options(content)
-        # Display generated menu
-        display_options()
-
-    # Write to Excel file with specified name at specified location
-    elif user_option == 2:
-        write_to_excel(excel_name, os.getcwd(), content, 1, 1)
-
-    # Copy the content of the current directory in specified directory
-    elif user_option == 3:
-        # Ask user to introduce destination folder path and copy folder
-        folder_destination = input("Introduce path of the destination folder: ")
-
-        # Iterate through all subfolders name
-        for folder_name in content:
-            folder_source_path = new_path + "/" + folder_name
-
-            # Set copying path according with mapping structure
-            if folder_name in list(mapping_structure.keys()):
-                folder_destination_path = folder_destination + "/" + mapping_structure[folder_name]
-            else:
-                folder_destination_path = folder_destination
-
-            # Copy folder
-            copy_folder(folder_source_path, folder_destination_path)
-
-    # Copy files from current directory in specified directory
-    elif user_option == 4:
-        # Ask user to introduce destination path and copy all files
-        files_name = get_folder_files(new_path)
-        file_destination = input("Introduce path of the file destination: ")
-        for file in files_name:
-            file_source = new_path + "/" + file
-            copy_file(file, file_source, file_destination)
-
-    # Display options if user choose non-default option
-    else:
-        # Generate path for new selected directory
-        generate_path(new_path, content, user_option)
-        # Delete all previous options
-        reset_options()
-        # Read and store in a variable all subdirectories from current directory
-        content = get_folder_data(new_path)
-        # Generate options for menu with generated content
-        generate_options(content)
-        # Display generated menu
-        display_options()
-
+# Import necessary libraries
+import os
+
+# Import internal utilities
+from sharepoint_tools import write_to_excel
+from sharepoint_ui import display_greetings, provide_url, generate_options, display_options, generate_path, reset_options
+from sharepoint_ui import generate_file_jobs, get_refresh_option, invalidate_destination
+from listing_cache import get_cached_content
+from copy_scheduler import run_copy_jobs, display_copy_report
+from preflight import confirm_preflight, generate_mapping_paths
+from request_metrics import start_configured_metrics
+from trace_profiler import start_profiling_from_arguments
+
+# Define global variables
+content = []
+options = []
+new_path = ""
+
+# Define variables
+excel_name = "SharePoint_Logs"
+mapping_structure = {"Source_Folder_A": "Destination_Folder_A", 
+                     "Source_Folder_B": "Destination_Folder_B",
+                     "Source_Folder_C": "Destination_Folder_C",
+                     "Source_Folder_D": "Destination_Folder_D"
+                     }
+
+# Measure requests if an export file is configured, and record a trace if called with --profile
+start_configured_metrics()
+start_profiling_from_arguments("main")
+
+# Print initial message
+display_greetings("start")
+
+# Take path from user input and check if it's valid
+user_path = input("Provide directory path: ")
+new_path = provide_url(user_path)
+
+# Generate list of subfolders name
+content, files = get_cached_content(new_path)
+
+# Generate options for menu with generated content
+generate_options(content)
+
+# Display generated menu
+display_options()
+
+# Loop through user options
+is_continue = True
+while is_continue:
+
+    # Take option from the user
+    user_option = int(input("Choose option: "))
+
+    # Exit from program if user press Exit option or press Back at the root level
+    if user_option == 0 or (user_option == 1 and new_path == user_path):
+        is_continue = False
+        display_greetings("end")
+        SystemExit
+
+    # Display options if user go back
+    elif user_option == 1:
+        # Generate path for new selected directory
+        generate_path(new_path, content, user_option)
+        # Delete all previous options
+        reset_options()
+        # Read and store in a variable all subdirectories from current directory
+        content, files = get_cached_content(new_path)
+        # Generate options for menu with generated content
+        generate_options(content)
+        # Display generated menu
+        display_options()
+
+    # Write to Excel file with specified name at specified location
+    elif user_option == 2:
+        write_to_excel(excel_name, os.getcwd(), content, 1, 1)
+
+    # Copy the content of the current directory in specified directory
+    elif user_option == 3:
+        # Ask user to introduce destination folder path and copy folder
+        folder_destination = input("Introduce path of the destination folder: ")
+
+        # Check all mapped sources and destinations before copying
+        if not confirm_preflight(*generate_mapping_paths(new_path, content, folder_destination, mapping_structure)):
+            continue
+
+        # Iterate through all subfolders name
+        folder_jobs = []
+        for folder_name in content:
+            folder_source_path = new_path + "/" + folder_name
+
+            # Set copying path according with mapping structure
+            if folder_name in list(mapping_structure.keys()):
+                folder_destination_path = folder_destination + "/" + mapping_structure[folder_name]
+            else:
+                folder_destination_path = folder_destination
+
+            # Add folder to the copy jobs
+            folder_jobs.append({"type": "folder", "name": folder_name, "source": folder_source_path, "destination": folder_destination_path})
+
+        # Copy folders in parallel
+        results = run_copy_jobs(folder_jobs, invalidate_destination)
+        display_copy_report(results)
+
+    # Copy files from current directory in specified directory
+    elif user_option == 4:
+        # Ask user to introduce destination path and copy all files in parallel
+        file_destination = input("Introduce path of the file destination: ")
+        results = run_copy_jobs(generate_file_jobs(new_path, files, file_destination), invalidate_destination)
+        display_copy_report(results)
+
+    # Read current directory again from SharePoint
+    elif user_option == get_refresh_option(content):
+        # Delete all previous options
+        reset_options()
+        # Read and store in a variable all subdirectories from current directory ignoring the cache
+        content, files = get_cached_content(new_path, refresh=True)
+        # Generate options for menu with generated content
+        generate_options(content)
+        # Display generated menu
+        display_options()
+
+    # Display options if user choose non-default option
+    else:
+        # Generate path for new selected directory
+        generate_path(new_path, content, user_option)
+        # Delete all previous options
+        reset_options()
+        # Read and store in a variable all subdirectories from current directory
+        content, files = get_cached_content(new_path)
+        # Generate options for menu with generated content
+        generate_options(content)
+        # Display generated menu
+        display_options()
+
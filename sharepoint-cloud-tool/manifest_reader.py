@@ -0,0 +1,173 @@
+# Import necessary libraries
+import os
+import time
+from typing import Callable, Iterator
+
+# Import internal utilities
+from copy_scheduler import run_copy_jobs
+from migration_journal import append_record, close_journal, open_journal
+
+# Define default header of the manifest column used for every job field
+manifest_columns = {"type": "Type", "name": "Name", "source": "Source", "destination": "Destination"}
+
+# Define job fields that must have a column and types of copy that can be requested
+required_fields = ["source", "destination"]
+job_types = {"file", "folder"}
+
+
+# Define function that find the columns of the manifest
+def find_columns(header_row: tuple, column_mapping: dict) -> dict:
+    """
+    Return the position of the column of every job field, matching headers without case and surrounding spaces
+    :param header_row: values of the first row of the manifest
+    :param column_mapping: dictionary with job field as key and column header as value
+    :return: columns: dictionary with job field as key and column index as value
+    """
+    # Find every mapped header in the first row
+    headers = [str(header).strip().lower() if header is not None else "" for header in header_row]
+    columns = {}
+    for field, header in column_mapping.items():
+        if header.strip().lower() in headers:
+            columns[field] = headers.index(header.strip().lower())
+
+    # Stop if a required column is missing
+    missing_fields = [column_mapping.get(field, field) for field in required_fields if field not in columns]
+    if missing_fields:
+        raise ValueError(f"Manifest has no column {', '.join(missing_fields)}.")
+
+    # Return positions of the columns
+    return columns
+
+
+# Define function that build a copy job from a manifest row
+def build_job(row: tuple, columns: dict, default_type: str) -> dict:
+    """
+    Convert a manifest row into a copy job, checking that every value is usable
+    :param row: values of the row
+    :param columns: dictionary with job field as key and column index as value
+    :param default_type: type of copy used when the row doesn't specify it in string format
+    :return: job: dictionary with type, name, source and destination of the copy
+    """
+    # Read the text of every mapped cell
+    values = {}
+    for field, index in columns.items():
+        cell_content = row[index] if index < len(row) else None
+        values[field] = str(cell_content).strip() if cell_content is not None else ""
+
+    # Check source and destination paths
+    for field in required_fields:
+        if not values[field]:
+            raise ValueError(f"{field} is empty")
+        if not values[field].startswith("/"):
+            raise ValueError(f"{field} '{values[field]}' is not a server relative path")
+
+    # Check type of the copy
+    job_type = values.get("type", "").lower() or default_type
+    if job_type not in job_types:
+        raise ValueError(f"type '{job_type}' is not one of {', '.join(sorted(job_types))}")
+
+    # Use last part of the source path when the name is missing
+    source_path = values["source"].rstrip("/")
+    job_name = values.get("name") or source_path.split("/")[-1]
+
+    # Return copy job
+    return {"type": job_type, "name": job_name, "source": source_path, "destination": values["destination"].rstrip("/")}
+
+
+# Define function that display an invalid manifest row
+def report_invalid_row(row_number: int, reason: str) -> None:
+    """
+    Display the row of the manifest that was skipped and the reason
+    :param row_number: number of the row in the sheet in integer format
+    :param reason: reason why the row is invalid in string format
+    :return: None
+    """
+    # Display skipped row
+    print(f"Manifest row {row_number} skipped: {reason}.")
+
+
+# Define function that read copy jobs from a manifest
+def read_manifest(file_path: str, column_mapping: dict = None, sheet_name: str = None, default_type: str = "file",
+                  on_invalid: Callable[[int, str], None] = report_invalid_row) -> Iterator[dict]:
+    """
+    Stream rows of an Excel manifest and yield one copy job for every valid row, memory doesn't depend on the size
+    :param file_path: path of the Excel file in string format
+    :param column_mapping: dictionary with job field as key and column header as value, merged with default headers
+    :param sheet_name: name of the sheet with the manifest, the active sheet if not provided, in string format
+    :param default_type: type of copy used when the row doesn't specify it in string format
+    :param on_invalid: function called with the row number and the reason of every invalid row
+    :return: job: dictionary with type, name, source and destination of the copy
+    """
+    # Import Excel library only when a manifest is read
+    from openpyxl import load_workbook
+
+    # Open workbook in read-only mode, rows are parsed one by one from the file
+    xlsx_book = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = xlsx_book[sheet_name] if sheet_name else xlsx_book.active
+        rows = sheet.iter_rows(values_only=True)
+
+        # Find columns in the header row
+        columns = find_columns(next(rows, ()), dict(manifest_columns, **(column_mapping or {})))
+
+        # Convert every non-empty row into a copy job
+        for row_number, row in enumerate(rows, start=2):
+            if not any(cell_content is not None and str(cell_content).strip() for cell_content in row):
+                continue
+            try:
+                job = build_job(row, columns, default_type)
+            except ValueError as error:
+                if on_invalid:
+                    on_invalid(row_number, str(error))
+                continue
+            yield job
+    finally:
+        xlsx_book.close()
+
+
+# Define function that run the copies listed in a manifest
+def run_manifest(file_path: str, journal_path: str, report_path: str = None, column_mapping: dict = None) -> dict:
+    """
+    Copy every item of the manifest in parallel, storing results in the migration journal instead of in memory
+    :param file_path: path of the Excel manifest in string format
+    :param journal_path: path of the migration journal in string format
+    :param report_path: path of the Excel report written at the end in string format
+    :param column_mapping: dictionary with job field as key and column header as value
+    :return: statistics: dictionary with number of copied and failed items
+    """
+    # Count results and store them in the journal
+    statistics = {"copied": 0, "failed": 0}
+    journal = open_journal(journal_path)
+
+    # Define function that handle every finished copy
+    def store_result(result: dict) -> None:
+        statistics[result["status"]] += 1
+        append_record(journal, {"source": result["source"], "destination": result["destination"],
+                                "type": result["type"], "status": result["status"], "error": result["error"]})
+        if result["status"] == "failed":
+            print(f"Failed to copy '{result['source']}' into '{result['destination']}': {result['error']}")
+
+    # Copy items while the manifest is read
+    try:
+        run_copy_jobs(read_manifest(file_path, column_mapping), store_result, keep_results=False)
+    finally:
+        close_journal(journal, report_path)
+
+    # Return statistics
+    return statistics
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define manifest location, its column headers and log files
+    manifest_path = os.getcwd() + "/Migration_Manifest.xlsx"
+    column_mapping = {"source": "Source", "destination": "Destination"}
+    excel_name = "SharePoint_Logs"
+
+    # Copy all items and display statistics
+    start_time = time.perf_counter()
+    statistics = run_manifest(manifest_path, os.getcwd() + "/" + excel_name + ".jsonl",
+                              os.getcwd() + "/" + excel_name + "_Report.xlsx", column_mapping)
+    elapsed_time = time.perf_counter() - start_time
+    print(f"Copied {statistics['copied']} items, {statistics['failed']} failed, time: {elapsed_time:.1f} s.")
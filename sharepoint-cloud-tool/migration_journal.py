@@ -0,0 +1,123 @@
+# Import necessary libraries
+import json
+import os
+import threading
+import time
+from typing import Iterator
+
+# Import internal utilities
+from trace_profiler import traced
+
+# Define number of records and number of seconds after which buffered records are written to the journal
+journal_flush_count = 500
+journal_flush_interval = 5.0
+
+# Define columns of the Excel report
+report_fields = ["source", "destination", "type", "status", "error", "time"]
+
+
+# Define function that open a journal
+def open_journal(journal_path: str) -> dict:
+    """
+    Prepare a journal that append migration records to provided file, keeping previous records
+    :param journal_path: path of the journal file in string format
+    :return: journal: dictionary with file path, buffered records, last flush time and lock
+    """
+    # Return empty journal, the file is opened only when records are flushed
+    return {"path": journal_path, "buffer": [], "flushed_at": time.monotonic(), "lock": threading.Lock()}
+
+
+# Define function that write buffered records
+def flush_journal(journal: dict) -> None:
+    """
+    Append buffered records to the journal file, one JSON object per line
+    :param journal: dictionary with file path, buffered records, last flush time and lock
+    :return: None
+    """
+    # Take buffered records and append them with a single write
+    with journal["lock"]:
+        records, journal["buffer"] = journal["buffer"], []
+        journal["flushed_at"] = time.monotonic()
+        if records:
+            with open(journal["path"], "a", encoding="utf-8") as journal_file:
+                journal_file.write("".join(json.dumps(record) + "\n" for record in records))
+
+
+# Define function that add a record to a journal
+def append_record(journal: dict, record: dict) -> None:
+    """
+    Buffer a migration record and write the buffer when it is full or old enough
+    :param journal: dictionary with file path, buffered records, last flush time and lock
+    :param record: dictionary with details of the migrated item
+    :return: None
+    """
+    # Buffer record with its time
+    with journal["lock"]:
+        journal["buffer"].append(dict(record, time=time.strftime("%Y-%m-%d %H:%M:%S")))
+        is_due = (len(journal["buffer"]) >= journal_flush_count
+                  or time.monotonic() - journal["flushed_at"] >= journal_flush_interval)
+
+    # Write records outside of the check, flush takes the lock again
+    if is_due:
+        flush_journal(journal)
+
+
+# Define function that read records from a journal
+def read_journal(journal_path: str) -> Iterator[dict]:
+    """
+    Read records from the journal file one by one
+    :param journal_path: path of the journal file in string format
+    :return: record: dictionary with details of each migrated item
+    """
+    # Yield every complete line, a line cut by an interrupted run is skipped
+    if not os.path.isfile(journal_path):
+        return
+    with open(journal_path, encoding="utf-8") as journal_file:
+        for line in journal_file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+# Define function that write the Excel report of a journal
+@traced("excel")
+def write_journal_report(journal_path: str, report_path: str) -> int:
+    """
+    Write all records of the journal into a new Excel file in a single streaming pass
+    :param journal_path: path of the journal file in string format
+    :param report_path: path of the Excel file in string format, it is replaced so it must not be the listing workbook
+    :return: records_number: number of written records in integer format
+    """
+    # Import Excel library only when a report is written
+    from openpyxl import Workbook
+
+    # Stream rows into a write-only workbook, so memory doesn't grow with the journal
+    xlsx_book = Workbook(write_only=True)
+    sheet = xlsx_book.create_sheet("Migration")
+    sheet.append([field.capitalize() for field in report_fields])
+    records_number = 0
+    for record in read_journal(journal_path):
+        sheet.append([record.get(field) for field in report_fields])
+        records_number += 1
+
+    # Save Excel file and display a message of completion
+    xlsx_book.save(report_path)
+    print(f"Excel file {os.path.basename(report_path)} was written with {records_number} records.")
+
+    # Return number of written records
+    return records_number
+
+
+# Define function that close a journal
+def close_journal(journal: dict, report_path: str = None) -> None:
+    """
+    Write remaining records and, if requested, the Excel report of the whole journal
+    :param journal: dictionary with file path, buffered records, last flush time and lock
+    :param report_path: path of the Excel file in string format
+    :return: None
+    """
+    # Write remaining records and the report
+    flush_journal(journal)
+    if report_path:
+        write_journal_report(journal["path"], report_path)
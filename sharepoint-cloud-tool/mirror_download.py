@@ -0,0 +1,135 @@
+# Import necessary libraries
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Import internal utilities
+from sharepoint_tools import download_to_path, upload_chunk_size
+from tree_crawler import crawl_tree
+
+# Define memory used by downloads in progress, every download holds at most one chunk, and maximum parallel downloads
+download_memory_budget = 256 * 1024 * 1024
+download_workers = 16
+
+# Define number of downloads waiting for a free worker and number of parallel listings
+download_queue_size = 256
+listing_workers = 8
+
+# Define difference of modified time in seconds that is still the same file
+mtime_tolerance = 2.0
+
+
+# Define function that convert a SharePoint time to a timestamp
+def parse_modified(modified: str) -> float:
+    """
+    Convert the modified time returned by SharePoint into a timestamp
+    :param modified: modified time in ISO format with time zone in string format
+    :return: timestamp: seconds since epoch in float format, None if the time is missing or can't be read
+    """
+    # Read ISO time, SharePoint marks UTC with Z
+    try:
+        return datetime.fromisoformat(str(modified).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+# Define function that check if a local file is already mirrored
+def is_mirrored(remote_file: dict, local_path: str) -> bool:
+    """
+    Check that the local file has the same size and modified time as the SharePoint file
+    :param remote_file: details of the SharePoint file
+    :param local_path: path of the local file in string format
+    :return: is_mirrored: True if the file doesn't need to be downloaded
+    """
+    # A missing local file is always downloaded
+    try:
+        local_stat = os.stat(local_path)
+    except OSError:
+        return False
+
+    # Compare size and modified time
+    modified_time = parse_modified(remote_file["modified"])
+    return (local_stat.st_size == remote_file["size"] and modified_time is not None
+            and abs(local_stat.st_mtime - modified_time) <= mtime_tolerance)
+
+
+# Define function that download a SharePoint tree
+def mirror_tree(root_path: str, local_root: str, memory_budget: int = download_memory_budget,
+                max_workers: int = download_workers) -> dict:
+    """
+    Reproduce the SharePoint directory under the local root, downloading files while the tree is listed
+    :param root_path: path of the SharePoint root directory in string format
+    :param local_root: path of the local root directory in string format
+    :param memory_budget: maximum bytes held by downloads in progress in integer format
+    :param max_workers: maximum number of files downloaded at the same time in integer format
+    :return: statistics: dictionary with downloaded and skipped files, downloaded bytes, errors and elapsed time
+    """
+    # Run as many downloads as the memory budget allows, every download streams one chunk at a time
+    workers_number = max(1, min(max_workers, memory_budget // upload_chunk_size))
+    statistics = {"downloaded": 0, "skipped": 0, "bytes": 0, "errors": [], "time": 0.0}
+    statistics_lock = threading.Lock()
+    free_slots = threading.BoundedSemaphore(workers_number + download_queue_size)
+    start_time = time.perf_counter()
+    root_path = root_path.rstrip("/")
+
+    # Define function that download a file and count its result
+    def download_and_count(remote_file: dict, local_path: str) -> None:
+        try:
+            if is_mirrored(remote_file, local_path):
+                with statistics_lock:
+                    statistics["skipped"] += 1
+                return
+            bytes_read = download_to_path(remote_file["path"], local_path, parse_modified(remote_file["modified"]))
+            with statistics_lock:
+                statistics["downloaded"] += 1
+                statistics["bytes"] += bytes_read
+        except Exception as error:
+            with statistics_lock:
+                statistics["errors"].append(f"{remote_file['path']}: {error}")
+        finally:
+            free_slots.release()
+
+    # Submit files while the tree is listed, a folder is created before its content is found
+    os.makedirs(local_root, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers_number) as executor:
+        for item in crawl_tree(root_path, listing_workers):
+            local_path = os.path.join(local_root, *item["path"][len(root_path) + 1:].split("/"))
+            if item["type"] == "folder":
+                os.makedirs(local_path, exist_ok=True)
+                continue
+
+            # Wait when too many downloads are queued
+            free_slots.acquire()
+            executor.submit(download_and_count, item, local_path)
+
+    # Return statistics with elapsed time
+    statistics["time"] = time.perf_counter() - start_time
+    return statistics
+
+
+# Define function that display the summary of a mirror download
+def display_mirror_summary(statistics: dict) -> None:
+    """
+    Display downloaded and skipped files, errors and throughput of the download
+    :param statistics: dictionary with downloaded and skipped files, downloaded bytes, errors and elapsed time
+    :return: None
+    """
+    # Display errors and throughput
+    for error in statistics["errors"]:
+        print(f"Failed to download {error}")
+    elapsed_time = max(statistics["time"], 1e-9)
+    print(f"Downloaded {statistics['downloaded']} files ({statistics['bytes'] / 1024 / 1024:.1f} MB), skipped {statistics['skipped']} unchanged, "
+          f"{len(statistics['errors'])} failed in {statistics['time']:.1f} s: {statistics['bytes'] / 1024 / 1024 / elapsed_time:.1f} MB/s.")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define SharePoint directory and local root
+    root_path = "/sites/<enterprise_site>/<parent_directory>/<...>"
+    local_path = os.getcwd() + "/Mirror"
+
+    # Download tree and display summary
+    display_mirror_summary(mirror_tree(root_path, local_path))
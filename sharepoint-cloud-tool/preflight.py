@@ -0,0 +1,200 @@
+# Import necessary libraries
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+# Import necessary modules only for type hints, they are loaded on first connection
+if TYPE_CHECKING:
+    from office365.sharepoint.client_context import ClientContext
+
+# Import internal utilities
+from client_pool import get_client
+from sharepoint_tools import batch_size, execute_batch
+from throttling import execute_query
+
+# Define retry and rate limit policy of the requests
+throttling_policy = "preflight"
+
+# Define number of batches sent at the same time
+preflight_workers = 4
+
+# Define properties retrieved for every checked folder, storage metrics count files of all subfolders
+check_properties = ["Exists", "ItemCount", "StorageMetrics/TotalFileCount", "StorageMetrics/TotalSize"]
+
+
+# Define function that describe a checked folder
+def describe_check(folder_path: str, folder=None, error: Exception = None) -> dict:
+    """
+    Build the preflight result of a folder from its loaded properties or from the error raised while loading it
+    :param folder_path: path of the directory in string format
+    :param folder: loaded SharePoint folder
+    :param error: exception raised while loading the folder
+    :return: check_result: dictionary with path, status, estimated items, size and error message
+    """
+    # Report folders that can't be read
+    if error is not None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+        status = "missing" if status_code == 404 else "inaccessible"
+        return {"path": folder_path, "status": status, "items": 0, "size": 0, "error": f"HTTP {status_code}" if status_code else str(error)}
+
+    # Report folders that don't exist
+    if not folder.properties.get("Exists", False):
+        return {"path": folder_path, "status": "missing", "items": 0, "size": 0, "error": None}
+
+    # Estimate items from storage metrics, or from direct children when metrics are not available
+    storage_metrics = folder.storage_metrics.properties
+    estimated_items = storage_metrics.get("TotalFileCount", folder.properties.get("ItemCount", 0))
+    return {"path": folder_path, "status": "ok", "items": int(estimated_items), "size": int(storage_metrics.get("TotalSize", 0)), "error": None}
+
+
+# Define function that check one folder
+def check_path(folder_path: str) -> dict:
+    """
+    Check that the folder exists and can be read, with a single query
+    :param folder_path: path of the directory in string format
+    :return: check_result: dictionary with path, status, estimated items, size and error message
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Load folder properties and describe the result
+    context = get_client(throttling_policy)
+    folder = context.web.get_folder_by_server_relative_path(folder_path).expand(["StorageMetrics"])
+    context.load(folder, check_properties)
+    try:
+        execute_query(context, throttling_policy)
+    except ClientRequestException as error:
+        return describe_check(folder_path, error=error)
+    return describe_check(folder_path, folder)
+
+
+# Define function that check several folders with one request
+def check_paths_batch(folders_path: list) -> list:
+    """
+    Check provided folders with one batch request, splitting the batch in halves if it fails
+    :param folders_path: list with directories path
+    :return: check_results: list with the result of every folder
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Define function that queue the load of every folder
+    def queue_checks(batch_context: "ClientContext") -> list:
+        folders = []
+        for folder_path in folders_path:
+            folder = batch_context.web.get_folder_by_server_relative_path(folder_path).expand(["StorageMetrics"])
+            batch_context.load(folder, check_properties)
+            folders.append(folder)
+        return folders
+
+    # A single failed folder fails the whole batch, so find it by checking each half of the batch again,
+    # only the failed folders cost extra requests and the error of a folder checked alone is its result
+    try:
+        folders = execute_batch(queue_checks, throttling_policy)
+    except ClientRequestException as error:
+        if len(folders_path) == 1:
+            return [describe_check(folders_path[0], error=error)]
+        middle = len(folders_path) // 2
+        return check_paths_batch(folders_path[:middle]) + check_paths_batch(folders_path[middle:])
+
+    # Return result of every folder
+    return [describe_check(folder_path, folder) for folder_path, folder in zip(folders_path, folders)]
+
+
+# Define function that check all folders
+def check_paths(folders_path: list, max_workers: int = preflight_workers) -> list:
+    """
+    Check that all provided folders exist and can be read, with batch requests sent in parallel
+    :param folders_path: list with directories path, duplicates are checked once
+    :param max_workers: maximum number of batches sent at the same time in integer format
+    :return: check_results: list with the result of every distinct folder in the order provided
+    """
+    # Split distinct paths in batches
+    distinct_paths = list(dict.fromkeys(folders_path))
+    batches = [distinct_paths[index:index + batch_size] for index in range(0, len(distinct_paths), batch_size)]
+
+    # Check batches in parallel and keep the results in the order of the paths
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [check_result for batch_results in executor.map(check_paths_batch, batches) for check_result in batch_results]
+
+
+# Define function that list the folders used by a mapped copy
+def generate_mapping_paths(path: str, content: list, destination: str, mapping: dict) -> tuple:
+    """
+    Return the source and destination folders that a copy according with the mapping structure reads and writes
+    :param path: path of the current directory in string format
+    :param content: list of subdirectories name from the current directory in string format
+    :param destination: path of the destination directory in string format
+    :param mapping: dictionary with source subdirectory name and destination subdirectory name
+    :return: sources_path, destinations_path: lists with source and destination directories path
+    """
+    # Check both roots and every mapped source with its target
+    sources_path = [path]
+    destinations_path = [destination]
+    for folder_name in content:
+        if folder_name in mapping:
+            sources_path.append(path + "/" + folder_name)
+            destinations_path.append(destination + "/" + mapping[folder_name])
+
+    # Return paths to be checked
+    return sources_path, destinations_path
+
+
+# Define function that display the preflight report
+def display_preflight_report(check_results: list, sources_path: list) -> bool:
+    """
+    Display the folders that are missing or can't be read and the estimated size of the sources
+    :param check_results: list with the result of every folder
+    :param sources_path: list with source directories path, only they are counted in the estimate
+    :return: is_ready: True if all folders exist and can be read
+    """
+    # Display every problem
+    failed_results = [check_result for check_result in check_results if check_result["status"] != "ok"]
+    for check_result in failed_results:
+        print(f"{check_result['status'].capitalize()}: '{check_result['path']}'" + (f" ({check_result['error']})" if check_result["error"] else ""))
+
+    # Count only sources that are not inside another source, their metrics already include subfolders
+    top_sources = {source_path for source_path in sources_path
+                   if not any(source_path.startswith(other_path + "/") for other_path in sources_path)}
+    source_results = [check_result for check_result in check_results if check_result["path"] in top_sources]
+    estimated_items = sum(check_result["items"] for check_result in source_results)
+    estimated_size = sum(check_result["size"] for check_result in source_results)
+    print(f"Checked {len(check_results)} folders, {len(failed_results)} with problems, "
+          f"about {estimated_items} files and {estimated_size / 1024 / 1024:.1f} MB to copy.")
+
+    # Return True if nothing is missing
+    return not failed_results
+
+
+# Define function that ask to continue after a failed preflight
+def confirm_preflight(sources_path: list, destinations_path: list) -> bool:
+    """
+    Check provided folders, display the report and ask the user to continue if some of them have problems
+    :param sources_path: list with source directories path
+    :param destinations_path: list with destination directories path
+    :return: is_confirmed: True if the copy can start
+    """
+    # Check folders and continue without asking if all of them are ready
+    if display_preflight_report(check_paths(sources_path + destinations_path), sources_path):
+        return True
+
+    # Ask user to continue anyway
+    return input("Continue anyway? (y/n): ").strip().lower() == "y"
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define source, destination and mapping structure to be checked
+    source_path = "/sites/<enterprise_site>/<source_directory>"
+    destination_path = "/sites/<enterprise_site>/<destination_directory>"
+    mapping_structure = {"Source_Folder_A": "Destination_Folder_A",
+                         "Source_Folder_B": "Destination_Folder_B",
+                         }
+
+    # Check all folders and display statistics
+    start_time = time.perf_counter()
+    sources_path, destinations_path = generate_mapping_paths(source_path, list(mapping_structure), destination_path, mapping_structure)
+    check_results = check_paths(sources_path + destinations_path)
+    display_preflight_report(check_results, sources_path)
+    print(f"Preflight time: {time.perf_counter() - start_time:.1f} s.")
@@ -1,140 +1,316 @@
-# Import necessary modules
-from office365.sharepoint.client_context import ClientContext
-from openpyxl import Workbook, load_workbook
-
-# Import internal utilities
-from credentials import username, password, site_url
-
-# Create connection to the SharePoint
-context = ClientContext(site_url).with_user_credentials(username, password)
-
-# Define function that take all folders path
-def get_folders_path(folder_path: str) -> list:
-    """
-    Return a list with the path of directories from provided URL
-    :param folder_path: path of the directory in string format
-    :return: folders_path: list with subdirectories path
-    """
-    # Get relative URL from SharePoint for given folder and load it
-    library_root = context.web.get_folder_by_server_relative_path(folder_path)
-    context.load(library_root)
-    context.execute_query()
-
-    # Retrieve all subfolders from provided folder
-    folders = library_root.folders
-    context.load(folders)
-    context.execute_query()
-
-    # Iterate through all subfolder and save the path
-    folders_path = []
-    for folder in folders:
-        context.load(folder)
-        context.execute_query()
-        folders_path.append(folder.properties["ServerRelativeUrl"])
-
-    # Return a list of subfolders path
-    return folders_path
-
-
-# Define function that take all subfolders path
-def get_subfolders_path(folder_path: str, target_folder: str) -> list:
-    """
-    Return a list with the path of subdirectories from provided URL
-    :param folder_path: path of the directory in string format
-    :param target_folder: name of the directory in string format
-    :return: folders_path: list with subdirectories path
-    """
-    # Get relative URL from SharePoint for given folder and load it
-    library_root = context.web.get_folder_by_server_relative_path(folder_path)
-    context.load(library_root)
-    context.execute_query()
-
-    # Retrieve all subfolders from provided folder
-    folders = library_root.folders
-    context.load(folders)
-    context.execute_query()
-
-    # Iterate through all subfolder and save the path
-    folders_path = []
-    for folder in folders:
-        context.load(folder)
-        context.execute_query()
-
-        # If subfolder match the name then append it to the list
-        if folder.properties["Name"] == target_folder:
-            folders_path.append(folder.properties["ServerRelativeUrl"])
-
-    # Return a list of subfolders path
-    return folders_path
-
-
-# Define function that rename subfolder
-def rename_folder(folder_path: str, new_folder_name: str) -> None:
-    """
-    Rename the directory from provided URL with specified name
-    :param folder_path: path of the directory in string format
-    :param new_folder_name: new name of the directory in string format
-    :return: None
-    """
-    # Get relative URL from SharePoint for given folder and load it
-    library_root = context.web.get_folder_by_server_relative_path(folder_path)
-    context.load(library_root)
-    context.execute_query()
-
-    # Retrieve all subfolders from provided folder
-    folders = library_root.folders
-    context.load(folders)
-    context.execute_query()
-
-    # Iterate through all subfolder and save the path
-    folders_path = []
-    for folder in folders:
-        context.load(folder)
-        context.execute_query()
-        context.web.get_folder_by_server_relative_path(folder.properties["ServerRelativeUrl"]).rename(new_folder_name).execute_query()
-
-
-# Define function that create subfolder
-def create_folder(folder_path: str, folder_name: str) -> None:
-    """
-    Create a subdirectory with specific name in the directories from provided URL
-    :param folder_path: path of the directory in string format
-    :param folder_name: name of the subdirectory in string format
-    :return: None
-    """
-    # Take the parent folder and create subfolder with specific name
-    parent_folder = context.web.get_folder_by_server_relative_url(folder_path)
-    parent_folder.folders.add(folder_name)
-    context.execute_query()
-
-
-if __name__ == "__main__":
-
-    # Define variables
-    root_location = "SharePoint/Site/"
-    folders_name = ["Folder_1", "Folder_2", "Folder_3"]
-    target_folder_name = "Folder_01"
-
-    # Get all subdirectories
-    stores_path = get_folders_path(root_location)
-    print("Retrieve all store paths.")
-    print(stores_path)
-    
-    # Get specific subdirectories path from each store
-    target_folder_paths = []
-    for store_path in stores_path:
-        target_folder_path = get_subfolders_path(store_path, target_folder_name)
-        target_folder_paths.append(target_folder_path)
-        print("Retrieve all specific folder paths.")
-        print(target_folder_path)
-    
-    # Rename specific folder
-    for folder_path in target_folder_paths:
-        rename_folder(folder_path, target_folder_name)
-        print("Rename folder.")
-    
-    # Create new folders
-    for store_path in stores_path:
-        for folder_name in folders_name:
-            create_folder(store_path, folder_name)
-            print("Create folder.")
\ No newline at end of file
+# Import necessary libraries
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+# Import necessary modules only for type hints, they are loaded on first connection
+if TYPE_CHECKING:
+    from office365.sharepoint.client_context import ClientContext
+
+# Import internal utilities
+from client_pool import get_client
+from request_metrics import start_configured_metrics
+from sharepoint_tools import batch_size, execute_batch, folder_properties
+from throttling import execute_query
+from trace_profiler import start_profiling_from_arguments, traced
+
+# Define retry and rate limit policy of the requests
+throttling_policy = "rename_folders"
+
+# Define number of batches sent at the same time
+restructure_workers = 4
+
+# Define function that take all folders path
+@traced("listing")
+def get_folders_path(folder_path: str) -> list:
+    """
+    Return a list with the path of directories from provided URL
+    :param folder_path: path of the directory in string format
+    :return: folders_path: list with subdirectories path
+    """
+    # Retrieve all subfolders from provided folder with their properties in a single query
+    context = get_client(throttling_policy)
+    folders = context.web.get_folder_by_server_relative_path(folder_path).folders
+    context.load(folders, folder_properties)
+    execute_query(context, throttling_policy)
+
+    # Iterate through all subfolder and save the path
+    folders_path = []
+    for folder in folders:
+        folders_path.append(folder.properties["ServerRelativeUrl"])
+
+    # Return a list of subfolders path
+    return folders_path
+
+
+# Define function that take all subfolders path
+@traced("listing")
+def get_subfolders_path(folder_path: str, target_folder: str) -> list:
+    """
+    Return a list with the path of subdirectories from provided URL
+    :param folder_path: path of the directory in string format
+    :param target_folder: name of the directory in string format
+    :return: folders_path: list with subdirectories path
+    """
+    # Retrieve all subfolders from provided folder with their properties in a single query
+    context = get_client(throttling_policy)
+    folders = context.web.get_folder_by_server_relative_path(folder_path).folders
+    context.load(folders, folder_properties)
+    execute_query(context, throttling_policy)
+
+    # Iterate through all subfolder and save the path
+    folders_path = []
+    for folder in folders:
+        # If subfolder match the name then append it to the list
+        if folder.properties["Name"] == target_folder:
+            folders_path.append(folder.properties["ServerRelativeUrl"])
+
+    # Return a list of subfolders path
+    return folders_path
+
+
+# Define function that rename subfolder
+@traced("rename")
+def rename_folder(folder_path: str, new_folder_name: str) -> None:
+    """
+    Rename the directory from provided URL with specified name
+    :param folder_path: path of the directory in string format
+    :param new_folder_name: new name of the directory in string format
+    :return: None
+    """
+    # Rename the folder with a single query
+    context = get_client(throttling_policy)
+    context.web.get_folder_by_server_relative_path(folder_path).rename(new_folder_name)
+    execute_query(context, throttling_policy)
+
+
+# Define function that create subfolder
+@traced("rename")
+def create_folder(folder_path: str, folder_name: str) -> None:
+    """
+    Create a subdirectory with specific name in the directories from provided URL
+    :param folder_path: path of the directory in string format
+    :param folder_name: name of the subdirectory in string format
+    :return: None
+    """
+    # Take the parent folder and create subfolder with specific name
+    context = get_client(throttling_policy)
+    parent_folder = context.web.get_folder_by_server_relative_url(folder_path)
+    parent_folder.folders.add(folder_name)
+    execute_query(context, throttling_policy)
+
+
+# Define function that split a list in batches
+def split_batches(items: list) -> list:
+    """
+    Split provided list in parts that fit in one batch request
+    :param items: list of elements in any format
+    :return: batches: list with parts of the list
+    """
+    # Return parts with at most batch_size elements
+    return [items[index:index + batch_size] for index in range(0, len(items), batch_size)]
+
+
+# Define function that retrieve subfolder names of several stores with one request
+@traced("listing")
+def list_subfolders_batch(stores_path: list) -> tuple:
+    """
+    Return the names of subdirectories of every provided store using one batch request,
+    listing them one by one if the batch fails
+    :param stores_path: list with stores path
+    :return: stores_subfolders, failures: dictionary with store path as key and list with subdirectories name as value,
+    and list with stores that can't be listed
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Define function that queue the listing of every store
+    def queue_listings(batch_context: "ClientContext") -> list:
+        stores_folders = []
+        for store_path in stores_path:
+            folders = batch_context.web.get_folder_by_server_relative_path(store_path).folders
+            batch_context.load(folders, ["Name"])
+            stores_folders.append(folders)
+        return stores_folders
+
+    # A single missing or inaccessible store fails the whole batch, so find it by listing the stores one by one
+    try:
+        stores_folders = execute_batch(queue_listings, throttling_policy)
+    except ClientRequestException:
+        stores_subfolders = {}
+        failures = []
+        for store_path in stores_path:
+            try:
+                stores_subfolders[store_path] = [folder_path.rpartition("/")[2] for folder_path in get_folders_path(store_path)]
+            except ClientRequestException as error:
+                failures.append({"type": "list", "path": store_path, "name": "", "error": str(error)})
+        return stores_subfolders, failures
+
+    # Keep only the names
+    return {store_path: [folder.properties["Name"] for folder in folders]
+            for store_path, folders in zip(stores_path, stores_folders)}, []
+
+
+# Define function that apply a single change
+def apply_change(change: dict) -> dict:
+    """
+    Rename or create the folder described by provided change with its own request
+    :param change: dictionary with type, path and name of the change
+    :return: failure: the change with the error message if it failed, None otherwise
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Apply the change and keep the error if it fails, creating an existing folder doesn't fail
+    try:
+        if change["type"] == "rename":
+            rename_folder(change["path"], change["name"])
+        else:
+            create_folder(change["path"], change["name"])
+    except ClientRequestException as error:
+        failure = dict(change, error=str(error))
+    else:
+        return None
+
+    # A rename can fail because the failed batch already applied it, so check if the new name exists
+    if change["type"] == "rename":
+        context = get_client(throttling_policy)
+        renamed_folder = context.web.get_folder_by_server_relative_path(change["path"].rpartition("/")[0] + "/" + change["name"])
+        context.load(renamed_folder, ["Exists"])
+        try:
+            execute_query(context, throttling_policy)
+            if renamed_folder.properties.get("Exists", False):
+                return None
+        except ClientRequestException:
+            pass
+
+    # Return the failed change
+    return failure
+
+
+# Define function that apply several changes with one request
+@traced("rename")
+def apply_changes_batch(changes: list) -> tuple:
+    """
+    Rename or create the folders described by provided changes using one batch request,
+    applying them one by one if the batch fails
+    :param changes: list with dictionaries with type, path and name of each change
+    :return: changes_number, failures: number of applied changes in integer format and list with failed changes
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Define function that queue every change
+    def queue_changes(batch_context: "ClientContext") -> None:
+        for change in changes:
+            if change["type"] == "rename":
+                batch_context.web.get_folder_by_server_relative_path(change["path"]).rename(change["name"])
+            else:
+                batch_context.web.get_folder_by_server_relative_url(change["path"]).folders.add(change["name"])
+
+    # A single failed change fails the whole batch, so find it by applying the changes one by one
+    try:
+        execute_batch(queue_changes, throttling_policy)
+    except ClientRequestException:
+        failures = [failure for failure in map(apply_change, changes) if failure]
+        return len(changes) - len(failures), failures
+
+    # Return number of applied changes and no failure
+    return len(changes), []
+
+
+# Define function that plan the changes of every store
+def plan_restructure(stores_subfolders: dict, restructure_spec: dict) -> tuple:
+    """
+    Compare subfolders of every store with the spec and keep only the renames and creations still needed
+    :param stores_subfolders: dictionary with store path as key and list with subdirectories name as value
+    :param restructure_spec: dictionary with "rename" mapping of old to new names and "create" list of names
+    :return: renames, creations: lists with dictionaries with type, path and name of each change
+    """
+    # Rename existing folders unless the new name is already taken
+    renames = []
+    creations = []
+    for store_path, subfolders_name in stores_subfolders.items():
+        final_names = set(subfolders_name)
+        for old_name, new_name in restructure_spec.get("rename", {}).items():
+            if old_name in final_names and new_name not in final_names:
+                renames.append({"type": "rename", "path": store_path + "/" + old_name, "name": new_name})
+                final_names.discard(old_name)
+                final_names.add(new_name)
+
+        # Create folders that don't exist after renaming
+        for folder_name in restructure_spec.get("create", []):
+            if folder_name not in final_names:
+                creations.append({"type": "create", "path": store_path, "name": folder_name})
+                final_names.add(folder_name)
+
+    # Return changes to be applied
+    return renames, creations
+
+
+# Define function that restructure several stores
+@traced("rename")
+def restructure_stores(stores_path: list, restructure_spec: dict, max_workers: int = restructure_workers) -> dict:
+    """
+    Rename and create subfolders of all provided stores with batch requests sent in parallel
+    :param stores_path: list with stores path
+    :param restructure_spec: dictionary with "rename" mapping of old to new names and "create" list of names
+    :param max_workers: maximum number of batches sent at the same time in integer format
+    :return: phases_result: dictionary with phase name as key and dictionary with elapsed seconds and failed changes as value
+    """
+    phases_result = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # List subfolders of all stores
+        start_time = time.perf_counter()
+        stores_subfolders = {}
+        failures = []
+        for batch_subfolders, batch_failures in executor.map(list_subfolders_batch, split_batches(stores_path)):
+            stores_subfolders.update(batch_subfolders)
+            failures += batch_failures
+        phases_result["list"] = {"time": time.perf_counter() - start_time, "failures": failures}
+
+        # Plan the changes still needed
+        start_time = time.perf_counter()
+        renames, creations = plan_restructure(stores_subfolders, restructure_spec)
+        phases_result["plan"] = {"time": time.perf_counter() - start_time, "failures": []}
+
+        # Rename folders before creating new ones, so new names don't collide, then create new folders
+        for phase, changes in [("rename", renames), ("create", creations)]:
+            start_time = time.perf_counter()
+            applied_number = 0
+            failures = []
+            for batch_applied, batch_failures in executor.map(apply_changes_batch, split_batches(changes)):
+                applied_number += batch_applied
+                failures += batch_failures
+            phases_result[phase] = {"time": time.perf_counter() - start_time, "failures": failures}
+            print(f"Phase {phase}: applied {applied_number} changes, {len(failures)} failed.")
+
+    # Return elapsed time and failed changes of every phase
+    return phases_result
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define variables
+    root_location = "SharePoint/Site/"
+    restructure_spec = {
+        "rename": {"Folder_01": "Folder_1"},
+        "create": ["Folder_2", "Folder_3"],
+    }
+
+    # Measure requests if an export file is configured, and record a trace if called with --profile
+    start_configured_metrics()
+    start_profiling_from_arguments("rename_folders")
+
+    # Get all subdirectories
+    start_time = time.perf_counter()
+    stores_path = get_folders_path(root_location)
+    print(f"Retrieve {len(stores_path)} store paths in {time.perf_counter() - start_time:.1f} s.")
+
+    # Rename and create folders in every store
+    phases_result = restructure_stores(stores_path, restructure_spec)
+    for phase, phase_result in phases_result.items():
+        print(f"Phase {phase}: {phase_result['time']:.1f} s.")
+        for failure in phase_result["failures"]:
+            print(f"Failed to {failure['type']} {(failure['path'] + '/' + failure['name']).rstrip('/')}: {failure['error']}")
@@ -0,0 +1,297 @@
+# Import necessary libraries
+import atexit
+import bisect
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+# Define upper bounds in seconds of the latency histogram buckets
+latency_buckets = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+# Define export file, its format is taken from the extension (.json or Prometheus text), and seconds between exports
+metrics_path = None
+metrics_interval = 60.0
+
+# Define number of slowest requests kept with their path
+slowest_requests_number = 20
+
+# Define state of the metrics, requests are not measured until metrics are enabled
+metrics_state = {"enabled": False, "started_at": None, "stop": None}
+metrics_lock = threading.Lock()
+
+# Define aggregated measures: histograms by operation and method, counters by status, bytes and retries
+latency_histograms = {}
+request_counters = {}
+byte_counters = {}
+retry_counters = {}
+slowest_requests = []
+
+# Define retry attempt of the request sent from the current thread
+retry_state = threading.local()
+
+
+# Define function that name the operation of a request
+def describe_url(url: str) -> tuple:
+    """
+    Return the operation of a REST request without its parameters, so it can be used as a label, and the path it addresses
+    :param url: URL of the request in string format
+    :return: operation, path: operation name and server relative path in string format
+    """
+    # Remove parameters between parentheses, the first quoted parameter is the path of the item
+    api_path = unquote(urlsplit(url).path).split("/_api/", 1)[-1]
+    operation = re.sub(r"\([^)]*\)", "", api_path)
+    item_path = re.search(r"\('([^']*)'\)", api_path)
+
+    # Return operation and path
+    return operation, item_path.group(1) if item_path else ""
+
+
+# Define function that measure the size of a request body
+def get_body_size(body) -> int:
+    """
+    Return the number of bytes of a request body, streamed bodies are measured without being read
+    :param body: body of the request as bytes, string, file or None
+    :return: body_size: number of bytes in integer format
+    """
+    # Strings and bytes know their length, memory maps too, files are measured from their position to the end
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    try:
+        return len(body)
+    except TypeError:
+        pass
+    try:
+        return os.fstat(body.fileno()).st_size - body.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+# Define function that set the retry attempt of the current thread
+def set_retry_attempt(attempt: int) -> None:
+    """
+    Mark the requests sent from the current thread as the given retry attempt
+    :param attempt: number of the attempt starting from zero in integer format
+    :return: None
+    """
+    # Keep attempt for the next requests of the thread
+    retry_state.attempt = attempt
+
+
+# Define function that record a request
+def record_request(method: str, url: str, status, sent_bytes: int, received_bytes: int, latency: float,
+                   attempt: int = None) -> None:
+    """
+    Add a finished request to the latency histogram and the counters of its operation
+    :param method: HTTP method in string format
+    :param url: URL of the request in string format
+    :param status: HTTP status code in integer format, or "error" when no response was received
+    :param sent_bytes: number of bytes of the request body in integer format
+    :param received_bytes: number of bytes of the response body in integer format
+    :param latency: seconds until the response headers were received in float format
+    :param attempt: number of the attempt starting from zero in integer format, the one of the current thread if not provided
+    :return: None
+    """
+    # Describe request outside of the lock
+    operation, item_path = describe_url(url)
+    if attempt is None:
+        attempt = getattr(retry_state, "attempt", 0)
+    bucket_index = bisect.bisect_left(latency_buckets, latency)
+
+    with metrics_lock:
+        # Add latency to the histogram of the operation
+        histogram = latency_histograms.setdefault((operation, method), {"buckets": [0] * (len(latency_buckets) + 1), "sum": 0.0, "count": 0})
+        histogram["buckets"][bucket_index] += 1
+        histogram["sum"] += latency
+        histogram["count"] += 1
+
+        # Count request by status and its bytes
+        counter_key = (operation, method, str(status))
+        request_counters[counter_key] = request_counters.get(counter_key, 0) + 1
+        byte_counters[(operation, "sent")] = byte_counters.get((operation, "sent"), 0) + sent_bytes
+        byte_counters[(operation, "received")] = byte_counters.get((operation, "received"), 0) + received_bytes
+
+        # Keep the slowest requests with their path
+        request_details = {"operation": operation, "method": method, "path": item_path, "status": status, "sent_bytes": sent_bytes,
+                           "received_bytes": received_bytes, "latency": latency, "retry": attempt}
+        if len(slowest_requests) < slowest_requests_number:
+            heapq.heappush(slowest_requests, (latency, id(request_details), request_details))
+        elif latency > slowest_requests[0][0]:
+            heapq.heapreplace(slowest_requests, (latency, id(request_details), request_details))
+
+
+# Define function that record a retry
+def record_retry(policy_name: str, status: int) -> None:
+    """
+    Count a retry of a throttled request
+    :param policy_name: name of the retry policy in string format
+    :param status: HTTP status code of the throttled response in integer format
+    :return: None
+    """
+    # Skip counting if metrics are disabled
+    if not metrics_state["enabled"]:
+        return
+    with metrics_lock:
+        retry_counters[(policy_name, str(status))] = retry_counters.get((policy_name, str(status)), 0) + 1
+
+
+# Define function that return all measures
+def get_metrics() -> dict:
+    """
+    Return a copy of all measures in a format that can be written as JSON
+    :param None
+    :return: metrics: dictionary with histograms, counters, retries and slowest requests
+    """
+    # Copy measures while they can't change
+    with metrics_lock:
+        return {
+            "started_at": metrics_state["started_at"],
+            "exported_at": time.time(),
+            "latency_buckets": latency_buckets,
+            "latency": [{"operation": operation, "method": method, "buckets": list(histogram["buckets"]), "sum": histogram["sum"],
+                         "count": histogram["count"]} for (operation, method), histogram in sorted(latency_histograms.items())],
+            "requests": [{"operation": operation, "method": method, "status": status, "count": count}
+                         for (operation, method, status), count in sorted(request_counters.items())],
+            "bytes": [{"operation": operation, "direction": direction, "count": count}
+                      for (operation, direction), count in sorted(byte_counters.items())],
+            "retries": [{"policy": policy_name, "status": status, "count": count}
+                        for (policy_name, status), count in sorted(retry_counters.items())],
+            "slowest_requests": [request_details for _, _, request_details in sorted(slowest_requests, reverse=True)],
+        }
+
+
+# Define function that format a Prometheus label value
+def format_labels(labels: dict) -> str:
+    """
+    Format labels of a Prometheus sample, escaping their values
+    :param labels: dictionary with label names and values
+    :return: labels_text: labels between braces in string format
+    """
+    # Escape backslashes, quotes and new lines
+    values = []
+    for name, value in labels.items():
+        escaped_value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        values.append(f'{name}="{escaped_value}"')
+    return "{" + ",".join(values) + "}"
+
+
+# Define function that write measures in Prometheus text format
+def format_prometheus(metrics: dict) -> str:
+    """
+    Convert measures into the Prometheus text exposition format
+    :param metrics: dictionary with histograms, counters, retries and slowest requests
+    :return: text: measures in Prometheus format
+    """
+    # Write latency histograms with cumulative buckets
+    lines = ["# HELP sharepoint_request_duration_seconds Time until the SharePoint response headers are received.",
+             "# TYPE sharepoint_request_duration_seconds histogram"]
+    for histogram in metrics["latency"]:
+        labels = {"operation": histogram["operation"], "method": histogram["method"]}
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(metrics["latency_buckets"] + ["+Inf"], histogram["buckets"]):
+            cumulative_count += bucket_count
+            lines.append(f"sharepoint_request_duration_seconds_bucket{format_labels(dict(labels, le=upper_bound))} {cumulative_count}")
+        lines.append(f"sharepoint_request_duration_seconds_sum{format_labels(labels)} {histogram['sum']}")
+        lines.append(f"sharepoint_request_duration_seconds_count{format_labels(labels)} {histogram['count']}")
+
+    # Write counters of requests, bytes and retries
+    for metric_name, help_text, samples in [
+        ("sharepoint_requests_total", "Requests sent to the SharePoint by status.", metrics["requests"]),
+        ("sharepoint_request_bytes_total", "Bytes of request and response bodies.", metrics["bytes"]),
+        ("sharepoint_retries_total", "Retries of throttled requests by policy.", metrics["retries"]),
+    ]:
+        lines += [f"# HELP {metric_name} {help_text}", f"# TYPE {metric_name} counter"]
+        for sample in samples:
+            labels = {name: value for name, value in sample.items() if name != "count"}
+            lines.append(f"{metric_name}{format_labels(labels)} {sample['count']}")
+
+    # Return text ending with a new line
+    return "\n".join(lines) + "\n"
+
+
+# Define function that export measures to a file
+def export_metrics(export_path: str = None) -> None:
+    """
+    Write all measures to the export file, as JSON if its extension is .json and in Prometheus text format otherwise;
+    the file is replaced at once so a reader never sees a partial export
+    :param export_path: path of the export file in string format, the configured one if not provided
+    :return: None
+    """
+    # Skip export if there is no file
+    export_path = export_path or metrics_path
+    if not export_path:
+        return
+
+    # Write into a temporary file next to the export and replace it
+    metrics = get_metrics()
+    if export_path.lower().endswith(".json"):
+        text = json.dumps(metrics, indent=2)
+    else:
+        text = format_prometheus(metrics)
+    temporary_path = f"{export_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as export_file:
+        export_file.write(text)
+    os.replace(temporary_path, export_path)
+
+
+# Define function that start the measure of requests
+def enable_metrics(export_path: str = None, interval: float = None) -> None:
+    """
+    Measure every request sent to the SharePoint and, if an export file is provided, write the measures to it
+    at intervals and when the program exits
+    :param export_path: path of the export file in string format, the configured one if not provided
+    :param interval: seconds between two exports in float format, the configured one if not provided
+    :return: None
+    """
+    # Change global variable
+    global metrics_path
+
+    # Enable measures once
+    with metrics_lock:
+        if metrics_state["enabled"]:
+            return
+        metrics_state.update(enabled=True, started_at=time.time(), stop=threading.Event())
+    metrics_path = export_path or metrics_path
+    if not metrics_path:
+        return
+
+    # Export at intervals from a background thread and once more at exit
+    def export_periodically(stop: threading.Event) -> None:
+        while not stop.wait(interval or metrics_interval):
+            export_metrics()
+
+    threading.Thread(target=export_periodically, args=(metrics_state["stop"],), daemon=True).start()
+    atexit.register(disable_metrics)
+
+
+# Define function that stop the measure of requests
+def disable_metrics() -> None:
+    """
+    Stop measuring requests and write the last export
+    :param None
+    :return: None
+    """
+    # Stop periodic export and write final measures
+    with metrics_lock:
+        if not metrics_state["enabled"]:
+            return
+        metrics_state["enabled"] = False
+        metrics_state["stop"].set()
+    export_metrics()
+
+
+# Define function that enable metrics configured for a script
+def start_configured_metrics() -> None:
+    """
+    Enable metrics when an export file is configured
+    :param None
+    :return: None
+    """
+    # Keep requests unmeasured when there is no export file
+    if metrics_path:
+        enable_metrics()
@@ -1,302 +1,805 @@
-# Import necessary libraries
-import os
-
-# Import necessary modules
-from office365.sharepoint.client_context import ClientContext
-from openpyxl import Workbook, load_workbook
-
-# Import internal utilities
-from credentials import username, password, site_url
-
-# Create connection to the SharePoint
-context = ClientContext(site_url).with_user_credentials(username, password)
-
-
-# Define function that retrieve all subfolders
-def get_folder_data(folder_path: str) -> list:
-    """
-    Return a list with the names of subdirectories from provided URL
-    :param folder_path: path of the directory in string format
-    :return: folders_name: list with subdirectories name
-    """
-    # Get relative URL from SharePoint for given folder and load it
-    library_root = context.web.get_folder_by_server_relative_path(folder_path)
-    context.load(library_root)
-    context.execute_query()
-
-    # Retrieve all subfolders from provided folder
-    folders = library_root.folders
-    context.load(folders)
-    context.execute_query()
-
-    # Display the number of subfolders
-    print("Number of folders:", len(folders))
-
-    # Iterate through all subfolder, display and save the name
-    folders_name = []
-    for folder in folders:
-        context.load(folder)
-        context.execute_query()
-        # print(folder.properties["ServerRelativeUrl"].split("/")[-1])
-        folders_name.append(folder.properties["ServerRelativeUrl"].split("/")[-1])
-    
-    # Return a list of subfolders name
-    return folders_name
-
-
-# Define function that retrieve all files
-def get_folder_files(folder_path: str) -> list:
-    """
-    Return a list with the names of files from folder
-    :param folder_path: path of the directory in string format
-    :return: folders_name: list with files name
-    """
-    # Get relative URL from SharePoint for given folder and load it
-    library_root = context.web.get_folder_by_server_relative_path(folder_path)
-    context.load(library_root)
-    context.execute_query()
-    
-    # Retrieve all files from provided folder
-    files = library_root.files
-    context.load(files)
-    context.execute_query()
-
-    # Display the number of files
-    print("Number of files:", len(files))
-
-    # Iterate through all files, display and save the name
-    files_name = []
-    for file in files:
-        context.load(file)
-        context.execute_query()
-        # print(file.properties["Name"])
-        files_name.append(file.properties["Name"])
-    
-    # Return a list of files name
-    return files_name
-
-
-# Define function that download file from SharePoint
-def download_file(file_url: str) -> None:
-    """
-    Download a file to local disk from SharePoint
-    :param file_url: path of the SharePoint file in string format
-    :return: None
-    """
-    # Retrieve file name from URL and build local path
-    file_name = file_url.split("/")[-1]
-    download_folder = os.getcwd().split("\\")
-    download_file = "/".join(download_folder) + "/" + file_name
-
-    # Open file and save content
-    with open(download_file, "wb") as local_file:
-        context.web.get_file_by_server_relative_url(file_url).download(local_file).execute_query()
-    
-    # Display a message of completion
-    # print(f"File has been downloaded into: {download_file}")    
-
-
-# Define function that upload file to SharePoint
-def upload_file(file_name:str, folder_url: str) -> None:
-    """
-    Upload a file to SharePoint from local disk
-    :param file_name: name of the file in string format
-    :param folder_url: path of the SharePoint folder in string format
-    :return: None
-    """
-    # Take folder from SharePoint based on URL
-    folder = context.web.get_folder_by_server_relative_url(folder_url)
-
-    # Take local working folder and retrieve local file
-    download_folder = os.getcwd().split("\\")
-    local_file = "/".join(download_folder) + "/" + file_name
-
-    # Open file and save content
-    with open(local_file, 'rb') as f:
-        file = folder.files.upload(f).execute_query()
-
-    # Display a message of completion
-    # print(f"File has been uploaded into: {file.serverRelativeUrl}")
-
-
-# Define function that copy the whole folder
-def copy_folder(source_path: str, destination_path: str):
-    """
-    Copy the whole content of the directory from source directory to the target directory
-    :param source_path: path of the source directory in string format
-    :param destination_path: path of the destination directory in string format
-    :return: None
-    """
-    # From raw URL obtain path to source directory and directory name
-    raw_source_root = source_path.split("/")[:-1]
-    source_root = "/".join(raw_source_root)
-    source_folder = source_path.split("/")[-1]
-
-    # From raw URL obtain path to destination directory and directory name
-    raw_destination_root = destination_path.split("/")[:-1]
-    destination_root = "/".join(raw_destination_root)
-    destination_folder = destination_path.split("/")[-1]
-
-    # Link obtained paths to the SharePoint
-    folder_from = context.web.get_folder_by_server_relative_url(source_root).add(source_folder)
-    folder_to = context.web.get_folder_by_server_relative_url(destination_root).add(destination_folder)
-
-    # Copy directory
-    folder_from.copy_to_using_path(folder_to).execute_query()
-
-    # Display message of completion
-    print(f"Folder has been copied from '{folder_from.serverRelativeUrl}' into '{folder_to.serverRelativeUrl}'")
-
-
-# Define function that copy file
-def copy_file(file_name: str, source_path: str, destination_path: str) -> None:
-    """
-    Copy file from source directory to the target directory
-    :param temp_path: path of the local folder in string format
-    :param file_name: name of the file in string format
-    :param source_path: path of the SharePoint source file in string format
-    :param destination_path: path of the SharePoint destination directory in string format
-    :return: None
-    """
-    # Download the file to temporary location
-    download_file(source_path)
-
-    # Upload the file from temporary location
-    upload_file(file_name, destination_path)
-
-    # Delete file from local disk
-    try:
-        os.remove(file_name)
-    except OSError:
-        pass
-    
-    # Display message of completion
-    print(f"File has been copied from '{source_path}' into '{destination_path}'")
-
-
-# Define function for writing content in Excel file
-def write_to_excel(file_name: str, file_path: str, content: list, target_row: int, target_column: int) -> None:
-    """
-    Write to Excel file the name of subdirectories from specified directory
-    :param file_name: name of the Excel file in string format
-    :param file_path: path of the directory where Excel file will be stored in string format
-    :param content: list of subdirectories name in string format
-    :param target_row: desired row number from where start write data in integer format
-    :param target_column: desired column number from where start write data in integer format
-    :return: None
-    """
-    # Compile final file name and path
-    final_file_name = file_name + ".xlsx"
-    final_file_path = file_path + "/" + final_file_name
-
-    # Create new Excel file or append to exiting one
-    if os.path.isfile(final_file_path):
-        xlsx_sheet = load_workbook(final_file_name)
-    else:
-        xlsx_sheet = Workbook()
-    
-    # Open Excel file for writing
-    sheet = xlsx_sheet.active
-
-    # Take the last row where data was written
-    last_row = sheet.max_row
-    last_row += target_row
-
-    # Write data on specified column and starting from last empty row
-    for item in content:
-        sheet.cell(row=last_row, column=target_column, value=item)
-        last_row += 1
-    
-    # Write delimiter between each directory content
-    sheet.cell(row=last_row, column=target_column, value="*****")
-
-    # Save Excel file
-    xlsx_sheet.save(final_file_path)
-
-    # Display a message of completion
-    print(f"Excel file {final_file_name} was updated successfuly.")
-
-
-# Define function for reading content from Excel file
-def read_from_excel(file_path: str, target_row: int, target_column: int) -> list:
-    """
-    Read from Excel file the name of subdirectories from specified directory
-    :param file_path: path of the directory where Excel file is stored in string format
-    :param target_row: desired row number from where start read data in integer format
-    :param target_column: desired column number from where start read data in integer format
-    :return: content: list of subdirectories name in string format
-    """
-    # Open Excel file for reading
-    xlsx_sheet = load_workbook(file_path)
-    sheet = xlsx_sheet.active
-
-    # Take the last row where data was written
-    last_row = sheet.max_row + target_row
-
-    # Read content from one column and store it
-    excel_content = []
-    for index in range(last_row + 1):
-        cell_content = sheet.cell(row=last_row, column=target_column).value
-        excel_content.append(cell_content)
-    
-    # Return list of read values
-    return excel_content
-
-
-# Define function for writing item in Excel file
-def log_to_excel(file_name: str, file_path: str, item: str, target_row: int, target_column: int) -> None:
-    """
-    Write to Excel file the name of subdirectories from specified directory
-    :param file_name: name of the Excel file in string format
-    :param file_path: path of the directory where Excel file will be stored in string format
-    :param item: path of file or folder in string format
-    :param target_row: desired row number from where start write data in integer format
-    :param target_column: desired column number from where start write data in integer format
-    :return: None
-    """
-    # Compile final file name and path
-    final_file_name = file_name + ".xlsx"
-    final_file_path = file_path + "/" + final_file_name
-
-    # Create new Excel file or append to exiting one
-    if os.path.isfile(final_file_path):
-        xlsx_sheet = load_workbook(final_file_name)
-    else:
-        xlsx_sheet = Workbook()
-    
-    # Open Excel file for writing
-    sheet = xlsx_sheet.active
-
-    # Take the last row where data was written
-    last_row = sheet.max_row
-    last_row += target_row
-
-    # Write data on specified column and starting from last empty row
-    sheet.cell(row=last_row, column=target_column, value=item)
-    last_row += 1
-    
-    # Write delimiter between each directory content
-    sheet.cell(row=last_row, column=target_column, value="*****")
-
-    # Save Excel file
-    xlsx_sheet.save(final_file_path)
-
-    # Display a message of completion
-    print(f"Excel file {final_file_name} was updated successfuly.")
-
-
-# Run code as a script
-if __name__ == "__main__":
-
-    # Define work scenario variables
-    root_location = "/sites/<enterprise_site>/<enterprise_directory>"
-    lvl_1_folder = ["/Folder_1", "/Folder_2", "/Folder_3", "/Folder_4", "/Folder_5"]
-    lvl_1_1_folder = ["/Subfolder_1", "/Subfolder_1", "/Subfolder_1"]
-
-    # Provide root work path
-    for index in range(len(lvl_1_1_folder)):
-        folder_path = root_location + lvl_1_folder[0] + lvl_1_1_folder[index]
-
-        # Get subfolders name from folder
-        folders_name = get_folder_data(folder_path)
-        write_to_excel("/Folders_Path", os.getcwd(), folders_name, 1, 1)
+# Import necessary libraries
+import hashlib
+import io
+import json
+import os
+import queue
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import quote
+
+# Import necessary modules only for type hints, they are loaded by the functions that need them
+if TYPE_CHECKING:
+    from office365.sharepoint.client_context import ClientContext
+
+# Import internal utilities
+from client_pool import count_request, get_batch_client, get_client
+from throttling import call_with_retry, execute_query, wait_for_token
+from trace_profiler import traced
+
+# Define retry and rate limit policy of the requests
+throttling_policy = "sharepoint_tools"
+
+# Define properties retrieved for every subfolder and file in a single query
+folder_properties = ["Name", "ServerRelativeUrl", "ItemCount", "TimeLastModified", "UniqueId"]
+file_properties = ["Name", "ServerRelativeUrl", "Length", "TimeLastModified", "ETag"]
+
+# Define size of the upload chunks and size above which files are uploaded in chunks
+upload_chunk_size = 8 * 1024 * 1024
+upload_session_size = 8 * 1024 * 1024
+
+# Define location of the checkpoints that allow to resume interrupted uploads
+checkpoint_folder = os.path.join(os.path.expanduser("~"), ".sharepoint_upload_checkpoints")
+
+# Define number of chunks kept in memory and size above which copies use temp disk
+copy_buffer_chunks = 4
+copy_spill_size = 1024 * 1024 * 1024
+
+# Define maximum number of queries sent in one batch request
+batch_size = 100
+
+# Define function that return the connection of the current thread
+def get_context() -> "ClientContext":
+    """
+    Return the SharePoint connection that can be used from the current thread
+    :param None
+    :return: thread_context: connection to the SharePoint
+    """
+    # Return pooled connection of the current thread
+    return get_client(throttling_policy)
+
+
+# Define function that send several queries with one request
+def execute_batch(queue_queries: Callable, policy_name: str = throttling_policy):
+    """
+    Queue up to batch_size queries and send them with one batch request, retrying the batch while it is throttled
+    :param queue_queries: function that receive the batch connection and queue the queries on it
+    :param policy_name: name of the retry and rate limit policy in string format
+    :return: result of queue_queries from the attempt that succeeded
+    """
+    # Define connection of the current thread
+    batch_context = get_batch_client()
+
+    # Define function that queue the queries again and send them together
+    def send_batch():
+        batch_context.clear()
+        queued_result = queue_queries(batch_context)
+        wait_for_token(policy_name)
+        count_request(None)
+        batch_context.execute_batch(batch_size)
+        return queued_result
+
+    # Send batch and return queued objects filled with the response
+    return call_with_retry(send_batch, policy_name)
+
+
+# Define function that retrieve all subfolders
+@traced("listing")
+def get_folder_data(folder_path: str) -> list:
+    """
+    Return a list with the names of subdirectories from provided URL
+    :param folder_path: path of the directory in string format
+    :return: folders_name: list with subdirectories name
+    """
+    # Retrieve all subfolders from provided folder with their properties in a single query
+    context = get_context()
+    folders = context.web.get_folder_by_server_relative_path(folder_path).folders
+    context.load(folders, folder_properties)
+    execute_query(context, throttling_policy)
+
+    # Display the number of subfolders
+    print("Number of folders:", len(folders))
+
+    # Iterate through all subfolder, display and save the name
+    folders_name = []
+    for folder in folders:
+        # print(folder.properties["ServerRelativeUrl"].split("/")[-1])
+        folders_name.append(folder.properties["Name"])
+    
+    # Return a list of subfolders name
+    return folders_name
+
+
+# Define function that retrieve all files
+@traced("listing")
+def get_folder_files(folder_path: str) -> list:
+    """
+    Return a list with the names of files from folder
+    :param folder_path: path of the directory in string format
+    :return: folders_name: list with files name
+    """
+    # Retrieve all files from provided folder with their properties in a single query
+    context = get_context()
+    files = context.web.get_folder_by_server_relative_path(folder_path).files
+    context.load(files, file_properties)
+    execute_query(context, throttling_policy)
+
+    # Display the number of files
+    print("Number of files:", len(files))
+
+    # Iterate through all files, display and save the name
+    files_name = []
+    for file in files:
+        # print(file.properties["Name"])
+        files_name.append(file.properties["Name"])
+    
+    # Return a list of files name
+    return files_name
+
+
+# Define function that describe a subfolder or a file
+def describe_item(item, item_type: str) -> dict:
+    """
+    Return the details of a subfolder or a file retrieved from SharePoint
+    :param item: loaded SharePoint folder or file
+    :param item_type: type of the item, "folder" or "file", in string format
+    :return: item_details: dictionary with name, path, type, size, modified time and ETag of the item
+    """
+    # Take loaded properties of the item, folders have no size and no ETag
+    properties = item.properties
+    item_details = {
+        "name": properties["Name"],
+        "path": properties["ServerRelativeUrl"],
+        "type": item_type,
+        "size": int(properties.get("Length", 0) or 0),
+        "modified": properties.get("TimeLastModified"),
+        "etag": properties.get("ETag"),
+    }
+
+    # Return details of the item
+    return item_details
+
+
+# Define function that retrieve all subfolders and files with their details and the folder stamp
+@traced("listing")
+def get_folder_listing(folder_path: str) -> tuple:
+    """
+    Return the details of subdirectories and files from provided URL and the version stamp of the directory using a single query
+    :param folder_path: path of the directory in string format
+    :return: folders_details, files_details, folder_stamp: lists with details of subdirectories and files, stamp in string format
+    """
+    # Expand subfolders and files of provided folder and select only needed properties
+    context = get_context()
+    library_root = context.web.get_folder_by_server_relative_path(folder_path)
+    selected_properties = ["TimeLastModified", "ItemCount"]
+    selected_properties += ["Folders/" + name for name in folder_properties]
+    selected_properties += ["Files/" + name for name in file_properties]
+    library_root.expand(["Folders", "Files"]).select(selected_properties)
+    context.load(library_root)
+    execute_query(context, throttling_policy)
+
+    # Describe every subfolder and file
+    folders_details = [describe_item(folder, "folder") for folder in library_root.folders]
+    files_details = [describe_item(file, "file") for file in library_root.files]
+
+    # Combine modified time and number of items in the same stamp as get_folder_stamp
+    folder_stamp = f"{library_root.properties['TimeLastModified']}|{library_root.properties['ItemCount']}"
+
+    # Return details of subfolders and files with the stamp
+    return folders_details, files_details, folder_stamp
+
+
+# Define function that retrieve all subfolders and files with their details
+def get_folder_content(folder_path: str) -> tuple:
+    """
+    Return the details of subdirectories and files from provided URL using a single query
+    :param folder_path: path of the directory in string format
+    :return: folders_details, files_details: lists with details of subdirectories and files
+    """
+    # Read listing and drop the stamp
+    folders_details, files_details, _ = get_folder_listing(folder_path)
+
+    # Return details of subfolders and files
+    return folders_details, files_details
+
+
+# Define function that retrieve the version stamp of a folder
+@traced("listing")
+def get_folder_stamp(folder_path: str) -> str:
+    """
+    Return a value that changes every time content of the folder from provided URL is changed
+    :param folder_path: path of the directory in string format
+    :return: folder_stamp: last modified time and number of items of the directory in string format
+    """
+    # Retrieve only modified time and number of items of provided folder
+    context = get_context()
+    folder = context.web.get_folder_by_server_relative_path(folder_path)
+    context.load(folder, ["TimeLastModified", "ItemCount"])
+    execute_query(context, throttling_policy)
+
+    # Combine both properties in a single stamp
+    folder_stamp = f"{folder.properties['TimeLastModified']}|{folder.properties['ItemCount']}"
+
+    # Return stamp of the folder
+    return folder_stamp
+
+
+# Define function that download a file into a local path atomically
+@traced("download")
+def download_to_path(file_url: str, local_path: str, modified_time: float = None) -> int:
+    """
+    Stream a SharePoint file into a temporary file next to the local path and rename it when complete, so an
+    interrupted download never leaves a partial file under the final name
+    :param file_url: path of the SharePoint file in string format
+    :param local_path: path of the local file in string format
+    :param modified_time: modified time given to the local file as timestamp in float format, None to keep current time
+    :return: bytes_read: number of downloaded bytes in integer format
+    """
+    # Write content into a temporary file in the same directory, so the rename doesn't move data
+    local_folder, local_name = os.path.split(os.path.abspath(local_path))
+    temp_descriptor, temp_path = tempfile.mkstemp(prefix=f".{local_name}.", suffix=".part", dir=local_folder)
+    try:
+        with os.fdopen(temp_descriptor, "wb") as temp_file:
+            bytes_read = download_stream(file_url, temp_file)
+        if modified_time is not None:
+            os.utime(temp_path, (modified_time, modified_time))
+        os.replace(temp_path, local_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    # Return number of downloaded bytes
+    return bytes_read
+
+
+# Define function that download file from SharePoint
+def download_file(file_url: str, local_folder: str = None) -> None:
+    """
+    Download a file to local disk from SharePoint
+    :param file_url: path of the SharePoint file in string format
+    :param local_folder: path of the local directory in string format, the current working directory if not provided
+    :return: None
+    """
+    # Retrieve file name from URL and build local path
+    file_name = file_url.split("/")[-1]
+    download_file = os.path.join(local_folder or os.getcwd(), file_name)
+
+    # Stream content into the local file
+    download_to_path(file_url, download_file)
+
+    # Display a message of completion
+    # print(f"File has been downloaded into: {download_file}")
+
+
+# Define function that upload file to SharePoint
+@traced("upload")
+def upload_file(file_name:str, folder_url: str) -> None:
+    """
+    Upload a file to SharePoint from local disk
+    :param file_name: name of the file in string format
+    :param folder_url: path of the SharePoint folder in string format
+    :return: None
+    """
+    # Take folder from SharePoint based on URL
+    context = get_context()
+    folder = context.web.get_folder_by_server_relative_url(folder_url)
+
+    # Take local working folder and retrieve local file
+    download_folder = os.getcwd().split("\\")
+    local_file = "/".join(download_folder) + "/" + file_name
+    file_size = os.path.getsize(local_file)
+
+    # Open file and save content
+    with open(local_file, 'rb') as f:
+        # Send small file in a single request
+        if file_size <= upload_session_size:
+            file = folder.files.upload(f)
+            execute_query(context, throttling_policy)
+
+        # Send large file in chunks, continuing a previous interrupted upload of the same file
+        else:
+            checkpoint_key = f"{folder_url}/{file_name}|{local_file}|{file_size}|{os.path.getmtime(local_file)}"
+
+            # Define function that upload the content from given upload session and offset
+            def upload_from(upload_id: str, file_offset: int) -> None:
+                f.seek(file_offset)
+                upload_stream(f, file_name, file_size, folder_url, checkpoint_key, upload_id, file_offset)
+
+            run_resumable(checkpoint_key, upload_from)
+
+    # Display a message of completion
+    # print(f"File has been uploaded into: {file.serverRelativeUrl}")
+
+
+# Define function that copy the whole folder
+@traced("copy")
+def copy_folder(source_path: str, destination_path: str):
+    """
+    Copy the whole content of the directory from source directory to the target directory
+    :param source_path: path of the source directory in string format
+    :param destination_path: path of the destination directory in string format
+    :return: None
+    """
+    # From raw URL obtain path to source directory and directory name
+    raw_source_root = source_path.split("/")[:-1]
+    source_root = "/".join(raw_source_root)
+    source_folder = source_path.split("/")[-1]
+
+    # From raw URL obtain path to destination directory and directory name
+    raw_destination_root = destination_path.split("/")[:-1]
+    destination_root = "/".join(raw_destination_root)
+    destination_folder = destination_path.split("/")[-1]
+
+    # Link obtained paths to the SharePoint
+    context = get_context()
+    folder_from = context.web.get_folder_by_server_relative_url(source_root).add(source_folder)
+    folder_to = context.web.get_folder_by_server_relative_url(destination_root).add(destination_folder)
+
+    # Copy directory
+    folder_from.copy_to_using_path(folder_to)
+    execute_query(context, throttling_policy)
+
+    # Display message of completion
+    print(f"Folder has been copied from '{folder_from.serverRelativeUrl}' into '{folder_to.serverRelativeUrl}'")
+
+
+# Define class that pass downloaded chunks to the upload
+class ChunkPipe:
+    """
+    Bounded in-memory buffer between a download writing chunks and an upload reading them from another thread
+    """
+
+    def __init__(self, max_chunks: int):
+        """
+        Create an empty buffer
+        :param max_chunks: maximum number of chunks kept in memory in integer format
+        """
+        self.chunks = queue.Queue(maxsize=max_chunks)
+        self.pending = bytearray()
+        self.is_finished = False
+        self.is_aborted = False
+
+    def write(self, data: bytes) -> int:
+        """
+        Add a downloaded chunk, waiting while the buffer is full
+        :param data: downloaded chunk in bytes format
+        :return: number of written bytes in integer format
+        """
+        # Wait for free space and stop if the reader gave up
+        while True:
+            if self.is_aborted:
+                raise BrokenPipeError("Upload of the copied file stopped")
+            try:
+                self.chunks.put(bytes(data), timeout=1)
+                return len(data)
+            except queue.Full:
+                pass
+
+    def close(self) -> None:
+        """
+        Mark the end of the downloaded content
+        :param None
+        :return: None
+        """
+        # Wait for free space unless the reader gave up
+        while not self.is_aborted:
+            try:
+                self.chunks.put(None, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    def abort(self) -> None:
+        """
+        Stop the download when the upload failed
+        :param None
+        :return: None
+        """
+        self.is_aborted = True
+
+    def read(self, size: int) -> bytes:
+        """
+        Return exactly the requested number of bytes, or less at the end of the content
+        :param size: number of bytes to read in integer format
+        :return: data: read content in bytes format
+        """
+        # Collect chunks until enough data is available
+        while len(self.pending) < size and not self.is_finished:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self.is_finished = True
+            else:
+                self.pending += chunk
+
+        # Return requested part and keep the rest for the next read
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+
+# Define function that download a file content in chunks
+@traced("download")
+def download_stream(file_url: str, file_object, start_offset: int = 0) -> int:
+    """
+    Download a file from SharePoint writing its content in chunks into a file-like object
+    :param file_url: path of the SharePoint file in string format
+    :param file_object: file-like object that receive the content
+    :param start_offset: position in bytes from where the content is downloaded in integer format
+    :return: bytes_read: number of downloaded bytes in integer format
+    """
+    # Import request options of the SharePoint client
+    from office365.runtime.http.request_options import RequestOptions
+
+    # Request file content as a stream, starting from provided position
+    context = get_context()
+    escaped_url = quote(file_url.replace("'", "''"), safe="")
+    request = RequestOptions(f"{context.service_root_url()}/web/getFileByServerRelativePath(DecodedUrl='{escaped_url}')/$value")
+    request.stream = True
+    if start_offset:
+        request.set_header("Range", f"bytes={start_offset}-")
+
+    # Define function that send the request and check that it was accepted
+    def open_response():
+        response = context.pending_request().execute_request_direct(request)
+        response.raise_for_status()
+        return response
+
+    # Write content chunk by chunk
+    bytes_read = 0
+    with call_with_retry(open_response, throttling_policy) as response:
+        # Skip the beginning of the content if the server sent the whole file
+        bytes_to_skip = start_offset if response.status_code != 206 else 0
+        for chunk in response.iter_content(chunk_size=upload_chunk_size):
+            if bytes_to_skip:
+                skipped_part = min(bytes_to_skip, len(chunk))
+                chunk = chunk[skipped_part:]
+                bytes_to_skip -= skipped_part
+            if chunk:
+                file_object.write(chunk)
+                bytes_read += len(chunk)
+
+    # Return number of downloaded bytes
+    return bytes_read
+
+
+# Define function that build the path of an upload checkpoint
+def get_checkpoint_path(checkpoint_key: str) -> str:
+    """
+    Return the location of the checkpoint for provided upload
+    :param checkpoint_key: destination and source identity of the upload in string format
+    :return: checkpoint_path: path of the checkpoint file in string format
+    """
+    # Name checkpoint file after the hash of the key
+    checkpoint_name = hashlib.sha1(checkpoint_key.encode("utf-8")).hexdigest() + ".json"
+    checkpoint_path = os.path.join(checkpoint_folder, checkpoint_name)
+
+    # Return path of the checkpoint
+    return checkpoint_path
+
+
+# Define function that read an upload checkpoint
+def read_checkpoint(checkpoint_key: str) -> dict:
+    """
+    Return the upload session and the number of committed bytes saved for provided upload
+    :param checkpoint_key: destination and source identity of the upload in string format
+    :return: checkpoint: dictionary with upload session ID and offset, empty if there is no checkpoint
+    """
+    # Read checkpoint if it exists
+    try:
+        with open(get_checkpoint_path(checkpoint_key), "r", encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except (OSError, ValueError):
+        checkpoint = {}
+
+    # Return saved checkpoint
+    return checkpoint
+
+
+# Define function that save an upload checkpoint
+def save_checkpoint(checkpoint_key: str, upload_id: str, file_offset: int) -> None:
+    """
+    Save the upload session and the number of committed bytes of provided upload
+    :param checkpoint_key: destination and source identity of the upload in string format
+    :param upload_id: upload session ID in string format
+    :param file_offset: number of bytes committed by SharePoint in integer format
+    :return: None
+    """
+    # Write checkpoint into a temporary file and replace the previous one at once
+    os.makedirs(checkpoint_folder, exist_ok=True)
+    checkpoint_path = get_checkpoint_path(checkpoint_key)
+    with open(checkpoint_path + ".tmp", "w", encoding="utf-8") as checkpoint_file:
+        json.dump({"upload_id": upload_id, "offset": file_offset}, checkpoint_file)
+    os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+
+# Define function that delete an upload checkpoint
+def delete_checkpoint(checkpoint_key: str) -> None:
+    """
+    Delete the checkpoint of provided upload
+    :param checkpoint_key: destination and source identity of the upload in string format
+    :return: None
+    """
+    # Delete checkpoint file if it exists
+    try:
+        os.remove(get_checkpoint_path(checkpoint_key))
+    except OSError:
+        pass
+
+
+# Define function that run an upload from its last checkpoint
+def run_resumable(checkpoint_key: str, upload_from) -> None:
+    """
+    Run an upload from the last saved checkpoint, or from the beginning if the saved upload session expired
+    :param checkpoint_key: destination and source identity of the upload in string format
+    :param upload_from: function that upload the content from given upload session ID and offset
+    :return: None
+    """
+    # Import exception raised by the SharePoint client
+    from office365.runtime.client_request_exception import ClientRequestException
+
+    # Continue previous upload session
+    checkpoint = read_checkpoint(checkpoint_key)
+    if checkpoint:
+        try:
+            upload_from(checkpoint["upload_id"], checkpoint["offset"])
+            return
+        except ClientRequestException:
+            # Keep the checkpoint if the session accepted new chunks before failing
+            if read_checkpoint(checkpoint_key) != checkpoint:
+                raise
+            delete_checkpoint(checkpoint_key)
+
+    # Start a new upload session
+    upload_from(None, 0)
+
+
+# Define function that upload a file content in chunks
+@traced("upload")
+def upload_stream(file_object, file_name: str, file_size: int, folder_url: str, checkpoint_key: str = None,
+                  upload_id: str = None, file_offset: int = 0) -> None:
+    """
+    Upload a file to SharePoint reading its content in chunks from a file-like object
+    :param file_object: file-like object that provide the content, starting at the given offset
+    :param file_name: name of the file in string format
+    :param file_size: size of the file in bytes in integer format
+    :param folder_url: path of the SharePoint folder in string format
+    :param checkpoint_key: destination and source identity used to save progress, or None to not save it
+    :param upload_id: ID of the upload session to continue, or None to start a new one
+    :param file_offset: number of bytes already committed in the continued session in integer format
+    :return: None
+    """
+    # Create an empty file in the destination folder when a new session starts
+    context = get_context()
+    if upload_id is None:
+        context.web.get_folder_by_server_relative_url(folder_url).files.add(file_name, None, True)
+        execute_query(context, throttling_policy)
+        upload_id = str(uuid.uuid4())
+        file_offset = 0
+
+    # Send content chunk by chunk in an upload session
+    target_file = context.web.get_file_by_server_relative_url(folder_url + "/" + file_name)
+    while file_offset < file_size:
+        chunk = file_object.read(upload_chunk_size)
+        if not chunk:
+            raise EOFError(f"Content of '{file_name}' ended after {file_offset} of {file_size} bytes")
+        if file_offset + len(chunk) >= file_size:
+            target_file.finish_upload(upload_id, file_offset, chunk)
+        elif file_offset == 0:
+            target_file.start_upload(upload_id, chunk)
+        else:
+            target_file.continue_upload(upload_id, file_offset, chunk)
+        execute_query(context, throttling_policy)
+        file_offset += len(chunk)
+
+        # Save committed offset so an interrupted upload can continue from here
+        if checkpoint_key and file_offset < file_size:
+            save_checkpoint(checkpoint_key, upload_id, file_offset)
+
+    # Forget progress of finished upload
+    if checkpoint_key:
+        delete_checkpoint(checkpoint_key)
+
+
+# Define function that copy file content in chunks
+@traced("copy")
+def copy_chunks(file_name: str, file_size: int, source_path: str, destination_path: str, checkpoint_key: str,
+                upload_id: str = None, file_offset: int = 0) -> None:
+    """
+    Copy a large file from SharePoint to SharePoint in an upload session, starting from given offset
+    :param file_name: name of the file in string format
+    :param file_size: size of the file in bytes in integer format
+    :param source_path: path of the SharePoint source file in string format
+    :param destination_path: path of the SharePoint destination directory in string format
+    :param checkpoint_key: destination and source identity used to save progress in string format
+    :param upload_id: ID of the upload session to continue, or None to start a new one
+    :param file_offset: number of bytes already committed in the continued session in integer format
+    :return: None
+    """
+    # Stage very large file in temp directory so the download doesn't wait for the upload
+    if file_size > copy_spill_size:
+        with tempfile.TemporaryFile() as temp_file:
+            download_stream(source_path, temp_file, file_offset)
+            temp_file.seek(0)
+            upload_stream(temp_file, file_name, file_size, destination_path, checkpoint_key, upload_id, file_offset)
+
+    # Stream other files from the download to the upload through a bounded buffer
+    else:
+        pipe = ChunkPipe(copy_buffer_chunks)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            upload = executor.submit(upload_stream, pipe, file_name, file_size, destination_path,
+                                     checkpoint_key, upload_id, file_offset)
+            upload.add_done_callback(lambda future: pipe.abort())
+            try:
+                download_stream(source_path, pipe, file_offset)
+            except BrokenPipeError:
+                # Upload stopped, its error is raised below
+                pass
+            finally:
+                pipe.close()
+            upload.result()
+
+
+# Define function that copy file
+@traced("copy")
+def copy_file(file_name: str, source_path: str, destination_path: str) -> None:
+    """
+    Copy file from source directory to the target directory
+    :param file_name: name of the file in string format
+    :param source_path: path of the SharePoint source file in string format
+    :param destination_path: path of the SharePoint destination directory in string format
+    :return: None
+    """
+    # Retrieve size and version of the source file
+    context = get_context()
+    source_file = context.web.get_file_by_server_relative_url(source_path)
+    context.load(source_file, ["Length", "ETag"])
+    execute_query(context, throttling_policy)
+    file_size = int(source_file.properties["Length"])
+
+    # Copy small file through memory with a single upload
+    if file_size <= upload_session_size:
+        buffer = io.BytesIO()
+        download_stream(source_path, buffer)
+        folder = context.web.get_folder_by_server_relative_url(destination_path)
+        folder.files.add(file_name, buffer.getvalue(), True)
+        execute_query(context, throttling_policy)
+
+    # Copy large file in chunks, continuing a previous interrupted copy of the same source version
+    else:
+        checkpoint_key = f"{destination_path}/{file_name}|{source_path}|{file_size}|{source_file.properties['ETag']}"
+        run_resumable(checkpoint_key, lambda upload_id, file_offset: copy_chunks(
+            file_name, file_size, source_path, destination_path, checkpoint_key, upload_id, file_offset))
+
+    # Display message of completion
+    print(f"File has been copied from '{source_path}' into '{destination_path}'")
+
+
+# Define function for writing content in Excel file
+@traced("excel")
+def write_to_excel(file_name: str, file_path: str, content: list, target_row: int, target_column: int) -> None:
+    """
+    Write to Excel file the name of subdirectories from specified directory
+    :param file_name: name of the Excel file in string format
+    :param file_path: path of the directory where Excel file will be stored in string format
+    :param content: list of subdirectories name in string format
+    :param target_row: desired row number from where start write data in integer format
+    :param target_column: desired column number from where start write data in integer format
+    :return: None
+    """
+    # Import Excel library only when a file is written
+    from openpyxl import Workbook, load_workbook
+
+    # Compile final file name and path
+    final_file_name = file_name + ".xlsx"
+    final_file_path = file_path + "/" + final_file_name
+
+    # Create new Excel file or append to exiting one
+    if os.path.isfile(final_file_path):
+        xlsx_sheet = load_workbook(final_file_path)
+    else:
+        xlsx_sheet = Workbook()
+    
+    # Open Excel file for writing
+    sheet = xlsx_sheet.active
+
+    # Take the last row where data was written
+    last_row = sheet.max_row
+    last_row += target_row
+
+    # Write data on specified column and starting from last empty row
+    for item in content:
+        sheet.cell(row=last_row, column=target_column, value=item)
+        last_row += 1
+    
+    # Write delimiter between each directory content
+    sheet.cell(row=last_row, column=target_column, value="*****")
+
+    # Save Excel file
+    xlsx_sheet.save(final_file_path)
+
+    # Display a message of completion
+    print(f"Excel file {final_file_name} was updated successfuly.")
+
+
+# Define function for reading content from Excel file
+@traced("excel")
+def read_from_excel(file_path: str, target_row: int, target_column: int) -> list:
+    """
+    Read from Excel file the name of subdirectories from specified directory
+    :param file_path: path of the directory where Excel file is stored in string format
+    :param target_row: desired row number from where start read data in integer format
+    :param target_column: desired column number from where start read data in integer format
+    :return: content: list of subdirectories name in string format
+    """
+    # Import Excel library only when a file is read
+    from openpyxl import load_workbook
+
+    # Open Excel file for streaming read, rows are not kept in memory
+    xlsx_sheet = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = xlsx_sheet.active
+
+        # Read content from one column starting with the target row
+        excel_content = []
+        for (cell_content,) in sheet.iter_rows(min_row=target_row, min_col=target_column, max_col=target_column, values_only=True):
+            excel_content.append(cell_content)
+    finally:
+        xlsx_sheet.close()
+
+    # Return list of read values
+    return excel_content
+
+
+# Define function for writing item in Excel file
+@traced("excel")
+def log_to_excel(file_name: str, file_path: str, item: str, target_row: int, target_column: int) -> None:
+    """
+    Write to Excel file the name of subdirectories from specified directory
+    :param file_name: name of the Excel file in string format
+    :param file_path: path of the directory where Excel file will be stored in string format
+    :param item: path of file or folder in string format
+    :param target_row: desired row number from where start write data in integer format
+    :param target_column: desired column number from where start write data in integer format
+    :return: None
+    """
+    # Import Excel library only when a file is written
+    from openpyxl import Workbook, load_workbook
+
+    # Compile final file name and path
+    final_file_name = file_name + ".xlsx"
+    final_file_path = file_path + "/" + final_file_name
+
+    # Create new Excel file or append to exiting one
+    if os.path.isfile(final_file_path):
+        xlsx_sheet = load_workbook(final_file_path)
+    else:
+        xlsx_sheet = Workbook()
+    
+    # Open Excel file for writing
+    sheet = xlsx_sheet.active
+
+    # Take the last row where data was written
+    last_row = sheet.max_row
+    last_row += target_row
+
+    # Write data on specified column and starting from last empty row
+    sheet.cell(row=last_row, column=target_column, value=item)
+    last_row += 1
+    
+    # Write delimiter between each directory content
+    sheet.cell(row=last_row, column=target_column, value="*****")
+
+    # Save Excel file
+    xlsx_sheet.save(final_file_path)
+
+    # Display a message of completion
+    print(f"Excel file {final_file_name} was updated successfuly.")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define work scenario variables
+    root_location = "/sites/<enterprise_site>/<enterprise_directory>"
+    lvl_1_folder = ["/Folder_1", "/Folder_2", "/Folder_3", "/Folder_4", "/Folder_5"]
+    lvl_1_1_folder = ["/Subfolder_1", "/Subfolder_1", "/Subfolder_1"]
+
+    # Provide root work path
+    for index in range(len(lvl_1_1_folder)):
+        folder_path = root_location + lvl_1_folder[0] + lvl_1_1_folder[index]
+
+        # Get subfolders name from folder
+        folders_name = get_folder_data(folder_path)
+        write_to_excel("/Folders_Path", os.getcwd(), folders_name, 1, 1)
@@ -0,0 +1,49 @@
+# Import necessary libraries
+import asyncio
+
+import pytest
+
+# Import internal utilities
+import async_client
+import fake_sharepoint
+import request_metrics
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Async"
+
+
+# Define fixture that give every test an empty site with the test folder
+@pytest.fixture(autouse=True)
+def folder_site(empty_site):
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(test_folder + "/Folder_1")
+
+
+# Define function that run a coroutine with a client of the fake site
+def run_with_client(fake_site, run) -> object:
+    async def run_and_close():
+        client = await async_client.open_client(fake_sharepoint.get_site_url(fake_site))
+        try:
+            return await run(client)
+        finally:
+            await async_client.close_client(client)
+
+    return asyncio.run(run_and_close())
+
+
+# Define test that subfolders are listed
+def test_get_folder_data(empty_site):
+    assert run_with_client(empty_site, lambda client: async_client.get_folder_data(client, test_folder)) == ["Folder_1"]
+
+
+# Define test that concurrent coroutines record their own retry attempt
+def test_retry_attempt_is_recorded(empty_site, monkeypatch):
+    monkeypatch.setitem(request_metrics.metrics_state, "enabled", True)
+    monkeypatch.setattr(request_metrics, "slowest_requests", [])
+    fake_sharepoint.server_settings.update(throttled_requests=1)
+
+    async def list_twice(client: dict) -> None:
+        await asyncio.gather(async_client.get_folder_data(client, test_folder), async_client.get_folder_data(client, test_folder))
+
+    run_with_client(empty_site, list_twice)
+    assert sorted(request["retry"] for _, _, request in request_metrics.slowest_requests) == [0, 0, 1]
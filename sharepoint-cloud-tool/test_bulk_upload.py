@@ -0,0 +1,60 @@
+# Import necessary libraries
+import os
+
+import pytest
+
+# Import internal utilities
+import bulk_upload
+import fake_sharepoint
+import sharepoint_tools
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Upload"
+
+
+# Define fixture that give every test an empty destination and a local tree with small and chunked files
+@pytest.fixture
+def local_tree(empty_site, tmp_path, monkeypatch):
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(test_folder)
+    monkeypatch.setattr(bulk_upload, "upload_session_size", 16 * 1024)
+    monkeypatch.setattr(sharepoint_tools, "upload_chunk_size", 8 * 1024)
+    monkeypatch.setattr(sharepoint_tools, "checkpoint_folder", str(tmp_path / "checkpoints"))
+    local_root = tmp_path / "local"
+    contents = {"Small.txt": b"small", "A/Empty.txt": b"", "A/B/Large.bin": os.urandom(40 * 1024 + 100)}
+    for relative_path, content in contents.items():
+        (local_root / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (local_root / relative_path).write_bytes(content)
+    return local_root, contents
+
+
+# Define test that the local tree is read with paths relative to the root
+def test_scan_local_tree(local_tree):
+    local_root, contents = local_tree
+    directories, files = bulk_upload.scan_local_tree(str(local_root))
+    assert sorted(directories) == ["A", "A/B"]
+    assert sorted(file["relative_path"] for file in files) == sorted(contents)
+    assert {file["relative_path"]: file["size"] for file in files} == {path: len(content) for path, content in contents.items()}
+
+
+# Define test that folders and files of every size are uploaded with the same content
+def test_upload_tree(local_tree):
+    local_root, contents = local_tree
+    statistics = bulk_upload.upload_tree(str(local_root), test_folder)
+    assert statistics["errors"] == []
+    assert statistics["folders"] == 2
+    assert statistics["uploaded"] == len(contents)
+    for relative_path, content in contents.items():
+        assert fake_sharepoint.read_file(test_folder + "/" + relative_path) == content
+
+
+# Define test that a failed folder batch is created folder by folder and failures are reported
+def test_create_folders_falls_back_to_single_folders(empty_site):
+    fake_sharepoint.server_settings.update(throttled_requests=2, throttle_status=500)
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(test_folder)
+    folders_number, failures = bulk_upload.create_folders(test_folder, ["A", "B", "C"])
+    assert folders_number == 2
+    assert [failure["name"] for failure in failures] == ["A"]
+    assert test_folder + "/B" in fake_sharepoint.folders
+    assert test_folder + "/C" in fake_sharepoint.folders
@@ -0,0 +1,35 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+from cleaning_tool import delete_batch, delete_directory
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Cleaning"
+
+
+# Define fixture that give every test a seeded tree
+@pytest.fixture(autouse=True)
+def seeded_site(empty_site):
+    return fake_sharepoint.seed_tree(test_folder, depth=1, folders_per_folder=2, files_per_folder=3)
+
+
+# Define test that a failed batch is deleted item by item and only the failed item is reported
+def test_failed_batch_falls_back_to_single_deletes():
+    items = [{"type": "file", "path": f"{test_folder}/File_{index}.bin"} for index in range(3)]
+    items.append({"type": "file", "path": test_folder + "/Missing.bin"})
+    fake_sharepoint.server_settings.update(throttled_requests=2, throttle_status=500)
+    deleted_number, failures = delete_batch(items)
+    assert deleted_number == 3
+    assert [failure["path"] for failure in failures] == [test_folder + "/File_0.bin"]
+    assert failures[0]["error"]
+    assert test_folder + "/File_0.bin" in fake_sharepoint.files
+    assert test_folder + "/File_1.bin" not in fake_sharepoint.files
+
+
+# Define test that a directory is deleted with all its content
+def test_delete_directory(seeded_site):
+    deleted_items = delete_directory(test_folder)
+    assert deleted_items == {"folders": seeded_site["folders"] + 1, "files": seeded_site["files"], "failures": []}
+    assert test_folder not in fake_sharepoint.folders
@@ -0,0 +1,54 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import copy_checkpoint
+import copy_scheduler
+from copy_checkpoint import checkpoint_run, close_results, get_run_state, open_results, record_result, record_start
+
+# Define jobs used by the tests
+test_jobs = [{"type": "file", "name": f"File_{index}.bin", "source": f"/Source/File_{index}.bin", "destination": "/Destination"}
+             for index in range(3)]
+
+
+# Define fixture that give every test an empty checkpoint database
+@pytest.fixture(autouse=True)
+def empty_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_checkpoint, "checkpoint_path", str(tmp_path / "checkpoints.sqlite"))
+
+
+# Define test that every job is marked in flight before its result and only after it was taken by a worker
+def test_run_copy_jobs_reports_started_jobs(monkeypatch):
+    events = []
+    monkeypatch.setattr(copy_scheduler, "copy_job", lambda job: events.append(("copy", job["name"])))
+    results = copy_scheduler.run_copy_jobs(test_jobs, lambda result: events.append((result["status"], result["name"])),
+                                           max_workers=1, on_start=lambda job: events.append((job["status"], job["name"])))
+    assert [result["status"] for result in results] == ["copied"] * 3
+    for job in test_jobs:
+        job_events = [event for event in events if event[1] == job["name"]]
+        assert [status for status, _ in job_events if status != "copy"] == ["in_flight", "copied"]
+
+
+# Define test that a job started but not finished is stored in flight and copied again on resume
+def test_in_flight_job_is_resumed():
+    jobs = list(checkpoint_run("run", "/Source", "/Destination", lambda: test_jobs, is_resumed=False))
+    recorder = open_results("run")
+    record_start(recorder, jobs[0])
+    record_result(recorder, dict(jobs[0], status="copied", error=""))
+    record_start(recorder, jobs[1])
+
+    # Stop like a crash, without closing the recorder
+    assert get_run_state("run")["counts"] == {"done": 1, "in_flight": 1, "planned": 1}
+    resumed_jobs = list(checkpoint_run("run", "/Source", "/Destination", lambda: [], is_resumed=True))
+    assert resumed_jobs == jobs[1:]
+    recorder["connection"].close()
+
+
+# Define test that a finished run is forgotten
+def test_finished_run_is_removed():
+    recorder = open_results("run")
+    for job in checkpoint_run("run", "/Source", "/Destination", lambda: test_jobs, is_resumed=False):
+        record_start(recorder, job)
+        record_result(recorder, dict(job, status="copied", error=""))
+    close_results(recorder)
+    assert get_run_state("run") is None
@@ -0,0 +1,38 @@
+# Import necessary libraries
+import threading
+
+import pytest
+
+# Import internal utilities
+import copy_scheduler
+
+# Define jobs used by the tests
+test_jobs = [{"type": "file", "name": f"File_{index}.bin", "source": f"/Source/File_{index}.bin", "destination": "/Destination"}
+             for index in range(200)]
+
+
+# Define test that results are returned in the order of the jobs with failed copies reported
+def test_results_keep_job_order(monkeypatch):
+    def copy_job(job: dict) -> None:
+        if job["name"] == "File_3.bin":
+            raise OSError("copy failed")
+
+    monkeypatch.setattr(copy_scheduler, "copy_job", copy_job)
+    results = copy_scheduler.run_copy_jobs(test_jobs, max_workers=4, queue_size=2)
+    assert [result["name"] for result in results] == [job["name"] for job in test_jobs]
+    assert [result["status"] for result in results if result["status"] == "failed"] == ["failed"]
+
+
+# Define test that a failed result handler stops the run without leaving blocked threads
+def test_failed_handler_stops_all_stages(monkeypatch):
+    copied_jobs = []
+    monkeypatch.setattr(copy_scheduler, "copy_job", copied_jobs.append)
+    threads_before = threading.active_count()
+
+    def on_result(result: dict) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        copy_scheduler.run_copy_jobs(test_jobs, on_result, max_workers=4, queue_size=2)
+    assert threading.active_count() == threads_before
+    assert len(copied_jobs) < len(test_jobs)
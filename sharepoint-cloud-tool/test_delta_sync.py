@@ -0,0 +1,55 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import delta_sync
+import fake_sharepoint
+
+# Define folders used by the tests
+source_folder = fake_sharepoint.site_path + "/Shared Documents/Source"
+destination_folder = fake_sharepoint.site_path + "/Shared Documents/Destination"
+
+
+# Define fixture that give every test an empty sync state and both trees
+@pytest.fixture(autouse=True)
+def synced_site(empty_site, tmp_path, monkeypatch):
+    monkeypatch.setattr(delta_sync, "sync_state_path", str(tmp_path / "sync_state.sqlite"))
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(source_folder)
+        fake_sharepoint.add_folder(destination_folder)
+
+
+# Define function that add the same file to a folder of the source and the destination
+def add_file_pair(source_path: str, destination_path: str) -> None:
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_file(source_folder + "/" + source_path, size=100)
+        fake_sharepoint.add_file(destination_folder + "/" + destination_path, size=100)
+
+
+# Define test that paths differing only by case are the same item
+def test_case_only_rename_is_not_deleted():
+    add_file_pair("Reports/Report.txt", "reports/report.TXT")
+    delta = delta_sync.plan_delta(source_folder, destination_folder, propagate_deletions=True)
+    assert delta["deleted_items"] == []
+    assert delta["jobs"] == []
+
+
+# Define test that new items keep their original case and removed items are deleted
+def test_delta_keeps_original_paths():
+    add_file_pair("Kept.txt", "kept.txt")
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_file(source_folder + "/New Folder/New.txt", size=10)
+        fake_sharepoint.add_file(destination_folder + "/Old.txt", size=10)
+    delta = delta_sync.plan_delta(source_folder, destination_folder, propagate_deletions=True)
+    assert [job["destination"] for job in delta["jobs"]] == [destination_folder + "/New Folder"]
+    assert [item["relative_path"] for item in delta["deleted_items"]] == ["Old.txt"]
+    assert sorted(item["relative_path"] for item in delta["source_files"]) == ["Kept.txt", "New Folder/New.txt"]
+
+
+# Define test that deleting a folder forgets only its own content, even with wildcard characters in its name
+def test_deleted_folder_forgets_only_its_content():
+    synced_files = [{"relative_path": path, "etag": "1", "size": 1} for path in
+                    ["50%_off/File.txt", "50%_offer/File.txt", "50X_off/File.txt", "50%_off.txt"]]
+    delta_sync.write_sync_state(source_folder, destination_folder, synced_files, [])
+    delta_sync.write_sync_state(source_folder, destination_folder, [], ["50%_off"])
+    assert sorted(delta_sync.read_sync_state(source_folder, destination_folder)) == ["50%_off.txt", "50%_offer/File.txt", "50X_off/File.txt"]
@@ -0,0 +1,34 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+from client_pool import get_request_count
+from preflight import check_paths_batch
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Preflight"
+
+
+# Define fixture that give every test sixteen folders
+@pytest.fixture(autouse=True)
+def folders_site(empty_site):
+    with fake_sharepoint.state_lock:
+        for index in range(16):
+            fake_sharepoint.add_folder(f"{test_folder}/Folder_{index}")
+
+
+# Define test that a batch of existing folders costs one request
+def test_existing_folders_cost_one_request():
+    check_results = check_paths_batch([f"{test_folder}/Folder_{index}" for index in range(16)])
+    assert [check_result["status"] for check_result in check_results] == ["ok"] * 16
+    assert get_request_count() == 1
+
+
+# Define test that a missing folder is found by splitting the batch, not by checking every folder alone
+def test_missing_folder_is_found_by_halves():
+    folders_path = [f"{test_folder}/Folder_{index}" for index in range(15)] + [test_folder + "/Missing"]
+    check_results = check_paths_batch(folders_path)
+    assert [check_result["path"] for check_result in check_results] == folders_path
+    assert [check_result["status"] for check_result in check_results] == ["ok"] * 15 + ["missing"]
+    assert get_request_count() == 9
@@ -0,0 +1,52 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+from rename_folders import apply_changes_batch, restructure_stores
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Stores"
+
+
+# Define fixture that give every test two stores with one folder to rename
+@pytest.fixture(autouse=True)
+def stores_site(empty_site):
+    with fake_sharepoint.state_lock:
+        for store_name in ["Store_1", "Store_2"]:
+            fake_sharepoint.add_folder(f"{test_folder}/{store_name}/Folder_01")
+
+
+# Define test that a failed change doesn't stop the other changes of its batch
+def test_failed_change_falls_back_to_single_changes():
+    changes = [
+        {"type": "rename", "path": test_folder + "/Store_1/Folder_01", "name": "Folder_1"},
+        {"type": "rename", "path": test_folder + "/Store_1/Missing", "name": "Folder_2"},
+        {"type": "create", "path": test_folder + "/Store_2", "name": "Folder_3"},
+    ]
+    applied_number, failures = apply_changes_batch(changes)
+    assert applied_number == 2
+    assert [failure["path"] for failure in failures] == [test_folder + "/Store_1/Missing"]
+    assert failures[0]["error"]
+    assert test_folder + "/Store_1/Folder_1" in fake_sharepoint.folders
+    assert test_folder + "/Store_2/Folder_3" in fake_sharepoint.folders
+
+
+# Define test that stores are restructured and every phase reports its failures
+def test_restructure_stores():
+    phases_result = restructure_stores([test_folder + "/Store_1", test_folder + "/Store_2"],
+                                       {"rename": {"Folder_01": "Folder_1"}, "create": ["Folder_2"]})
+    assert all(not phase_result["failures"] for phase_result in phases_result.values())
+    for store_name in ["Store_1", "Store_2"]:
+        assert test_folder + f"/{store_name}/Folder_1" in fake_sharepoint.folders
+        assert test_folder + f"/{store_name}/Folder_2" in fake_sharepoint.folders
+        assert test_folder + f"/{store_name}/Folder_01" not in fake_sharepoint.folders
+
+
+# Define test that a store that can't be listed is reported and the other stores are still restructured
+def test_missing_store_is_reported():
+    phases_result = restructure_stores([test_folder + "/Store_1", test_folder + "/Missing"], {"rename": {"Folder_01": "Folder_1"}})
+    assert [failure["path"] for failure in phases_result["list"]["failures"]] == [test_folder + "/Missing"]
+    assert phases_result["list"]["failures"][0]["error"]
+    assert not phases_result["rename"]["failures"]
+    assert test_folder + "/Store_1/Folder_1" in fake_sharepoint.folders
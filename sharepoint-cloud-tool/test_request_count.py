@@ -0,0 +1,61 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+import listing_cache
+from client_pool import get_request_count, reset_request_count
+from sharepoint_tools import get_folder_content
+from tree_crawler import crawl_tree
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Listing"
+
+
+# Define fixture that give every test a seeded tree, an empty cache and zero counted requests
+@pytest.fixture(autouse=True)
+def seeded_site(empty_site, tmp_path, monkeypatch):
+    monkeypatch.setattr(listing_cache, "cache_path", str(tmp_path / "listing_cache.sqlite"))
+    return fake_sharepoint.seed_tree(test_folder, depth=2, folders_per_folder=3, files_per_folder=2)
+
+
+# Define function that return the number of requests received by the fake server
+def get_server_requests() -> int:
+    return sum(count for name, count in fake_sharepoint.request_counts.items() if name != "throttled")
+
+
+# Define test that a folder is listed with a single request
+def test_folder_content_costs_one_request():
+    folders_details, files_details = get_folder_content(test_folder)
+    assert len(folders_details) == 3
+    assert len(files_details) == 2
+    assert get_request_count() == 1
+    assert get_server_requests() == 1
+
+
+# Define test that crawling a tree costs one request per folder
+def test_crawl_costs_one_request_per_folder(seeded_site):
+    crawled_items = list(crawl_tree(test_folder))
+    listed_folders = seeded_site["folders"] + 1
+    assert sum(item["type"] == "file" for item in crawled_items) == seeded_site["files"]
+    assert get_request_count() == listed_folders
+    assert get_server_requests() == listed_folders
+
+
+# Define test that a cold cached listing costs one request and a fresh hit costs none
+def test_cached_listing_costs_one_request_then_none():
+    assert listing_cache.get_cached_content(test_folder) == (["Folder_0", "Folder_1", "Folder_2"], ["File_0.bin", "File_1.bin"])
+    assert get_request_count() == 1
+    reset_request_count()
+    assert listing_cache.get_cached_content(test_folder) == (["Folder_0", "Folder_1", "Folder_2"], ["File_0.bin", "File_1.bin"])
+    assert get_request_count() == 0
+    assert get_server_requests() == 1
+
+
+# Define test that an expired listing is validated with a single stamp request
+def test_expired_listing_costs_one_stamp_request(monkeypatch):
+    listing_cache.get_cached_content(test_folder)
+    monkeypatch.setattr(listing_cache, "cache_ttl", 0)
+    reset_request_count()
+    listing_cache.get_cached_content(test_folder)
+    assert get_request_count() == 1
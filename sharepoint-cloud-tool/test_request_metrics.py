@@ -0,0 +1,44 @@
+# Import necessary libraries
+import pytest
+
+# Import internal utilities
+import fake_sharepoint
+import request_metrics
+from sharepoint_tools import get_folder_content
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Metrics"
+
+
+# Define fixture that give every test an empty site with the test folder and empty measures
+@pytest.fixture(autouse=True)
+def measured_site(empty_site, monkeypatch):
+    monkeypatch.setitem(request_metrics.metrics_state, "enabled", True)
+    monkeypatch.setattr(request_metrics, "slowest_requests", [])
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(test_folder)
+
+
+# Define function that return the retry attempt of every kept request
+def get_recorded_attempts() -> list:
+    return sorted(request["retry"] for _, _, request in request_metrics.slowest_requests)
+
+
+# Define test that measured requests carry their retry attempt and later requests are first attempts again
+def test_retry_attempt_is_recorded_and_reset():
+    fake_sharepoint.server_settings.update(throttled_requests=1)
+    get_folder_content(test_folder)
+    assert get_recorded_attempts() == [0, 1]
+    assert request_metrics.retry_state.attempt == 0
+    request_metrics.record_request("GET", "https://site/_api/web", 200, 0, 0, 0.0)
+    assert get_recorded_attempts() == [0, 0, 1]
+
+
+# Define test that an attempt passed by the caller is used instead of the one of the thread
+def test_explicit_attempt_is_recorded():
+    request_metrics.set_retry_attempt(1)
+    try:
+        request_metrics.record_request("GET", "https://site/_api/web", 200, 0, 0, 0.0, attempt=2)
+    finally:
+        request_metrics.set_retry_attempt(0)
+    assert get_recorded_attempts() == [2]
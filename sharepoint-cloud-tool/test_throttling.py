@@ -0,0 +1,87 @@
+# Import necessary libraries
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from requests import RequestException
+
+# Import internal utilities
+import fake_sharepoint
+import throttling
+from bulk_upload import upload_mapped_file
+from client_pool import get_client
+from sharepoint_tools import get_folder_content
+from throttling import execute_query, get_retry_delay, retry_policies
+
+# Define folder used by the tests
+test_folder = fake_sharepoint.site_path + "/Shared Documents/Throttling"
+
+
+# Define fixture that add a retry policy without delays for the module
+@pytest.fixture(scope="module", autouse=True)
+def test_policy():
+    retry_policies["test_retries"] = {"max_retries": 2, "base_delay": 0.0, "max_delay": 5.0, "requests_per_second": 0, "burst": 1}
+    yield
+    retry_policies.pop("test_retries")
+
+
+# Define fixture that give every test an empty site with the test folder
+@pytest.fixture(autouse=True)
+def folder_site(empty_site):
+    with fake_sharepoint.state_lock:
+        fake_sharepoint.add_folder(test_folder)
+
+
+# Define test that throttled requests are retried up to the policy limit and then raised
+@pytest.mark.parametrize("throttle_status", [429, 503])
+def test_retries_until_max_retries(throttle_status):
+    fake_sharepoint.server_settings.update(throttled_requests=10, throttle_status=throttle_status)
+    context = get_client("test_retries")
+    folder = context.web.get_folder_by_server_relative_path(test_folder)
+    context.load(folder, ["Name"])
+    with pytest.raises(RequestException) as error:
+        execute_query(context, "test_retries")
+    assert error.value.response.status_code == throttle_status
+    assert fake_sharepoint.request_counts["throttled"] == retry_policies["test_retries"]["max_retries"] + 1
+
+
+# Define test that a request throttled fewer times than the limit succeeds
+def test_retry_succeeds_after_throttling():
+    fake_sharepoint.server_settings.update(throttled_requests=2)
+    context = get_client("test_retries")
+    folder = context.web.get_folder_by_server_relative_path(test_folder)
+    context.load(folder, ["Name"])
+    execute_query(context, "test_retries")
+    assert folder.properties["Name"] == "Throttling"
+    assert fake_sharepoint.request_counts["throttled"] == 2
+
+
+# Define test that the delay asked by the server is used and pauses the whole policy
+def test_retry_after_sets_delay():
+    fake_sharepoint.server_settings.update(throttled_requests=1, retry_after=1)
+    start_time = time.monotonic()
+    get_folder_content(test_folder)
+    assert time.monotonic() - start_time >= 1.0
+    assert throttling.rate_buckets["sharepoint_tools"]["paused_until"] >= start_time + 1.0
+
+
+# Define test that the delay is read from seconds or dates and limited by the policy
+def test_get_retry_delay():
+    policy = {"max_retries": 2, "base_delay": 1.0, "max_delay": 5.0}
+    assert get_retry_delay(SimpleNamespace(headers={"Retry-After": "3"}), 0, policy) == 3.0
+    assert get_retry_delay(SimpleNamespace(headers={"Retry-After": "120"}), 0, policy) == 5.0
+    assert 0.0 <= get_retry_delay(SimpleNamespace(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}), 0, policy) <= 5.0
+    assert 2.0 <= get_retry_delay(SimpleNamespace(headers={}), 2, policy) <= 4.0
+
+
+# Define test that a retried upload streamed from a memory map sends the whole content again
+def test_retried_upload_sends_full_content(tmp_path):
+    content = os.urandom(256 * 1024)
+    local_path = tmp_path / "Mapped.bin"
+    local_path.write_bytes(content)
+    local_file = {"name": "Mapped.bin", "path": str(local_path), "size": len(content), "modified": os.path.getmtime(local_path)}
+    fake_sharepoint.server_settings.update(throttled_requests=1)
+    upload_mapped_file(local_file, test_folder)
+    assert fake_sharepoint.request_counts["throttled"] == 1
+    assert fake_sharepoint.read_file(test_folder + "/Mapped.bin") == content
@@ -0,0 +1,205 @@
+# Import necessary libraries
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+# Import internal utilities
+from request_metrics import record_retry, set_retry_attempt
+
+# Define HTTP status codes returned by SharePoint when requests are throttled
+retry_status_codes = {429, 503}
+
+# Define retry and rate limit policy of every module
+retry_policies = {
+    "default": {"max_retries": 5, "base_delay": 1.0, "max_delay": 60.0, "requests_per_second": 10.0, "burst": 10},
+    "sharepoint_tools": {"max_retries": 8, "base_delay": 1.0, "max_delay": 120.0, "requests_per_second": 20.0, "burst": 20},
+    "rename_folders": {"max_retries": 8, "base_delay": 1.0, "max_delay": 120.0, "requests_per_second": 10.0, "burst": 10},
+    "cleaning_tool": {"max_retries": 8, "base_delay": 2.0, "max_delay": 120.0, "requests_per_second": 5.0, "burst": 5},
+    "preflight": {"max_retries": 5, "base_delay": 1.0, "max_delay": 30.0, "requests_per_second": 10.0, "burst": 10},
+    "async_client": {"max_retries": 8, "base_delay": 1.0, "max_delay": 120.0, "requests_per_second": 100.0, "burst": 100},
+    "sharepoint_ui": {"max_retries": 3, "base_delay": 1.0, "max_delay": 10.0, "requests_per_second": 0, "burst": 1},
+}
+
+# Define token buckets shared by all connections of the same policy
+rate_buckets = {}
+rate_lock = threading.Lock()
+
+
+# Define function that return a policy
+def get_policy(policy_name: str) -> dict:
+    """
+    Return retry and rate limit settings of the policy, or the default ones if the policy doesn't exist
+    :param policy_name: name of the policy in string format
+    :return: policy: dictionary with retry and rate limit settings
+    """
+    # Return policy or default policy
+    return retry_policies.get(policy_name, retry_policies["default"])
+
+
+# Define function that get the bucket of a policy
+def get_bucket(policy_name: str) -> dict:
+    """
+    Return the token bucket of the policy, creating a full one on first use; caller must hold rate_lock
+    :param policy_name: name of the policy in string format
+    :return: bucket: dictionary with available tokens, last update time and pause end time
+    """
+    # Create bucket on first use
+    if policy_name not in rate_buckets:
+        rate_buckets[policy_name] = {"tokens": get_policy(policy_name)["burst"], "updated": time.monotonic(), "paused_until": 0.0}
+
+    # Return bucket of the policy
+    return rate_buckets[policy_name]
+
+
+# Define function that reserve permission to send a request
+def reserve_token(policy_name: str) -> float:
+    """
+    Take a token of the policy and return how long the caller must wait before sending the request, according with
+    its requests per second and server pauses
+    :param policy_name: name of the policy in string format
+    :return: wait_time: number of seconds to wait in float format
+    """
+    # Refill bucket with the tokens earned since the last request and reserve one token
+    policy = get_policy(policy_name)
+    with rate_lock:
+        bucket = get_bucket(policy_name)
+        now = time.monotonic()
+        wait_time = max(0.0, bucket["paused_until"] - now)
+        if policy["requests_per_second"]:
+            earned_tokens = (now - bucket["updated"]) * policy["requests_per_second"]
+            bucket["tokens"] = min(policy["burst"], bucket["tokens"] + earned_tokens)
+            bucket["updated"] = now
+            bucket["tokens"] -= 1
+            wait_time = max(wait_time, -bucket["tokens"] / policy["requests_per_second"])
+
+    # Return time to wait for the reserved token
+    return wait_time
+
+
+# Define function that wait for permission to send a request
+def wait_for_token(policy_name: str) -> None:
+    """
+    Wait until the policy allows another request, according with its requests per second and server pauses
+    :param policy_name: name of the policy in string format
+    :return: None
+    """
+    # Wait for the reserved token
+    wait_time = reserve_token(policy_name)
+    if wait_time > 0:
+        time.sleep(wait_time)
+
+
+# Define function that pause all requests of a policy
+def pause_requests(policy_name: str, delay: float) -> None:
+    """
+    Stop sending requests of the policy for the given time, as asked by the server
+    :param policy_name: name of the policy in string format
+    :param delay: number of seconds to wait in float format
+    :return: None
+    """
+    # Move the end of the pause if it is later than the current one
+    with rate_lock:
+        bucket = get_bucket(policy_name)
+        bucket["paused_until"] = max(bucket["paused_until"], time.monotonic() + delay)
+
+
+# Define function that attach the rate limit to a connection
+def limit_requests(client_context, policy_name: str):
+    """
+    Apply the rate limit of the policy to every request sent through provided SharePoint connection
+    :param client_context: connection to the SharePoint
+    :param policy_name: name of the policy in string format
+    :return: client_context: the same connection to the SharePoint
+    """
+    # Wait for a token before every request is sent
+    client_context.pending_request().beforeExecute += lambda request: wait_for_token(policy_name)
+
+    # Return limited connection
+    return client_context
+
+
+# Define function that compute the delay before a retry
+def get_retry_delay(response, attempt: int, policy: dict) -> float:
+    """
+    Return the delay asked by the server in Retry-After header, or a jittered exponential backoff
+    :param response: throttled HTTP response
+    :param attempt: number of the failed attempt starting from zero in integer format
+    :param policy: dictionary with retry settings
+    :return: delay: number of seconds to wait in float format
+    """
+    # Use delay in seconds or date provided by the server
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), policy["max_delay"])
+        except ValueError:
+            try:
+                retry_date = parsedate_to_datetime(retry_after)
+                return min(max(0.0, retry_date.timestamp() - time.time()), policy["max_delay"])
+            except (TypeError, ValueError):
+                pass
+
+    # Wait a random time up to the exponential backoff limit
+    backoff_limit = min(policy["max_delay"], policy["base_delay"] * 2 ** attempt)
+    return random.uniform(backoff_limit / 2, backoff_limit)
+
+
+# Define function that call an action and retry it while it is throttled
+def call_with_retry(action: Callable, policy_name: str = "default", before_retry: Callable = None):
+    """
+    Call the action and retry it when SharePoint throttles the request or is temporarily unavailable
+    :param action: function that send the request
+    :param policy_name: name of the policy in string format
+    :param before_retry: function called before every retry to prepare the request again
+    :return: result of the action
+    """
+    # Import exception raised by failed HTTP requests
+    from requests import RequestException
+
+    # Try the action until it succeeds, fails with another error or retries are exhausted
+    policy = get_policy(policy_name)
+    attempt = 0
+    try:
+        while True:
+            try:
+                set_retry_attempt(attempt)
+                return action()
+            except RequestException as error:
+                response = error.response
+                if response is None or response.status_code not in retry_status_codes or attempt >= policy["max_retries"]:
+                    raise
+
+                # Pause all requests of the policy and try again
+                delay = get_retry_delay(response, attempt, policy)
+                record_retry(policy_name, response.status_code)
+                print(f"Request throttled with status {response.status_code}, retry {attempt + 1} in {delay:.1f} s.")
+                pause_requests(policy_name, delay)
+                time.sleep(delay)
+                if before_retry:
+                    before_retry()
+                attempt += 1
+    finally:
+        # Requests sent later from the thread outside of a retry are first attempts
+        set_retry_attempt(0)
+
+
+# Define function that submit pending queries of a connection
+def execute_query(client_context, policy_name: str = "default") -> None:
+    """
+    Submit pending queries of provided SharePoint connection, retrying the failed query while it is throttled
+    :param client_context: connection to the SharePoint
+    :param policy_name: name of the policy in string format
+    :return: None
+    """
+    # Define function that queue failed query again, the same way the client library does
+    def queue_again() -> None:
+        # Rewind content streamed from a file or a memory map, the failed attempt already read it
+        query_content = getattr(client_context.current_query, "parameters_type", None)
+        if hasattr(query_content, "seek"):
+            query_content.seek(0)
+        client_context.add_query(client_context.current_query)
+
+    # Retry failed query while it is throttled
+    call_with_retry(client_context.execute_query, policy_name, queue_again)
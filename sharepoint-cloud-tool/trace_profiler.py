@@ -0,0 +1,151 @@
+# Import necessary libraries
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Define command line flag that enable profiling and folder of the trace files
+profile_flag = "--profile"
+trace_folder = os.getcwd()
+
+# Define maximum number of recorded spans, later spans are counted but dropped so memory stays bounded
+trace_max_events = 1000000
+
+# Define state of the profiler, spans are not recorded until profiling is enabled
+trace_state = {"enabled": False, "path": None, "started_at": 0, "dropped": 0}
+trace_events = []
+thread_names = {}
+trace_lock = threading.Lock()
+
+
+# Define function that record a finished span
+def record_span(name: str, category: str, start_time: int, end_time: int, arguments: dict = None) -> None:
+    """
+    Add a complete event of the Chrome trace format for a finished span of the current thread
+    :param name: name of the span in string format
+    :param category: category of the span, such as listing, download, upload, excel or delete, in string format
+    :param start_time: start of the span from perf_counter_ns in integer format
+    :param end_time: end of the span from perf_counter_ns in integer format
+    :param arguments: dictionary with details displayed with the span
+    :return: None
+    """
+    # Times of the trace are microseconds since profiling started
+    event = {"name": name, "cat": category, "ph": "X", "ts": (start_time - trace_state["started_at"]) / 1000,
+             "dur": (end_time - start_time) / 1000, "pid": os.getpid(), "tid": threading.get_ident(), "args": arguments or {}}
+    with trace_lock:
+        thread_names[event["tid"]] = threading.current_thread().name
+        if len(trace_events) < trace_max_events:
+            trace_events.append(event)
+        else:
+            trace_state["dropped"] += 1
+
+
+# Define function that measure a block of code
+@contextmanager
+def trace_span(name: str, category: str, **arguments):
+    """
+    Record the time spent in the block as a span of the current thread, if profiling is enabled
+    :param name: name of the span in string format
+    :param category: category of the span in string format
+    :param arguments: details displayed with the span
+    :return: None
+    """
+    # Run block without measure if profiling is disabled
+    if not trace_state["enabled"]:
+        yield
+        return
+
+    # Record span even if the block fails
+    start_time = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record_span(name, category, start_time, time.perf_counter_ns(), arguments)
+
+
+# Define function that measure every call of a function
+def traced(category: str) -> Callable:
+    """
+    Return a decorator that record every call of the function as a span named after the function, with its first
+    argument as detail when it is a path or a name
+    :param category: category of the spans in string format
+    :return: decorator: function that wrap the measured function
+    """
+    # Define decorator that wrap the function
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def traced_function(*args, **kwargs):
+            # Call function directly if profiling is disabled
+            if not trace_state["enabled"]:
+                return function(*args, **kwargs)
+
+            # Record call even if the function fails
+            start_time = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                arguments = {"target": args[0]} if args and isinstance(args[0], str) else {}
+                record_span(function.__name__, category, start_time, time.perf_counter_ns(), arguments)
+
+        return traced_function
+
+    # Return decorator
+    return decorator
+
+
+# Define function that write the trace file
+def write_trace(trace_path: str = None) -> str:
+    """
+    Write recorded spans with the names of their threads into a Chrome trace file, readable by Perfetto and chrome://tracing
+    :param trace_path: path of the trace file in string format, the one chosen when profiling started if not provided
+    :return: trace_path: path of the written file in string format
+    """
+    # Name threads with the names they had when their spans were recorded, workers have finished by now
+    trace_path = trace_path or trace_state["path"]
+    with trace_lock:
+        events = list(trace_events)
+        dropped_events = trace_state["dropped"]
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread_id, "args": {"name": thread_name}}
+                    for thread_id, thread_name in thread_names.items()]
+
+    # Write trace and display where it is
+    with open(trace_path, "w", encoding="utf-8") as trace_file:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms", "otherData": {"dropped_events": dropped_events}}, trace_file)
+    print(f"Trace with {len(events)} spans was written into {trace_path}, open it with https://ui.perfetto.dev.")
+
+    # Return path of the trace
+    return trace_path
+
+
+# Define function that start profiling
+def enable_profiling(trace_path: str) -> None:
+    """
+    Start recording spans and write them into the trace file when the program exits
+    :param trace_path: path of the trace file in string format
+    :return: None
+    """
+    # Enable profiling once
+    if trace_state["enabled"]:
+        return
+    trace_state.update(enabled=True, path=trace_path, started_at=time.perf_counter_ns())
+    atexit.register(write_trace)
+
+
+# Define function that start profiling when the script is called with the flag
+def start_profiling_from_arguments(script_name: str) -> bool:
+    """
+    Enable profiling if the script was called with --profile, the trace is named after the script and the start time
+    :param script_name: name of the script in string format
+    :return: is_profiled: True if profiling was enabled
+    """
+    # Skip profiling if the flag is missing
+    if profile_flag not in sys.argv[1:]:
+        return False
+    sys.argv.remove(profile_flag)
+    enable_profiling(os.path.join(trace_folder, f"{script_name}_trace_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    return True
@@ -0,0 +1,83 @@
+# Import necessary libraries
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator
+
+# Import internal utilities
+from client_pool import get_request_count
+from sharepoint_tools import get_folder_content
+
+# Define columns of the inventory
+inventory_fields = ["path", "type", "size", "modified", "etag"]
+
+
+# Define function that walk the whole directory tree
+def crawl_tree(root_path: str, max_workers: int = 8) -> Iterator[dict]:
+    """
+    Walk breadth-first through all subdirectories of provided URL and yield every folder and file found
+    :param root_path: path of the root directory in string format
+    :param max_workers: maximum number of folders listed at the same time in integer format
+    :return: item_details: dictionary with name, path, type, size, modified time and ETag of each item
+    """
+    # Keep only the paths of folders waiting to be listed and the listings in progress
+    pending_folders = deque([root_path])
+    running_listings = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending_folders or running_listings:
+            # Start listings until the pool is full
+            while pending_folders and len(running_listings) < max_workers:
+                folder_path = pending_folders.popleft()
+                running_listings[executor.submit(get_folder_content, folder_path)] = folder_path
+
+            # Wait for at least one listing to finish
+            finished_listings, _ = wait(running_listings, return_when=FIRST_COMPLETED)
+
+            # Emit the content of finished folders and queue their subfolders
+            for listing in finished_listings:
+                del running_listings[listing]
+                folders_details, files_details = listing.result()
+                for folder in folders_details:
+                    pending_folders.append(folder["path"])
+                    yield folder
+                yield from files_details
+
+
+# Define function that write the inventory of the directory tree
+def write_inventory(root_path: str, file_path: str, max_workers: int = 8) -> int:
+    """
+    Write to CSV file the path, type, size, modified time and ETag of every item under provided URL
+    :param root_path: path of the root directory in string format
+    :param file_path: path of the CSV file in string format
+    :param max_workers: maximum number of folders listed at the same time in integer format
+    :return: items_number: number of written items in integer format
+    """
+    # Write every item as soon as it is found
+    items_number = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as inventory_file:
+        writer = csv.DictWriter(inventory_file, fieldnames=inventory_fields, extrasaction="ignore")
+        writer.writeheader()
+        for item in crawl_tree(root_path, max_workers):
+            writer.writerow(item)
+            items_number += 1
+
+    # Return number of written items
+    return items_number
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define path of folder to be crawled and inventory location
+    root_path = "/sites/<enterprise_site>/<parent_directory>/<...>"
+    inventory_path = os.getcwd() + "/Inventory.csv"
+
+    # Build inventory and display statistics
+    start_time = time.perf_counter()
+    items_number = write_inventory(root_path, inventory_path, 16)
+    elapsed_time = time.perf_counter() - start_time
+    print(f"Inventory of {items_number} items written into '{inventory_path}'.")
+    print(f"Requests: {get_request_count()}, time: {elapsed_time:.1f} s.")
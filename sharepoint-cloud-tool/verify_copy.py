@@ -0,0 +1,143 @@
+# Import necessary libraries
+import hashlib
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Import internal utilities
+from client_pool import get_request_count
+from delta_sync import list_tree
+from sharepoint_tools import download_stream
+
+# Define number of files hashed at the same time
+verify_workers = 8
+
+# Define percentage of files whose content is hashed and size from which every file is hashed, None to disable it
+sample_percent = 100
+sample_min_size = None
+
+
+# Define function that compute the hash of a file content
+def hash_file(file_path: str) -> str:
+    """
+    Download a SharePoint file chunk by chunk and hash it, the content is never held in memory
+    :param file_path: path of the SharePoint file in string format
+    :return: file_hash: SHA-256 of the file content in string format
+    """
+    # Feed every downloaded chunk to the hash instead of a file
+    file_hash = hashlib.sha256()
+    download_stream(file_path, SimpleNamespace(write=file_hash.update))
+
+    # Return hash of the content
+    return file_hash.hexdigest()
+
+
+# Define function that decide if the content of a file is hashed
+def is_sampled(source_file: dict, percent: float, min_size: int) -> bool:
+    """
+    Select files to hash, the same files are always selected for the same percentage
+    :param source_file: details of the source file
+    :param percent: percentage of files whose content is hashed in float format
+    :param min_size: size in bytes from which every file is hashed in integer format, None to disable it
+    :return: is_sampled: True if the content of the file is hashed
+    """
+    # Select large files and a stable part of the others by their path
+    if min_size is not None and source_file["size"] >= min_size:
+        return True
+    return zlib.crc32(source_file["relative_path"].encode("utf-8")) % 10000 < percent * 100
+
+
+# Define function that compare the content of a file with its copy
+def compare_content(source_file: dict, destination_file: dict) -> dict:
+    """
+    Hash a source file and its copy and compare them
+    :param source_file: details of the source file
+    :param destination_file: details of the destination file
+    :return: check_result: dictionary with relative path, status and error message
+    """
+    # Hash both files, a failed download is reported as an error of the file
+    try:
+        is_same = hash_file(source_file["path"]) == hash_file(destination_file["path"])
+    except Exception as error:
+        return {"path": source_file["relative_path"], "status": "error", "error": str(error)}
+
+    # Return result of the comparison
+    return {"path": source_file["relative_path"], "status": "ok" if is_same else "content", "error": None}
+
+
+# Define function that verify a copy
+def verify_copy(source_root: str, destination_root: str, percent: float = sample_percent, min_size: int = sample_min_size,
+                max_workers: int = verify_workers) -> dict:
+    """
+    Check that every source folder and file exists in the destination with the same size, and that sampled files
+    have the same content
+    :param source_root: path of the source directory in string format
+    :param destination_root: path of the destination directory in string format
+    :param percent: percentage of files whose content is hashed in float format, 100 to hash all of them
+    :param min_size: size in bytes from which every file is hashed in integer format, None to disable it
+    :param max_workers: maximum number of files hashed at the same time in integer format
+    :return: verification: dictionary with number of checked, hashed and hashed bytes, and list of problems
+    """
+    # List both trees at the same time
+    requests_before = get_request_count()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_listing = executor.submit(list_tree, source_root.rstrip("/"))
+        destination_listing = executor.submit(list_tree, destination_root.rstrip("/"))
+        source_tree, destination_tree = source_listing.result(), destination_listing.result()
+
+    # Compare existence and size from the listings, they cost no extra request
+    problems = []
+    sampled_files = []
+    for relative_path, source_item in sorted(source_tree.items()):
+        destination_item = destination_tree.get(relative_path)
+        if destination_item is None or destination_item["type"] != source_item["type"]:
+            problems.append({"path": source_item["relative_path"], "status": "missing", "error": None})
+        elif source_item["type"] == "file" and source_item["size"] != destination_item["size"]:
+            problems.append({"path": source_item["relative_path"], "status": "size",
+                             "error": f"{source_item['size']} bytes in source, {destination_item['size']} in destination"})
+        elif source_item["type"] == "file" and is_sampled(source_item, percent, min_size):
+            sampled_files.append((source_item, destination_item))
+
+    # Hash sampled files in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        check_results = executor.map(lambda files: compare_content(*files), sampled_files)
+        problems += [check_result for check_result in check_results if check_result["status"] != "ok"]
+
+    # Return verification
+    return {
+        "checked": len(source_tree),
+        "hashed": len(sampled_files),
+        "hashed_bytes": sum(source_item["size"] for source_item, _ in sampled_files),
+        "problems": problems,
+        "requests": get_request_count() - requests_before,
+    }
+
+
+# Define function that display the verification report
+def display_verification_report(verification: dict) -> None:
+    """
+    Display every item that is missing or different in the destination and the summary of the verification
+    :param verification: dictionary with number of checked, hashed and hashed bytes, and list of problems
+    :return: None
+    """
+    # Display problems and summary
+    for problem in verification["problems"]:
+        print(f"{problem['status'].capitalize()}: '{problem['path']}'" + (f" ({problem['error']})" if problem["error"] else ""))
+    print(f"Checked {verification['checked']} items, hashed {verification['hashed']} files "
+          f"({verification['hashed_bytes'] / 1024 / 1024:.1f} MB), {len(verification['problems'])} problems, "
+          f"requests: {verification['requests']}.")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define source and destination to be compared, hash 10% of the files and all files from 100 MB
+    source_path = "/sites/<enterprise_site>/<source_directory>"
+    destination_path = "/sites/<enterprise_site>/<destination_directory>"
+
+    # Verify copy and display statistics
+    start_time = time.perf_counter()
+    verification = verify_copy(source_path, destination_path, percent=10, min_size=100 * 1024 * 1024)
+    display_verification_report(verification)
+    print(f"Verification time: {time.perf_counter() - start_time:.1f} s.")
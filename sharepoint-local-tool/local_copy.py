@@ -0,0 +1,182 @@
+# Import necessary libraries
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Import internal utilities
+from local_scanner import scan_tree
+
+# Define number of parallel copies and number of copies waiting for a free worker
+copy_workers = 16
+copy_queue_size = 256
+
+# Define maximum number of bytes copied by one kernel call
+copy_chunk_size = 64 * 1024 * 1024
+
+# Define difference of modified time in seconds that is still the same file, network shares round it to 2 seconds
+mtime_tolerance = 2.0
+
+
+# Define function that copy file content inside the kernel
+def kernel_copy(source_object, destination_object, file_size: int) -> None:
+    """
+    Copy content between two open files without passing it through Python, falling back to a buffered copy
+    :param source_object: source file opened for binary reading
+    :param destination_object: destination file opened for binary writing
+    :param file_size: size of the source file in bytes in integer format
+    :return: None
+    """
+    # Try copy_file_range first, it can clone blocks or copy on the server of a network share, then sendfile
+    source_descriptor, destination_descriptor = source_object.fileno(), destination_object.fileno()
+    kernel_calls = []
+    if hasattr(os, "copy_file_range"):
+        kernel_calls.append(lambda offset, count: os.copy_file_range(source_descriptor, destination_descriptor, count, offset, offset))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        kernel_calls.append(lambda offset, count: os.sendfile(destination_descriptor, source_descriptor, offset, count))
+
+    # Copy chunk by chunk, a call that stops early is continued by the next call from where it stopped
+    copied_bytes = 0
+    for kernel_call in kernel_calls:
+        try:
+            os.lseek(destination_descriptor, copied_bytes, os.SEEK_SET)
+            while copied_bytes < file_size:
+                sent_bytes = kernel_call(copied_bytes, min(copy_chunk_size, file_size - copied_bytes))
+                if sent_bytes == 0:
+                    break
+                copied_bytes += sent_bytes
+            if copied_bytes == file_size:
+                return
+        except OSError:
+            # Kernel or file system doesn't support this call
+            continue
+
+    # Copy the rest through a buffer
+    source_object.seek(copied_bytes)
+    destination_object.seek(copied_bytes)
+    shutil.copyfileobj(source_object, destination_object, 1024 * 1024)
+
+
+# Define function that check if a file was already copied
+def is_unchanged(source_file: dict, destination_path: str) -> bool:
+    """
+    Check that the destination file has the same size and modified time as the source file
+    :param source_file: details of the source file from the scanner
+    :param destination_path: path of the destination file in string format
+    :return: is_unchanged: True if the file doesn't need to be copied
+    """
+    # A missing destination is always copied
+    try:
+        destination_stat = os.stat(destination_path)
+    except OSError:
+        return False
+
+    # Compare size and modified time
+    return (destination_stat.st_size == source_file["size"]
+            and abs(destination_stat.st_mtime - source_file["modified"]) <= mtime_tolerance)
+
+
+# Define function that copy one file
+def copy_file(source_file: dict, destination_path: str) -> int:
+    """
+    Copy file content, mode bits and modified time, skipping files already present with the same size and modified time
+    :param source_file: details of the source file from the scanner
+    :param destination_path: path of the destination file in string format
+    :return: copied_bytes: number of copied bytes in integer format, -1 if the file was skipped
+    """
+    # Skip files already copied
+    if is_unchanged(source_file, destination_path):
+        return -1
+
+    # Copy content and mode bits, and keep modified time of the source, it is used to skip the file next time
+    with open(source_file["path"], "rb") as source_object, open(destination_path, "wb") as destination_object:
+        kernel_copy(source_object, destination_object, source_file["size"])
+    shutil.copymode(source_file["path"], destination_path)
+    os.utime(destination_path, (time.time(), source_file["modified"]))
+
+    # Return number of copied bytes
+    return source_file["size"]
+
+
+# Define function that copy a directory tree
+def copy_tree(source_path: str, destination_path: str, max_workers: int = copy_workers) -> dict:
+    """
+    Copy the whole content of the source directory into the destination directory with a pool of workers
+    :param source_path: path of the source directory in string format
+    :param destination_path: path of the destination directory in string format
+    :param max_workers: number of files copied at the same time in integer format
+    :return: statistics: dictionary with copied and skipped files, copied bytes, errors and elapsed time
+    """
+    # Count results from all workers
+    statistics = {"copied": 0, "skipped": 0, "bytes": 0, "errors": [], "time": 0.0}
+    statistics_lock = threading.Lock()
+    free_slots = threading.BoundedSemaphore(max_workers + copy_queue_size)
+    start_time = time.perf_counter()
+
+    # Define function that copy a file and count its result, every error is counted as nobody reads the future
+    def copy_and_count(source_file: dict, file_destination: str) -> None:
+        try:
+            copied_bytes = copy_file(source_file, file_destination)
+            with statistics_lock:
+                if copied_bytes < 0:
+                    statistics["skipped"] += 1
+                else:
+                    statistics["copied"] += 1
+                    statistics["bytes"] += copied_bytes
+        except Exception as error:
+            with statistics_lock:
+                statistics["errors"].append(f"{source_file['path']}: {error}")
+        finally:
+            free_slots.release()
+
+    # Define function that count a directory that can't be read
+    def count_error(directory_path: str, error: OSError) -> None:
+        with statistics_lock:
+            statistics["errors"].append(f"{directory_path}: {error}")
+
+    # Submit files while the tree is scanned, a directory is created before its content is found
+    os.makedirs(destination_path, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for entry in scan_tree(source_path, on_error=count_error):
+            entry_destination = os.path.join(destination_path, entry["path"][len(source_path.rstrip("/\\")) + 1:])
+            if entry["type"] == "folder":
+                os.makedirs(entry_destination, exist_ok=True)
+                continue
+
+            # Wait when too many copies are queued
+            free_slots.acquire()
+            executor.submit(copy_and_count, entry, entry_destination)
+
+    # Return statistics with elapsed time
+    statistics["time"] = time.perf_counter() - start_time
+    return statistics
+
+
+# Define function that display the summary of a copy
+def display_copy_summary(statistics: dict) -> None:
+    """
+    Display copied and skipped files, errors and throughput of the copy
+    :param statistics: dictionary with copied and skipped files, copied bytes, errors and elapsed time
+    :return: None
+    """
+    # Display errors and throughput
+    for error in statistics["errors"]:
+        print(f"Failed to copy {error}")
+    elapsed_time = max(statistics["time"], 1e-9)
+    processed_files = statistics["copied"] + statistics["skipped"]
+    print(f"Copied {statistics['copied']} files ({statistics['bytes'] / 1024 / 1024:.1f} MB), skipped {statistics['skipped']} unchanged, "
+          f"{len(statistics['errors'])} failed in {statistics['time']:.1f} s: "
+          f"{statistics['bytes'] / 1024 / 1024 / elapsed_time:.1f} MB/s, {processed_files / elapsed_time:.0f} files/s.")
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define source and destination directories
+    source_path = input("Provide source path: ")
+    destination_path = input("Provide destination path: ")
+
+    # Copy tree and display summary
+    display_copy_summary(copy_tree(source_path, destination_path))
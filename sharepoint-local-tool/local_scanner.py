@@ -0,0 +1,94 @@
+# Import necessary libraries
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator
+
+# Define number of directories read at the same time
+scan_workers = 8
+
+
+# Define function that describe a directory entry
+def describe_entry(entry: os.DirEntry) -> dict:
+    """
+    Return the details of a directory entry, type and status come from the directory read when the system provides them
+    :param entry: entry returned by scandir
+    :return: entry_details: dictionary with name, path, type, size and modified time of the entry
+    """
+    # Directories are not followed through links, their size is not used
+    if entry.is_dir(follow_symlinks=False):
+        return {"name": entry.name, "path": entry.path, "type": "folder", "size": 0, "modified": None}
+
+    # Take size and modified time of files
+    entry_stat = entry.stat()
+    return {"name": entry.name, "path": entry.path, "type": "file", "size": entry_stat.st_size, "modified": entry_stat.st_mtime}
+
+
+# Define function that read a directory
+def scan_directory(path: str) -> list:
+    """
+    Read a directory once and return the details of its subdirectories and files
+    :param path: path of the directory in string format
+    :return: entries: list with details of subdirectories and files
+    """
+    # Describe every subdirectory and file, other entries are skipped
+    with os.scandir(path) as entries:
+        return [describe_entry(entry) for entry in entries if entry.is_dir(follow_symlinks=False) or entry.is_file()]
+
+
+# Define function that walk the whole directory tree
+def scan_tree(root_path: str, max_workers: int = scan_workers, on_error: Callable[[str, OSError], None] = None) -> Iterator[dict]:
+    """
+    Walk breadth-first through all subdirectories of provided path, reading several directories at the same time,
+    and yield every directory and file found, a directory is always yielded before its content
+    :param root_path: path of the root directory in string format
+    :param max_workers: maximum number of directories read at the same time in integer format
+    :param on_error: function called with the path and the error of every directory that can't be read, raise if not provided
+    :return: entry_details: dictionary with name, path, type, size and modified time of each entry
+    """
+    # Keep only the paths of directories waiting to be read and the reads in progress
+    pending_directories = deque([root_path])
+    running_scans = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending_directories or running_scans:
+            # Start reads until the pool is full
+            while pending_directories and len(running_scans) < max_workers:
+                directory_path = pending_directories.popleft()
+                running_scans[executor.submit(scan_directory, directory_path)] = directory_path
+
+            # Wait for at least one read to finish
+            finished_scans, _ = wait(running_scans, return_when=FIRST_COMPLETED)
+
+            # Emit the content of finished directories and queue their subdirectories
+            for scan in finished_scans:
+                directory_path = running_scans.pop(scan)
+                try:
+                    entries = scan.result()
+                except OSError as error:
+                    if on_error is None:
+                        raise
+                    on_error(directory_path, error)
+                    continue
+                for entry in entries:
+                    if entry["type"] == "folder":
+                        pending_directories.append(entry["path"])
+                    yield entry
+
+
+# Run code as a script
+if __name__ == "__main__":
+
+    # Define path of directory to be scanned
+    root_path = input("Provide directory path: ")
+
+    # Scan tree and display statistics
+    start_time = time.perf_counter()
+    statistics = {"folder": 0, "file": 0, "size": 0}
+    for entry in scan_tree(root_path, on_error=lambda path, error: print(f"Failed to read '{path}': {error}")):
+        statistics[entry["type"]] += 1
+        statistics["size"] += entry["size"]
+    elapsed_time = time.perf_counter() - start_time
+    print(f"Found {statistics['folder']} directories and {statistics['file']} files ({statistics['size'] / 1024 / 1024:.1f} MB), "
+          f"time: {elapsed_time:.1f} s.")
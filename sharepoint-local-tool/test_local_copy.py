@@ -0,0 +1,39 @@
+# Import necessary libraries
+import os
+import stat
+
+# Import internal utilities
+import local_copy
+
+
+# Define function that create a source tree
+def create_tree(source_root) -> None:
+    (source_root / "Folder").mkdir(parents=True)
+    (source_root / "File.txt").write_bytes(b"content")
+    (source_root / "Folder" / "Script.sh").write_bytes(b"#!/bin/sh\n")
+    os.chmod(source_root / "Folder" / "Script.sh", 0o750)
+
+
+# Define test that content and mode bits are copied and unchanged files are skipped
+def test_copy_tree(tmp_path):
+    create_tree(tmp_path / "source")
+    statistics = local_copy.copy_tree(str(tmp_path / "source"), str(tmp_path / "destination"))
+    assert statistics["errors"] == []
+    assert statistics["copied"] == 2
+    assert (tmp_path / "destination" / "File.txt").read_bytes() == b"content"
+    assert stat.S_IMODE(os.stat(tmp_path / "destination" / "Folder" / "Script.sh").st_mode) == 0o750
+    assert local_copy.copy_tree(str(tmp_path / "source"), str(tmp_path / "destination"))["skipped"] == 2
+
+
+# Define test that any error of a worker is counted in the summary
+def test_every_error_is_counted(tmp_path, monkeypatch):
+    create_tree(tmp_path / "source")
+
+    def copy_file(source_file: dict, destination_path: str) -> int:
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr(local_copy, "copy_file", copy_file)
+    statistics = local_copy.copy_tree(str(tmp_path / "source"), str(tmp_path / "destination"))
+    assert statistics["copied"] == 0
+    assert len(statistics["errors"]) == 2
+    assert all("unexpected" in error for error in statistics["errors"])